@@ -1,3 +1,10 @@
 #!/bin/bash
-# Starte die Flask-App direkt
-python3 /app/app.py 
\ No newline at end of file
+# Startet die App: WEBDOCK_SERVER=production (Gunicorn) oder development (Flask-Dev-Server)
+set -e
+
+if [ "${WEBDOCK_SERVER:-production}" = "production" ]; then
+    export FLASK_DEBUG=0
+    exec gunicorn --config /app/gunicorn.conf.py --chdir /app app:app
+else
+    exec python3 /app/app.py
+fi
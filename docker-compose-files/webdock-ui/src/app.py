@@ -1,4 +1,4 @@
-from flask import Flask, jsonify, render_template, send_from_directory, abort, request
+from flask import Flask, jsonify, render_template, send_from_directory, abort, request, Response
 import os
 import logging
 import yaml
@@ -6,21 +6,42 @@ import subprocess
 import json
 import time
 from datetime import datetime, timezone  # timezone hinzugefügt
-import psutil
 import requests
 import threading
 from functools import lru_cache
 import shutil
 import paramiko
 import croniter
-import uuid
-import tempfile
-import socket
 import stat
 import re
+import shlex
+import mimetypes
+import hashlib
+from urllib.parse import quote
 from datetime import timedelta
 from typing import Dict, Any
-import docker
+from docker_gateway import DockerGateway, DockerGatewayError
+from container_index import ContainerIndex
+from health_collector import HealthCollector
+from status_stream import StatusBroadcaster
+from system_sampler import SystemSampler, parse_range
+from container_stats import ContainerStatsCollector
+from container_logs import LOG_TAIL_MAX, ContainerLogHub
+from ssh_pool import SSHPool
+from ssh_terminal import SSHSession
+import remote_files
+import file_ops
+from remote_listing import LISTING_PAGE_SIZE, SORT_KEYS
+from ssh_sessions import SSHSessionLimitError, SSHSessionManager
+from jobs import JobManager
+from stack_updater import UPDATE_CONCURRENCY, installed_stacks, update_stacks
+from update_checker import UpdateChecker
+from compose_catalog import ComposeCatalog
+from catalog_sync import CatalogSync
+from startup import StartupTasks
+from response_cache import MemoizedResponse, file_version
+from category_store import CategoryStore
+from log_store import LogStore, LogStoreHandler, parse_time
 
 # Konfiguriere Logging
 logging.basicConfig(
@@ -34,15 +55,11 @@ app = Flask(__name__,
     static_folder='static',
     template_folder='templates'
 )
-app.debug = True
+# Debug nur im Entwicklungsmodus (FLASK_DEBUG=1)
+app.debug = os.getenv('FLASK_DEBUG', '1') == '1'
 
-GITHUB_RAW_URL = "https://raw.githubusercontent.com/BangerTech/webDock/main/docker-compose-files"
-GITHUB_API_URL = "https://api.github.com/repos/BangerTech/webDock/contents/docker-compose-files"
-
-# Cache für Container-Konfigurationen
-CACHE_TIMEOUT = 300  # 5 Minuten
-last_update = 0
-config_cache = {}
+GITHUB_RAW_URL = os.getenv('GITHUB_RAW_URL', "https://raw.githubusercontent.com/BangerTech/webDock/main/docker-compose-files")
+GITHUB_API_URL = os.getenv('GITHUB_API_URL', "https://api.github.com/repos/BangerTech/webDock/contents/docker-compose-files")
 
 # Konstanten und Konfiguration
 CONFIG_DIR = os.getenv('CONFIG_DIR', '/home/webDock/webdock-data')
@@ -50,8 +67,43 @@ CATEGORIES_FILE = os.path.join(CONFIG_DIR, 'categories.yaml')
 COMPOSE_DIR = os.path.join(CONFIG_DIR, 'compose-files')
 HOST_CONFIG_FILE = os.path.join(CONFIG_DIR, 'host_config.json')
 
-# SSH Verbindungen speichern
-ssh_connections = {}
+# Ringpuffer für App-Logs und Docker-Events (/api/system/logs)
+log_store = LogStore(os.path.join(CONFIG_DIR, 'logs'))
+logging.getLogger().addHandler(LogStoreHandler(log_store))
+
+# Kategorien: einzige Quelle für alle Kategorie-Routen
+category_store = CategoryStore(CATEGORIES_FILE)
+
+# SSH Verbindungen speichern (begrenzt, ungenutzte werden automatisch geschlossen)
+ssh_connections = SSHSessionManager()
+
+# Wiederverwendbare SSH-Verbindungen für Zeitpläne und Host-Konfiguration
+ssh_pool = SSHPool()
+
+# Gemeinsamer Zugang zur Docker Engine (ersetzt die docker CLI-Aufrufe)
+docker_gateway = DockerGateway()
+
+# Vom Docker-Event-Stream aktuell gehaltener Container-Status
+container_index = ContainerIndex(docker_gateway)
+container_index.add_listener(log_store.add_docker_event)
+
+# Gebündelte Health-Abfrage mit kurzlebigem Snapshot
+health_collector = HealthCollector(docker_gateway)
+
+# Ressourcen-Statistiken aller laufenden Container (CONTAINER_STATS_INTERVAL)
+container_stats_collector = ContainerStatsCollector(docker_gateway, container_index)
+
+# Live-Logs: ein gemeinsamer `docker logs -f` pro Container für alle Betrachter
+container_log_hub = ContainerLogHub(docker_gateway)
+
+# Hintergrund-Jobs für Install/Update/Restart/Toggle (JOB_WORKERS)
+job_manager = JobManager()
+
+# Update-Prüfung über Registry-Digests (UPDATE_CHECK_TTL)
+update_checker = UpdateChecker(docker_gateway)
+
+# Letzter bekannter Status pro Compose-Projekt
+last_container_status = {}
 
 # Am Anfang der Datei bei den anderen globalen Variablen
 host_credentials = {
@@ -92,58 +144,21 @@ def save_host_config(config):
         app.logger.error(f"Error saving host config: {e}")
         return False
 
-class SSHSession:
-    def __init__(self, client):
-        self.client = client
-        self.channel = client.invoke_shell()
-        self.channel.settimeout(1)
-        
-        # Bessere Shell-Initialisierung
-        init_commands = [
-            'export TERM=xterm',
-            'export PS1="\\u@\\h:\\w\\$ "',
-            'stty -echo',
-            'set -o vi'  # Für bessere Terminal-Unterstützung
-        ]
-        
-        for cmd in init_commands:
-            self.channel.send(f"{cmd}\n")
-            time.sleep(0.1)
-        self.channel.recv(4096)  # Clear buffer
+# Index der Compose-Templates, per inotify aktuell gehalten
+compose_catalog = ComposeCatalog(COMPOSE_FILES_DIR)
+
+# Abgleich der Templates mit GitHub (ETag, parallel, atomare Übernahme)
+catalog_sync = CatalogSync(COMPOSE_FILES_DIR, GITHUB_API_URL, GITHUB_RAW_URL, compose_catalog)
+
+# Startphasen im Hintergrund (/readyz)
+startup_tasks = StartupTasks()
 
 def get_cached_containers():
     """Gibt gecachte Container-Konfigurationen zurück"""
-    global last_update, config_cache
-    
-    current_time = time.time()
-    if current_time - last_update > CACHE_TIMEOUT:
-        compose_dir = '/app/docker-compose-files'  # Geändert von /home/webDock/docker-compose-files
-        if not os.path.exists(compose_dir):
-            download_compose_files()
-        config_cache = load_container_configs(compose_dir)
-        last_update = current_time
-    
-    return config_cache
-
-def load_container_configs(compose_dir):
-    """Lädt Container-Konfigurationen aus dem Dateisystem"""
-    configs = {}
-    try:
-        logger.info(f"Loading configs from {compose_dir}")
-        for root, dirs, files in os.walk(compose_dir):
-            if 'docker-compose.yml' in files:
-                try:
-                    with open(os.path.join(root, 'docker-compose.yml')) as f:
-                        compose_data = yaml.safe_load(f)
-                        if compose_data and 'services' in compose_data:
-                            container_name = os.path.basename(root)
-                            configs[container_name] = compose_data
-                            logger.info(f"Loaded config for {container_name}")
-                except Exception as e:
-                    logger.error(f"Error loading config for {root}: {e}")
-    except Exception as e:
-        logger.error(f"Error walking directory {compose_dir}: {e}")
-    return configs
+    if not os.path.exists(COMPOSE_FILES_DIR):
+        # Sync im Hintergrund, bis dahin gilt der letzte gespeicherte Stand
+        catalog_sync.start()
+    return compose_catalog.configs()
 
 def _extract_port(ports):
     if not ports:
@@ -164,54 +179,8 @@ def _extract_port(ports):
 def load_categories():
     """Lädt die Kategorien aus der YAML-Datei oder erstellt Standardkategorien"""
     try:
-        if os.path.exists(CATEGORIES_FILE):
-            with open(CATEGORIES_FILE, 'r') as f:
-                return yaml.safe_load(f)
-        
-        # Wenn keine Datei existiert, erstelle Standardkategorien
-        default_categories = {
-            'categories': {
-                'smarthome': {
-                    'name': 'Smart Home',
-                    'icon': 'fa-home',
-                    'description': 'Home automation systems',
-                    'containers': ['openhab', 'homeassistant', 'raspberrymatic']
-                },
-                'bridge': {
-                    'name': 'Bridge',
-                    'icon': 'fa-exchange',
-                    'description': 'IoT bridges and communication',
-                    'containers': ['homebridge', 'mosquitto-broker', 'zigbee2mqtt']
-                },
-                'dashboard': {
-                    'name': 'Dashboard',
-                    'icon': 'fa-th-large',
-                    'description': 'Visualization and monitoring dashboards',
-                    'containers': ['heimdall', 'grafana']
-                },
-                'service': {
-                    'name': 'Service',
-                    'icon': 'fa-cogs',
-                    'description': 'System services and tools',
-                    'containers': ['filebrowser', 'codeserver', 'frontail', 
-                                 'nodeexporter', 'portainer', 'dockge', 'prometheus']
-                },
-                'other': {
-                    'name': 'Other',
-                    'icon': 'fa-ellipsis-h',
-                    'description': 'Additional containers and tools',
-                    'containers': ['whatsupdocker', 'watchyourlan', 'webdock-ui', 'filestash']
-                }
-            }
-        }
-        
-        # Speichere die Standardkategorien
-        os.makedirs(os.path.dirname(CATEGORIES_FILE), exist_ok=True)
-        with open(CATEGORIES_FILE, 'w') as f:
-            yaml.dump(default_categories, f, default_flow_style=False)
-        
-        return default_categories
-    except Exception as e:
+        return category_store.get()
+    except Exception:
         logger.exception("Error loading categories")
         return {'categories': {}}
 
@@ -219,20 +188,16 @@ def load_categories():
 def add_category():
     try:
         data = request.json
-        categories = load_categories()
         
-        # Füge neue Kategorie hinzu
+        # Füge neue Kategorie hinzu und speichere
         category_id = data['id']
-        categories['categories'][category_id] = {
-            'name': data['name'],
-            'icon': data['icon'],
-            'description': data.get('description', ''),
-            'containers': data.get('containers', [])
-        }
-        
-        # Speichere aktualisierte Kategorien
-        with open(CATEGORIES_FILE, 'w') as f:
-            yaml.dump(categories, f)
+        with category_store.edit() as categories:
+            categories['categories'][category_id] = {
+                'name': data['name'],
+                'icon': data['icon'],
+                'description': data.get('description', ''),
+                'containers': data.get('containers', [])
+            }
         
         return jsonify({'status': 'success'})
     except Exception as e:
@@ -243,22 +208,18 @@ def add_category():
 def update_category(category_id):
     try:
         data = request.json
-        categories = load_categories()
         
-        if category_id not in categories['categories']:
+        if category_id not in load_categories()['categories']:
             return jsonify({'error': 'Category not found'}), 404
         
-        # Aktualisiere die Kategorie
-        categories['categories'][category_id].update({
-            'name': data['name'],
-            'icon': data['icon'],
-            'description': data['description'],
-            'containers': data['containers']
-        })
-        
-        # Speichere aktualisierte Kategorien
-        with open(CATEGORIES_FILE, 'w') as f:
-            yaml.dump(categories, f)
+        # Aktualisiere die Kategorie und speichere
+        with category_store.edit() as categories:
+            categories['categories'][category_id].update({
+                'name': data['name'],
+                'icon': data['icon'],
+                'description': data['description'],
+                'containers': data['containers']
+            })
         
         return jsonify({'status': 'success'})
     except Exception as e:
@@ -276,27 +237,16 @@ def get_categories():
         return jsonify({'error': str(e)}), 500
 
 def _get_container_group(dirname):
-    categories = load_categories()
-    for category_id, category in categories.get('categories', {}).items():
-        if dirname.lower() in category.get('containers', []):
-            return category['name']
-    return 'Other'
+    category = category_store.category_for(dirname.lower())
+    return category['name'] if category else 'Other'
 
 def _get_group_icon(group):
-    categories = load_categories()
-    for category in categories.get('categories', {}).values():
-        if category['name'] == group:
-            return category['icon']
-    return 'fa-cube'
+    return category_store.icon_for(group)
 
 def get_compose_status(compose_dir):
     """Hole den Status aller Docker Compose Projekte"""
     try:
-        cmd = ["docker", "compose", "ls", "--format", "json"]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            return json.loads(result.stdout)
-        return []
+        return docker_gateway.compose_projects()
     except Exception as e:
         logger.error(f"Error getting compose status: {str(e)}")
         return []
@@ -304,25 +254,14 @@ def get_compose_status(compose_dir):
 def get_container_status(project_name):
     """Hole den Status eines spezifischen Docker Compose Projekts"""
     try:
-        # Hole alle laufenden Container
-        cmd = ["docker", "ps", "--format", "{{.Names}}"]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        running_containers = set(result.stdout.strip().split('\n')) if result.stdout.strip() else set()
-        logger.info(f"Running containers: {running_containers}")
-        
-        # Hole alle Container (auch gestoppte)
-        cmd = ["docker", "ps", "-a", "--format", "{{.Names}}"]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        all_containers = set(result.stdout.strip().split('\n')) if result.stdout.strip() else set()
-        logger.info(f"All containers: {all_containers}")
-        
-        # Erstelle Status-Liste
-        containers = []
-        for container in all_containers:
-            containers.append({
-                'Name': container,
-                'State': 'running' if container in running_containers else 'stopped'
-            })
+        # Hole alle Container (auch gestoppte) aus dem Container-Index
+        containers = [
+            {
+                'Name': container.name,
+                'State': 'running' if container.running else 'stopped'
+            }
+            for container in container_index.snapshot().values()
+        ]
         
         if containers != last_container_status.get(project_name):
             logger.info(f"Container status changed in {project_name}: {containers}")
@@ -366,39 +305,8 @@ def setup_container_environment(container_name, install_path, config_data=None):
 def download_compose_files():
     """Lädt die docker-compose Files von GitHub herunter"""
     try:
-        # Hole die Liste der Verzeichnisse von GitHub
-        response = requests.get(GITHUB_API_URL)
-        if response.status_code != 200:
-            raise Exception(f"Failed to get directory listing: {response.status_code}")
-        
-        directories = [item['name'] for item in response.json() if item['type'] == 'dir']
-        logger.info(f"Found {len(directories)} directories: {directories}")
-        
-        successful_downloads = 0
-        
-        # Erstelle das Basis-Verzeichnis
-        os.makedirs('/app/docker-compose-files', exist_ok=True)
-        
-        for directory in directories:
-            try:
-                # Hole die docker-compose.yml
-                compose_url = f"{GITHUB_RAW_URL}/{directory}/docker-compose.yml"
-                response = requests.get(compose_url)
-                
-                if response.status_code == 200:
-                    # Erstelle Verzeichnis und speichere die Datei
-                    os.makedirs(f'/app/docker-compose-files/{directory}', exist_ok=True)
-                    with open(f'/app/docker-compose-files/{directory}/docker-compose.yml', 'w') as f:
-                        f.write(response.text)
-                    successful_downloads += 1
-                
-            except Exception as e:
-                logger.error(f"Error downloading {directory}: {str(e)}")
-                continue
-        
-        logger.info(f"Successfully downloaded {successful_downloads} of {len(directories)} compose files")
-        return True
-        
+        result = catalog_sync.sync()
+        return result['status'] != 'offline'
     except Exception as e:
         logger.error(f"Error downloading compose files: {str(e)}")
         return False
@@ -429,6 +337,18 @@ def index():
 def test():
     return "Flask server is running!"
 
+@app.route('/livez')
+def livez():
+    """Liveness: der Prozess nimmt Anfragen an"""
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: alle erforderlichen Startphasen sind abgeschlossen"""
+    status = startup_tasks.status()
+    status['catalog_sync'] = catalog_sync.last_result
+    return jsonify(status), 200 if status['ready'] else 503
+
 @app.route('/debug')
 def debug():
     try:
@@ -459,16 +379,12 @@ def get_installed_containers():
         
         # Hole laufende Container direkt von Docker
         try:
-            result = subprocess.run(['docker', 'ps', '--format', '{{.Names}}'], 
-                                 capture_output=True, text=True)
-            if result.returncode == 0:
-                running_containers = result.stdout.strip().split('\n')
-                # Spezielle Behandlung für webdock-ui/bangertech-ui
-                for container in running_containers:
-                    if container in ['webdock-ui', 'bangertech-ui']:
-                        installed.add('webdock-ui')  # Normalisiere auf webdock-ui
-                    else:
-                        installed.add(container)
+            # Spezielle Behandlung für webdock-ui/bangertech-ui
+            for container in container_index.running_names():
+                if container in ['webdock-ui', 'bangertech-ui']:
+                    installed.add('webdock-ui')  # Normalisiere auf webdock-ui
+                else:
+                    installed.add(container)
         except Exception as e:
             logger.error(f"Error getting running containers: {str(e)}")
         
@@ -507,14 +423,7 @@ def get_installed_containers():
 def get_running_containers():
     """Überprüft welche Container laufen"""
     try:
-        result = subprocess.run(
-            ['docker', 'ps', '--format', '{{.Names}}'],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0:
-            return set(result.stdout.strip().split('\n')) if result.stdout.strip() else set()
-        return set()
+        return container_index.running_names()
     except Exception as e:
         logger.error(f"Error getting running containers: {str(e)}")
         return set()
@@ -522,132 +431,135 @@ def get_running_containers():
 def check_for_updates(container_name):
     """Prüft ob Updates für einen Container verfügbar sind"""
     try:
-        # Hole aktuelles Image und Tag
-        result = subprocess.run(
-            ['docker', 'inspect', '--format', '{{.Config.Image}}', container_name],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode != 0:
-            return False
-             
-        current_image = result.stdout.strip()
-         
-        # Hole neuestes Image von Docker Hub
-        subprocess.run(['docker', 'pull', current_image], capture_output=True)
-         
-        # Vergleiche Image IDs
-        current = subprocess.run(
-            ['docker', 'inspect', '--format', '{{.Id}}', container_name],
-            capture_output=True,
-            text=True
-        ).stdout.strip()
-         
-        latest = subprocess.run(
-            ['docker', 'inspect', '--format', '{{.Id}}', current_image],
-            capture_output=True,
-            text=True
-        ).stdout.strip()
-         
-        return current != latest
+        # Vergleiche lokalen RepoDigest mit dem Manifest-Digest der Registry (ohne Pull)
+        result = update_checker.check_container(container_name)
+        return bool(result and result['update_available'])
     except Exception as e:
         logger.error(f"Error checking updates for {container_name}: {str(e)}")
         return False
 
+# Fertig serialisierte /api/containers Antwort (ETag)
+containers_response = MemoizedResponse('containers')
+
+# Compose-Dateien, die get_installed_containers zusätzlich auswertet
+INSTALLED_COMPOSE_FILES = [
+    os.path.join(data_dir, 'docker-compose.yml')
+    for data_dir in ['/home/webDock/docker-compose-data', os.path.expanduser('~/docker-compose-data'), '.', '..']
+]
+
+def containers_cache_key():
+    """Versionen aller Datenquellen von /api/containers"""
+    imported = category_store.containers_in('imported')
+    return (
+        compose_catalog.version,
+        category_store.version,
+        container_index.version,
+        tuple(file_version(path) for path in INSTALLED_COMPOSE_FILES),
+        tuple(file_version(os.path.join(COMPOSE_DIR, name, 'docker-compose.yml')) for name in imported)
+    )
+
 @app.route('/api/containers')
 def get_containers():
     try:
-        container_configs = get_cached_containers()
-        processed_services = set()
-        installed_containers = get_installed_containers()
-        running_containers = get_running_containers()
-        categories = load_categories()
-        grouped_containers = {}
+        # Katalog und Container-Index vor dem Schlüssel aktualisieren
+        get_cached_containers()
+        container_index.snapshot()
+        body, etag = containers_response.get(containers_cache_key(), build_containers)
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+        
+    except Exception as e:
+        logger.error("Error in get_containers", exc_info=True)
+        return jsonify({'error': str(e)}), 500
+
+def build_containers():
+    """Baut die gruppierte Container-Liste für /api/containers"""
+    container_configs = get_cached_containers()
+    processed_services = set()
+    installed_containers = get_installed_containers()
+    running_containers = get_running_containers()
+    categories = load_categories()
+    grouped_containers = {}
+    
+    # Füge zuerst alle Standard-Container hinzu
+    for container_name, compose_data in container_configs.items():
+        dir_name = get_container_directory_name(container_name)
         
-        # Füge zuerst alle Standard-Container hinzu
-        for container_name, compose_data in container_configs.items():
-            dir_name = get_container_directory_name(container_name)
+        for service_name, service_data in compose_data['services'].items():
+            if service_name in processed_services:
+                continue
             
-            for service_name, service_data in compose_data['services'].items():
-                if service_name in processed_services:
-                    continue
-                
-                # Verwende den korrekten Service-Namen
-                display_name = 'webdock-ui' if service_name == 'bangertech-ui' else (dir_name if service_name == 'mosquitto' else service_name)
-                processed_services.add(display_name)
-                
-                # Bestimme die Kategorie
-                category = 'Other'
-                for cat_id, cat_data in categories.get('categories', {}).items():
-                    if display_name in cat_data.get('containers', []):
-                        category = cat_data['name']
-                        break
-                
-                # Extrahiere Port aus service_data
-                port = None
-                if 'ports' in service_data:
-                    port = _extract_port(service_data['ports'])
-                
-                container = {
-                    'name': display_name,
-                    'status': 'running' if display_name in running_containers else 'stopped',
-                    'installed': display_name in installed_containers,
-                    'description': service_data.get('labels', {}).get('description', ''),
-                    'group': category,
+            # Verwende den korrekten Service-Namen
+            display_name = 'webdock-ui' if service_name == 'bangertech-ui' else (dir_name if service_name == 'mosquitto' else service_name)
+            processed_services.add(display_name)
+            
+            # Bestimme die Kategorie
+            category_data = category_store.category_for(display_name)
+            category = category_data['name'] if category_data else 'Other'
+            
+            # Extrahiere Port aus service_data
+            port = None
+            if 'ports' in service_data:
+                port = _extract_port(service_data['ports'])
+            
+            container = {
+                'name': display_name,
+                'status': 'running' if display_name in running_containers else 'stopped',
+                'installed': display_name in installed_containers,
+                'description': service_data.get('labels', {}).get('description', ''),
+                'group': category,
+                'icon': categories.get('categories', {}).get(category, {}).get('icon', 'fa-cube'),
+                'version': service_data.get('image', '').split(':')[-1] or 'latest',
+                'port': port,
+                'volumes': service_data.get('volumes', [])
+            }
+            
+            if category not in grouped_containers:
+                grouped_containers[category] = {
+                    'name': category,
                     'icon': categories.get('categories', {}).get(category, {}).get('icon', 'fa-cube'),
-                    'version': service_data.get('image', '').split(':')[-1] or 'latest',
-                    'port': port,
-                    'volumes': service_data.get('volumes', [])
-                }
-                
-                if category not in grouped_containers:
-                    grouped_containers[category] = {
-                        'name': category,
-                        'icon': categories.get('categories', {}).get(category, {}).get('icon', 'fa-cube'),
-                        'containers': []
-                    }
-                grouped_containers[category]['containers'].append(container)
-        
-        # Füge importierte Container hinzu
-        if 'imported' in categories.get('categories', {}):
-            imported_category = categories['categories']['imported']
-            if 'Imported' not in grouped_containers:
-                grouped_containers['Imported'] = {
-                    'name': 'Imported',
-                    'icon': imported_category.get('icon', 'fa-download'),
                     'containers': []
                 }
-            
-            for container_name in imported_category.get('containers', []):
-                if container_name not in processed_services:
-                    # Hole Container-Konfiguration für importierte Container
-                    compose_file = os.path.join(COMPOSE_DIR, container_name, 'docker-compose.yml')
-                    try:
-                        with open(compose_file, 'r') as f:
-                            imported_config = yaml.safe_load(f)
-                            service_data = imported_config['services'][container_name]
-                            port = _extract_port(service_data.get('ports', []))
-                    except Exception as e:
-                        logger.warning(f"Could not load config for {container_name}: {e}")
-                        port = None
-                    
-                    container = {
-                        'name': container_name,
-                        'status': 'running' if container_name in running_containers else 'stopped',
-                        'installed': True,
-                        'description': f'Imported container: {container_name}',
-                        'group': 'Imported',
-                        'icon': 'fa-download',
-                        'version': 'latest',
-                        'port': port
-                    }
-                    grouped_containers['Imported']['containers'].append(container)
-        
-        return jsonify(grouped_containers)
+            grouped_containers[category]['containers'].append(container)
+    
+    # Füge importierte Container hinzu
+    if 'imported' in categories.get('categories', {}):
+        imported_category = categories['categories']['imported']
+        if 'Imported' not in grouped_containers:
+            grouped_containers['Imported'] = {
+                'name': 'Imported',
+                'icon': imported_category.get('icon', 'fa-download'),
+                'containers': []
+            }
         
-    except Exception as e:
-        logger.error("Error in get_containers", exc_info=True)
-        return jsonify({'error': str(e)}), 500
+        for container_name in imported_category.get('containers', []):
+            if container_name not in processed_services:
+                # Hole Container-Konfiguration für importierte Container
+                compose_file = os.path.join(COMPOSE_DIR, container_name, 'docker-compose.yml')
+                try:
+                    with open(compose_file, 'r') as f:
+                        imported_config = yaml.safe_load(f)
+                        service_data = imported_config['services'][container_name]
+                        port = _extract_port(service_data.get('ports', []))
+                except Exception as e:
+                    logger.warning(f"Could not load config for {container_name}: {e}")
+                    port = None
+                
+                container = {
+                    'name': container_name,
+                    'status': 'running' if container_name in running_containers else 'stopped',
+                    'installed': True,
+                    'description': f'Imported container: {container_name}',
+                    'group': 'Imported',
+                    'icon': 'fa-download',
+                    'version': 'latest',
+                    'port': port
+                }
+                grouped_containers['Imported']['containers'].append(container)
+    
+    return grouped_containers
 
 @app.route('/api/install', methods=['POST'])
 def install_container():
@@ -659,10 +571,25 @@ def install_container():
         if not container_name:
             raise Exception("Container name is required")
         
-        # Verwende den korrekten Pfad für die Installation
-        install_path = os.path.join(COMPOSE_DATA_DIR, container_name)
-        logger.info(f"Installing container {container_name} to {install_path}")
+        # Installation läuft als Hintergrund-Job
+        job = job_manager.submit('install', container_name, run_install, container_name, data)
         
+        return jsonify({
+            'status': 'accepted',
+            'job_id': job.id,
+            'message': f'Installing {container_name}'
+        }), 202
+    except Exception as e:
+        logger.error(f"Error installing container: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+def run_install(ctx, container_name, data):
+    """Installiert einen Container (läuft als Job)"""
+    # Verwende den korrekten Pfad für die Installation
+    install_path = os.path.join(COMPOSE_DATA_DIR, container_name)
+    logger.info(f"Installing container {container_name} to {install_path}")
+    
+    with ctx.step('prepare'):
         # Erstelle Basis-Verzeichnisse
         os.makedirs(install_path, exist_ok=True)
         logger.info(f"Created directory: {install_path}")
@@ -683,6 +610,7 @@ def install_container():
                 os.chmod(directory, 0o755)
                 logger.info(f"Created and configured directory: {directory}")
 
+    with ctx.step('compose file'):
         # Kopiere und aktualisiere docker-compose.yml
         template_path = os.path.join(COMPOSE_FILES_DIR, container_name, 'docker-compose.yml')
         target_compose = os.path.join(install_path, 'docker-compose.yml')
@@ -701,18 +629,19 @@ def install_container():
         os.chmod(target_compose, 0o644)
         logger.info(f"Created compose file: {target_compose}")
 
-        # Starte den Container
-        try:
-            subprocess.run(['docker', 'compose', '-f', target_compose, 'up', '-d'], check=True)
-            logger.info(f"Started container: {container_name}")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error starting container: {e}")
-            raise Exception(f"Failed to start container: {e}")
+    # Starte den Container
+    with ctx.step('start'):
+        ctx.run(['docker', 'compose', '-f', target_compose, 'up', '-d'])
+        logger.info(f"Started container: {container_name}")
 
-        return jsonify({'status': 'success'})
-    except Exception as e:
-        logger.error(f"Error installing container: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+    return f"Container {container_name} installed successfully"
+
+def run_compose_steps(ctx, steps, message):
+    """Führt docker compose Schritte nacheinander aus (läuft als Job)"""
+    for name, cmd in steps:
+        with ctx.step(name):
+            ctx.run(cmd)
+    return message
 
 def get_docker_compose_cmd():
     """Gibt den korrekten docker-compose Befehl zurück"""
@@ -725,12 +654,7 @@ def get_docker_compose_cmd():
 def toggle_container(container_name):
     try:
         # Prüfe ob Container läuft
-        result = subprocess.run(
-            ['docker', 'ps', '--format', '{{.Names}}'],
-            capture_output=True,
-            text=True
-        )
-        running_containers = set(result.stdout.strip().split('\n')) if result.stdout.strip() else set()
+        running_containers = container_index.running_names()
         
         # Mögliche Container-Namen
         container_names = [
@@ -740,23 +664,28 @@ def toggle_container(container_name):
         ]
         
         is_running = any(name in running_containers for name in container_names)
-        docker_compose_cmd = get_docker_compose_cmd()
+        compose_cmd = shlex.split(get_docker_compose_cmd()) + [
+            '-f', f'/home/webDock/docker-compose-data/{container_name}/docker-compose.yml'
+        ]
         
         if is_running:
             # Stoppe Container
-            subprocess.run(f'{docker_compose_cmd} -f /home/webDock/docker-compose-data/{container_name}/docker-compose.yml down',
-                         shell=True, check=True)
-            message = f"Container {container_name} stopped"
+            job = job_manager.submit('stop', container_name, run_compose_steps,
+                                     [('down', compose_cmd + ['down'])],
+                                     f"Container {container_name} stopped")
+            message = f"Stopping container {container_name}"
         else:
             # Starte Container
-            subprocess.run(f'{docker_compose_cmd} -f /home/webDock/docker-compose-data/{container_name}/docker-compose.yml up -d',
-                         shell=True, check=True)
-            message = f"Container {container_name} started"
+            job = job_manager.submit('start', container_name, run_compose_steps,
+                                     [('up', compose_cmd + ['up', '-d'])],
+                                     f"Container {container_name} started")
+            message = f"Starting container {container_name}"
         
         return jsonify({
-            'status': 'success',
+            'status': 'accepted',
+            'job_id': job.id,
             'message': message
-        })
+        }), 202
     except Exception as e:
         logger.exception(f"Error toggling container {container_name}")
         return jsonify({
@@ -767,29 +696,124 @@ def toggle_container(container_name):
 @app.route('/api/update/<container_name>', methods=['POST'])
 def update_container(container_name):
     try:
-        # Führe Pull und Neustart durch
+        # Führe Pull und Neustart durch; der Container läuft während des Pulls weiter
         compose_file = f'/home/webDock/docker-compose-data/{container_name}/docker-compose.yml'
+        compose_cmd = ['docker', 'compose', '-f', compose_file]
         
-        # Stoppe Container
-        subprocess.run(['docker', 'compose', '-f', compose_file, 'down'])
-        
-        # Hole neuestes Image
-        subprocess.run(['docker', 'compose', '-f', compose_file, 'pull'])
-        
-        # Starte Container neu
-        subprocess.run(['docker', 'compose', '-f', compose_file, 'up', '-d'])
+        job = job_manager.submit('update', container_name, run_compose_steps, [
+            ('pull', compose_cmd + ['pull']),       # Hole neuestes Image
+            ('up', compose_cmd + ['up', '-d'])      # Erstelle geänderte Container neu
+        ], f'Container {container_name} updated successfully')
         
+        return jsonify({
+            'status': 'accepted',
+            'job_id': job.id,
+            'message': f'Updating container {container_name}'
+        }), 202
+    except Exception as e:
+        logger.exception(f"Error updating container {container_name}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/updates')
+def get_updates():
+    """Listet Stacks mit verfügbaren Image-Updates"""
+    try:
+        refresh = request.args.get('refresh') == 'true'
+        stacks = update_checker.check_all(refresh=refresh)
+        if request.args.get('all') != 'true':
+            stacks = [stack for stack in stacks if stack['update_available']]
         return jsonify({
             'status': 'success',
-            'message': f'Container {container_name} updated successfully'
+            'updates': stacks
         })
     except Exception as e:
-        logger.exception(f"Error updating container {container_name}")
+        logger.exception("Error checking for updates")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/update-all', methods=['POST'])
+def update_all_containers():
+    """Aktualisiert mehrere Stacks mit parallelen Image-Pulls"""
+    try:
+        data = request.get_json(silent=True) or {}
+        available = installed_stacks(COMPOSE_DATA_DIR)
+        stacks = data.get('stacks') or available
+        if not isinstance(stacks, list) or not all(isinstance(stack, str) for stack in stacks):
+            return jsonify({
+                'status': 'error',
+                'message': 'stacks must be a list of stack names'
+            }), 400
+        unknown = [stack for stack in stacks if stack not in available]
+        if unknown:
+            return jsonify({
+                'status': 'error',
+                'message': f"Unknown stacks: {', '.join(unknown)}"
+            }), 400
+        try:
+            concurrency = int(data.get('concurrency', UPDATE_CONCURRENCY))
+        except (TypeError, ValueError):
+            concurrency = 0
+        if concurrency < 1:
+            return jsonify({
+                'status': 'error',
+                'message': 'concurrency must be a positive integer'
+            }), 400
+        
+        job = job_manager.submit('update-all', 'update-all', update_stacks,
+                                 COMPOSE_DATA_DIR, stacks, concurrency)
+        
+        return jsonify({
+            'status': 'accepted',
+            'job_id': job.id,
+            'stacks': stacks,
+            'message': f'Updating {len(stacks)} stacks'
+        }), 202
+    except Exception as e:
+        logger.exception("Error updating all containers")
         return jsonify({
             'status': 'error',
             'message': str(e)
         }), 500
 
+@app.route('/api/jobs')
+def list_jobs():
+    """Listet die letzten Hintergrund-Jobs"""
+    return jsonify(job_manager.list())
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Status, Schritte und Ausgabe eines Jobs"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Job not found'
+        }), 404
+    return jsonify(job.to_dict(include_output=True))
+
+@app.route('/api/jobs/<job_id>/stream')
+def stream_job(job_id):
+    """Server-Sent Events mit dem Fortschritt eines Jobs"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Job not found'
+        }), 404
+    return Response(
+        job_manager.stream(job),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
 @app.route('/static/img/<path:filename>')
 def serve_image(filename):
     try:
@@ -797,98 +821,53 @@ def serve_image(filename):
     except:
         return send_from_directory(app.static_folder + '/img/icons', 'webdock.png')
 
+# Misst CPU, Speicher und Festplatte im Hintergrund (SYSTEM_SAMPLE_INTERVAL)
+system_sampler = SystemSampler()
+
 @app.route('/api/system/status')
 def get_system_status():
     try:
-        # CPU-Auslastung
-        cpu_percent = psutil.cpu_percent(interval=1)
-        
-        # Speicher-Auslastung
-        memory = psutil.virtual_memory()
-        memory_percent = memory.percent
-        
-        # Festplatten-Auslastung
-        disk = psutil.disk_usage('/')
-        disk_percent = disk.percent
-        
-        return jsonify({
-            'cpu': round(cpu_percent, 1),
-            'memory': round(memory_percent, 1),
-            'disk': round(disk_percent, 1)
-        })
+        return jsonify(system_sampler.latest())
     except Exception as e:
         logger.exception("Error getting system status")
         return {'error': str(e)}, 500
 
+@app.route('/api/system/status/history')
+def get_system_status_history():
+    """Gibt die gespeicherte Zeitreihe für Diagramme zurück (?range=15m, 24h, 7d ...)"""
+    try:
+        seconds = parse_range(request.args.get('range', '1h'))
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    try:
+        return jsonify(system_sampler.history(seconds))
+    except Exception as e:
+        logger.exception("Error getting system status history")
+        return {'error': str(e)}, 500
+
+# Ein gemeinsamer Producer für alle Live-Status-Clients
+status_broadcaster = StatusBroadcaster(container_index, system_sampler.latest)
+
+@app.route('/api/stream')
+def stream_status():
+    """Server-Sent Events mit Container- und System-Änderungen"""
+    return Response(
+        status_broadcaster.stream(),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
 @app.route('/api/containers/health')
 def get_containers_health():
     """Holt den Gesundheitszustand aller Container"""
     try:
-        health_data = []
-        
-        # Hole Liste aller Container
-        result = subprocess.run(
-            ['docker', 'ps', '-a', '--format', '{{.ID}}\t{{.Names}}\t{{.Status}}'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        
-        for line in result.stdout.splitlines():
-            try:
-                container_id, name, status = line.split('\t')
-                
-                # Basis-Container-Informationen
-                container_info = {
-                    'id': container_id[:12],
-                    'name': name,
-                    'status': status.lower(),
-                    'health': 'unknown'
-                }
-                
-                # Prüfe Container-Zustand
-                if 'up' in status.lower():
-                    # Hole detaillierte Container-Informationen
-                    inspect_result = subprocess.run(
-                        ['docker', 'inspect', container_id],
-                        capture_output=True,
-                        text=True,
-                        check=True
-                    )
-                    
-                    inspect_data = json.loads(inspect_result.stdout)[0]
-                    state = inspect_data.get('State', {})
-                    
-                    # Hole Zeitstempel
-                    timestamp = state.get('StartedAt', '')
-                    
-                    # Prüfe ob Zeitstempel vorhanden und gültig ist
-                    if timestamp and len(timestamp) >= 19:
-                        try:
-                            timestamp = timestamp[:19]  # YYYY-MM-DDTHH:MM:SS
-                            started_at = datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S').replace(tzinfo=timezone.utc)
-                            uptime = datetime.now(timezone.utc) - started_at
-                            container_info['uptime'] = str(uptime).split('.')[0]  # Ohne Millisekunden
-                        except ValueError as e:
-                            logger.warning(f"Invalid timestamp format for container {name}: {timestamp}")
-                            container_info['uptime'] = 'unknown'
-                    else:
-                        container_info['uptime'] = 'unknown'
-
-                    # Prüfe Health Check falls vorhanden
-                    health = state.get('Health', {}).get('Status', 'none')
-                    container_info['health'] = health if health != 'none' else 'running'
-                
-                health_data.append(container_info)
+        return jsonify(health_collector.snapshot())
 
-            except Exception as e:
-                logger.error(f"Error processing container {line}: {str(e)}")
-                continue
-
-        return jsonify(health_data)
-
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Error getting container health: {e.stderr}")
+    except DockerGatewayError as e:
+        logger.error(f"Error getting container health: {e}")
         return jsonify([]), 500
     except Exception as e:
         logger.error(f"Error getting container health: {str(e)}")
@@ -896,111 +875,42 @@ def get_containers_health():
 
 @app.route('/api/system/logs')
 def get_system_logs():
-    """Gibt die System-Logs zurück"""
+    """Gibt App-Logs und Docker-Events aus dem Log-Speicher zurück.
+
+    Parameter: after (Cursor), level, source (kommagetrennt), since/until
+    (Unix-Zeit oder ISO-8601) und limit.
+    """
     try:
-        logs = []
-        
-        # 1. Hole Docker Container Logs
-        cmd = ["docker", "logs", "--tail", "50", "webdock-ui"]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            for line in result.stdout.splitlines():
-                try:
-                    # Versuche das Standard-Log-Format zu parsen
-                    if " - " in line:
-                        parts = line.split(" - ", 3)
-                        if len(parts) >= 3:
-                            timestamp_str = parts[0].strip()
-                            try:
-                                timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S,%f')
-                                timestamp_iso = timestamp.isoformat()
-                            except ValueError:
-                                timestamp_iso = None
-                            
-                            logs.append({
-                                'timestamp': timestamp_iso,
-                                'level': parts[2].strip(),
-                                'message': parts[3].strip() if len(parts) > 3 else parts[-1].strip(),
-                                'source': 'webdock-ui'
-                            })
-                    else:
-                        # Fallback für nicht-standardisierte Log-Zeilen
-                        logs.append({
-                            'timestamp': datetime.now().isoformat(),
-                            'level': 'INFO',
-                            'message': line.strip(),
-                            'source': 'webdock-ui'
-                        })
-                except Exception as e:
-                    logger.error(f"Error parsing log line: {e}")
-                    continue
-
-        # 2. Hole Docker Events (Container-Status-Änderungen)
-        cmd = ["docker", "events", "--since", "30m", "--until", "now", "--format", 
-               "{{.Time}} - {{.Type}} - {{.Action}} - {{.Actor.Attributes.name}}"]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            for line in result.stdout.splitlines():
-                try:
-                    parts = line.split(" - ")
-                    if len(parts) >= 4:
-                        timestamp = int(parts[0])
-                        event_type = parts[1]
-                        action = parts[2]
-                        container = parts[3]
-                        
-                        logs.append({
-                            'timestamp': datetime.fromtimestamp(timestamp).isoformat(),
-                            'level': 'EVENT',
-                            'message': f"{event_type}: {action} - Container: {container}",
-                            'source': 'docker'
-                        })
-                except Exception as e:
-                    logger.error(f"Error parsing event: {e}")
-                    continue
-
-        # 3. Hole aktuelle Container-Status
-        cmd = ["docker", "ps", "-a", "--format", "{{.Names}}\t{{.Status}}\t{{.State}}"]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            for line in result.stdout.splitlines():
-                try:
-                    name, status, state = line.split('\t')
-                    logs.append({
-                        'timestamp': datetime.now().isoformat(),
-                        'level': 'STATUS',
-                        'message': f"Container {name}: {status} ({state})",
-                        'source': 'docker'
-                    })
-                except Exception as e:
-                    logger.error(f"Error parsing status: {e}")
-                    continue
+        after = request.args.get('after', type=int)
+        limit = max(1, min(request.args.get('limit', 100, type=int), 1000))
+        levels = [v for v in request.args.get('level', '').split(',') if v]
+        sources = [v for v in request.args.get('source', '').split(',') if v]
+        try:
+            since = parse_time(request.args.get('since'))
+            until = parse_time(request.args.get('until'))
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': f'Invalid time: {e}'}), 400
 
-        # Sortiere alle Logs nach Timestamp
-        logs.sort(key=lambda x: x['timestamp'] if x['timestamp'] else '', reverse=True)
-        return jsonify(logs[:100])  # Limitiere auf die letzten 100 Einträge
-        
+        return jsonify(log_store.query(after=after, levels=levels, sources=sources,
+                                       since=since, until=until, limit=limit))
     except Exception as e:
         logger.error(f"Error reading logs: {str(e)}")
-        return jsonify([{
-            'timestamp': datetime.now().isoformat(),
-            'level': 'ERROR',
-            'message': f"Error reading logs: {str(e)}",
-            'source': 'system'
-        }])
+        return jsonify({'status': 'error', 'message': str(e)}), 500
 
 @app.route('/api/docker/info')
 def get_docker_info():
     try:
         # Hole Docker-Version
-        version_cmd = ["docker", "version", "--format", "{{.Server.Version}}"]
-        version_result = subprocess.run(version_cmd, capture_output=True, text=True)
-        version = version_result.stdout.strip() if version_result.returncode == 0 else "Unknown"
+        try:
+            version = docker_gateway.version().get('Version', 'Unknown')
+        except DockerGatewayError:
+            version = "Unknown"
         
         # Hole Standard-Netzwerk
-        network_cmd = ["docker", "network", "ls", "--filter", "name=bridge", "--format", "{{.Name}}"]
-        network_result = subprocess.run(network_cmd, capture_output=True, text=True)
-        network = network_result.stdout.strip() if network_result.returncode == 0 else "bridge"
+        try:
+            network = '\n'.join(docker_gateway.network_names('bridge')) or "bridge"
+        except DockerGatewayError:
+            network = "bridge"
         
         return jsonify({
             'version': version,
@@ -1099,7 +1009,6 @@ def browse_directories():
 
 @app.route('/api/categories', methods=['GET', 'POST', 'PUT', 'DELETE'])
 def manage_categories():
-    categories_file = '/app/categories.yaml'
     try:
         if request.method == 'GET':
             categories = load_categories()
@@ -1108,39 +1017,29 @@ def manage_categories():
         elif request.method == 'POST':
             # Neue Kategorie hinzufügen
             data = request.json
-            categories = load_categories()
-            if 'categories' not in categories:
-                categories['categories'] = {}
-             
             category_id = data['name'].lower().replace(' ', '_')
-            categories['categories'][category_id] = {
-                'name': data['name'],
-                'icon': data['icon'],
-                'description': data['description'],
-                'containers': data['containers']
-            }
-             
-            with open(categories_file, 'w') as f:
-                yaml.dump(categories, f)
+            with category_store.edit() as categories:
+                categories['categories'][category_id] = {
+                    'name': data['name'],
+                    'icon': data['icon'],
+                    'description': data['description'],
+                    'containers': data['containers']
+                }
              
             return jsonify({'status': 'success', 'message': 'Category added'})
              
         elif request.method == 'PUT':
             # Kategorie aktualisieren
             data = request.json
-            categories = load_categories()
-            
             category_id = request.args.get('id')  # ID aus der URL holen
-            if category_id in categories['categories']:
-                categories['categories'][category_id] = {
-                    'name': data['name'],
-                    'icon': data['icon'],
-                    'description': data['description'],
-                    'containers': data['containers']
-                }
-                 
-                with open(categories_file, 'w') as f:
-                    yaml.dump(categories, f)
+            if category_id in load_categories()['categories']:
+                with category_store.edit() as categories:
+                    categories['categories'][category_id] = {
+                        'name': data['name'],
+                        'icon': data['icon'],
+                        'description': data['description'],
+                        'containers': data['containers']
+                    }
                  
                 return jsonify({'status': 'success', 'message': 'Category updated'})
              
@@ -1149,13 +1048,9 @@ def manage_categories():
         elif request.method == 'DELETE':
             # Kategorie löschen
             category_id = request.args.get('id')
-            categories = load_categories()
-             
-            if category_id in categories['categories']:
-                del categories['categories'][category_id]
-                 
-                with open(categories_file, 'w') as f:
-                    yaml.dump(categories, f)
+            if category_id in load_categories()['categories']:
+                with category_store.edit() as categories:
+                    del categories['categories'][category_id]
                  
                 return jsonify({'status': 'success', 'message': 'Category deleted'})
              
@@ -1169,16 +1064,12 @@ def manage_categories():
 def update_category_order():
     try:
         data = request.json
-        categories = load_categories()
         
-        # Aktualisiere die Positionen
-        for category_id, update in data.items():
-            if category_id in categories['categories']:
-                categories['categories'][category_id]['position'] = update['position']
-        
-        # Speichere die aktualisierten Kategorien
-        with open('/app/categories.yaml', 'w') as f:
-            yaml.dump(categories, f)
+        # Aktualisiere die Positionen und speichere
+        with category_store.edit() as categories:
+            for category_id, update in data.items():
+                if category_id in categories['categories']:
+                    categories['categories'][category_id]['position'] = update['position']
         
         return jsonify({'status': 'success', 'message': 'Category order updated'})
     except Exception as e:
@@ -1186,19 +1077,27 @@ def update_category_order():
         return {'error': str(e)}, 500
 
 def init_app():
-    """Initialisiert die Anwendung"""
+    """Initialisiert die Anwendung; langsame Schritte laufen im Hintergrund"""
     try:
-        # Erstelle notwendige Verzeichnisse
-        os.makedirs('/app/config', exist_ok=True)
-        os.makedirs('/app/data', exist_ok=True)
-        
-        # Lade die docker-compose Files beim Start
-        logger.info("Downloading compose files on startup...")
-        download_compose_files()
-        
-        # Lade oder erstelle Kategorien
-        categories = load_categories()
-        logger.info(f"Loaded categories: {categories}")
+        with startup_tasks.phase('init'):
+            # Erstelle notwendige Verzeichnisse
+            os.makedirs('/app/config', exist_ok=True)
+            os.makedirs('/app/data', exist_ok=True)
+            
+            # Starte den Container-Index (Docker-Event-Stream) und den System-Sampler
+            log_store.start()
+            ssh_connections.start()
+            container_index.start()
+            system_sampler.start()
+            container_stats_collector.start()
+            compose_catalog.start()
+        
+        # Bis der Sync fertig ist, wird der zuletzt gespeicherte Katalog ausgeliefert
+        startup_tasks.add('catalog sync', download_compose_files, required=False)
+        startup_tasks.add('catalog warm-up', compose_catalog.configs)
+        startup_tasks.add('categories', category_store.get)
+        startup_tasks.add('container index', container_index.wait_synced)
+        startup_tasks.start()
         
         return True
     except Exception as e:
@@ -1292,15 +1191,19 @@ def get_container_config(container_name):
 def restart_container(container_name):
     try:
         compose_file = f'/home/webDock/docker-compose-data/{container_name}/docker-compose.yml'
+        compose_cmd = ['docker', 'compose', '-f', compose_file]
         
         # Neustart des Containers
-        subprocess.run(['docker', 'compose', '-f', compose_file, 'down'])
-        subprocess.run(['docker', 'compose', '-f', compose_file, 'up', '-d'])
+        job = job_manager.submit('restart', container_name, run_compose_steps, [
+            ('down', compose_cmd + ['down']),
+            ('up', compose_cmd + ['up', '-d'])
+        ], f'Container {container_name} restarted successfully')
         
         return jsonify({
-            'status': 'success',
-            'message': f'Container {container_name} restarted successfully'
-        })
+            'status': 'accepted',
+            'job_id': job.id,
+            'message': f'Restarting container {container_name}'
+        }), 202
     except Exception as e:
         logger.exception(f"Error restarting {container_name}")
         return jsonify({
@@ -1338,20 +1241,14 @@ def update_port_mapping(compose_content, new_port):
 def container_info(container_name):
     try:
         # Hole Container-Informationen mit docker inspect
-        result = subprocess.run(
-            ['docker', 'inspect', container_name],
-            capture_output=True,
-            text=True
-        )
+        info = docker_gateway.inspect_container_raw(container_name)
         
-        if result.returncode != 0:
+        if info is None:
             return jsonify({
                 'status': 'error',
                 'message': 'Container not found'
             }), 404
         
-        info = json.loads(result.stdout)[0]
-        
         # Extrahiere relevante Informationen
         network_settings = info.get('NetworkSettings', {})
         networks = list(network_settings.get('Networks', {}).keys())
@@ -1384,6 +1281,119 @@ def container_info(container_name):
             'message': str(e)
         }), 500
 
+@app.route('/api/container/<container_name>/stats')
+def container_stats(container_name):
+    """Letzte Messung und optional die Historie (?history=1&range=15m) eines Containers"""
+    try:
+        latest = container_stats_collector.latest(container_name)
+        if latest is None and container_index.get(container_name) is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Container not found'
+            }), 404
+        
+        result = {
+            'name': container_name,
+            'interval': container_stats_collector.interval,
+            'latest': latest
+        }
+        if request.args.get('history'):
+            seconds = parse_range(request.args['range']) if request.args.get('range') else None
+            result['history'] = container_stats_collector.history(container_name, seconds)
+        return jsonify(result)
+        
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        logger.exception(f"Error getting stats for {container_name}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/containers/stats/top')
+def containers_stats_top():
+    """Container sortiert nach einer Metrik (?metric=cpu|memory|net_rx|...&n=5)"""
+    try:
+        metric = request.args.get('metric', 'cpu')
+        limit = int(request.args.get('n', 5))
+        return jsonify(container_stats_collector.top(metric, limit))
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        logger.exception("Error getting top container stats")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+def parse_log_since(value):
+    """`since` als Unix-Zeit, ISO-8601 oder relativ (z.B. '15m')"""
+    if not value:
+        return None
+    try:
+        return parse_time(value)
+    except ValueError:
+        return time.time() - parse_range(value)
+
+@app.route('/api/container/<container_name>/logs')
+def container_logs(container_name):
+    """Logs eines Containers (?tail=N&since=...); mit ?follow=1 als SSE-Stream"""
+    try:
+        tail = request.args.get('tail', '100')
+        # 'all' wird wie jede andere Angabe auf LOG_TAIL_MAX Zeilen begrenzt
+        tail = LOG_TAIL_MAX if tail == 'all' else max(0, min(int(tail), LOG_TAIL_MAX))
+        since = parse_log_since(request.args.get('since'))
+        
+        if container_index.get(container_name) is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Container not found'
+            }), 404
+        
+        if request.args.get('follow') in ('1', 'true'):
+            return Response(
+                container_log_hub.stream(container_name, tail=tail, since=since),
+                mimetype='text/event-stream',
+                headers={
+                    'Cache-Control': 'no-cache',
+                    'X-Accel-Buffering': 'no'
+                }
+            )
+        
+        lines = container_log_hub.open_tail(container_name, tail=tail, since=since)
+        if lines is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Container not found'
+            }), 404
+        
+        def generate():
+            # Zeilen direkt weiterreichen statt die ganze Antwort im Speicher aufzubauen
+            yield f'{{"name": {json.dumps(container_name)}, "lines": ['
+            for index, line in enumerate(lines):
+                yield (',' if index else '') + json.dumps(line.to_dict())
+            yield ']}'
+        return Response(generate(), mimetype='application/json')
+        
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        logger.exception(f"Error getting logs for {container_name}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
 @app.route('/api/debug/compose-files')
 def debug_compose_files():
     """Debug-Endpunkt zum Überprüfen der heruntergeladenen Dateien"""
@@ -1417,18 +1427,9 @@ def debug_compose_files():
 @app.route('/api/containers/status')
 def get_containers_status():
     try:
-        cmd = ["docker", "ps", "-a", "--format", "{{.Names}}\t{{.State}}"]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        
-        status_dict = {}
-        for line in result.stdout.strip().split('\n'):
-            if line:
-                name, state = line.split('\t')
-                status_dict[name] = state
-        
-        return jsonify(status_dict)
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Docker command failed: {e.stderr}")
+        return jsonify(container_index.states())
+    except DockerGatewayError as e:
+        logger.error(f"Docker API request failed: {e}")
         return jsonify({'error': 'Docker command failed'}), 500
     except Exception as e:
         logger.exception("Error getting container status")
@@ -1502,22 +1503,21 @@ password_file /mosquitto/config/passwd
             passwd_file = os.path.join(config_dir, "passwd")
             try:
                 # Erstelle die Passwort-Datei im Container
-                result = subprocess.run([
-                    'docker', 'run', '--rm',
-                    '-v', f'{config_dir}:/mosquitto/config',
+                output = docker_gateway.run_oneshot(
                     'eclipse-mosquitto:latest',
-                    'sh', '-c',
-                    f'touch /mosquitto/config/passwd && mosquitto_passwd -b /mosquitto/config/passwd {username} {password}'
-                ], capture_output=True, text=True, check=True)
+                    ['sh', '-c',
+                     f'touch /mosquitto/config/passwd && mosquitto_passwd -b /mosquitto/config/passwd {username} {password}'],
+                    binds=[f'{config_dir}:/mosquitto/config']
+                )
                 
                 logger.info(f"Created password file for user {username}")
-                logger.info(f"Command output: {result.stdout}")
+                logger.info(f"Command output: {output}")
                 
                 # Setze Berechtigungen
                 os.chmod(passwd_file, 0o644)
                 
-            except subprocess.CalledProcessError as e:
-                logger.error(f"Error creating password file: {e.stderr}")
+            except DockerGatewayError as e:
+                logger.error(f"Error creating password file: {e}")
                 raise
         else:
             # Erstelle leere Passwort-Datei
@@ -1564,11 +1564,11 @@ def setup_influxdb(container_name, install_path, config_data):
                 time.sleep(10)  # Warte bis Container läuft
                 try:
                     cmd = [
-                        'docker', 'exec', container_name,
                         'influx', '-execute',
                         "CREATE DATABASE database1; CREATE USER user1 WITH PASSWORD 'pwd12345'; GRANT ALL ON database1 TO user1"
                     ]
-                    subprocess.run(cmd, check=True)
+                    if docker_gateway.exec_run(container_name, cmd) != 0:
+                        raise Exception("influx command failed")
                     logger.info("InfluxDB default database created successfully")
                 except Exception as e:
                     logger.error(f"Failed to create InfluxDB database: {str(e)}")
@@ -1746,6 +1746,9 @@ def update_compose_file(compose_content, install_data):
 def connect_to_server():
     try:
         data = request.json
+        if ssh_connections.full:
+            raise SSHSessionLimitError(f"Maximum of {ssh_connections.max_sessions} SSH sessions reached")
+        
         client = paramiko.SSHClient()
         client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         
@@ -1758,15 +1761,21 @@ def connect_to_server():
         
         # Erstelle eine persistente Session
         session = SSHSession(client)
-        
-        # Generiere eine eindeutige Session-ID
-        session_id = str(uuid.uuid4())
-        ssh_connections[session_id] = session
+        try:
+            session_id = ssh_connections.add(session, data['host'], data['username'])
+        except SSHSessionLimitError:
+            session.close()
+            raise
         
         return jsonify({
             'status': 'success',
             'connection': session_id
         })
+    except SSHSessionLimitError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -1776,10 +1785,7 @@ def connect_to_server():
 @app.route('/api/disconnect', methods=['POST'])
 def disconnect_from_server():
     try:
-        session_id = request.json.get('connection')
-        if session_id in ssh_connections:
-            ssh_connections[session_id].close()
-            del ssh_connections[session_id]
+        ssh_connections.close(request.json.get('connection'))
         return jsonify({'status': 'success'})
     except Exception as e:
         return jsonify({
@@ -1787,6 +1793,18 @@ def disconnect_from_server():
             'message': str(e)
         }), 500
 
+@app.route('/api/ssh/sessions')
+def get_ssh_sessions():
+    """Metriken der Terminal-Sitzungen (Anzahl, Bytes, Alter)"""
+    try:
+        return jsonify(ssh_connections.metrics())
+    except Exception as e:
+        logger.exception("Error getting SSH session metrics")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
 @app.route('/api/schedule-shutdown', methods=['POST'])
 def schedule_shutdown():
     try:
@@ -1811,15 +1829,6 @@ def schedule_shutdown():
         
         sleep_duration = wakeup_seconds - shutdown_seconds
         
-        # Erstelle SSH-Verbindung
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh.connect(
-            data['hostIp'],
-            username=data['hostUser'],
-            password=data['hostPassword']
-        )
-
         # Erstelle Skript auf dem Host
         script_content = f"""#!/bin/bash
 # Shutdown schedule created by BangerTech UI
@@ -1828,37 +1837,37 @@ def schedule_shutdown():
 rtcwake -m no -s {sleep_duration}
 shutdown -h now"""
 
-        # Hole aktuelle Crontab
-        stdin, stdout, stderr = ssh.exec_command('crontab -l')
-        current_crontab = stdout.read().decode()
+        # SSH-Verbindung aus dem Pool
+        with ssh_pool.client(data['hostIp'], data['hostUser'], data['hostPassword']) as ssh:
+            # Hole aktuelle Crontab
+            stdin, stdout, stderr = ssh.exec_command('crontab -l')
+            current_crontab = stdout.read().decode()
         
-        # Entferne alte Einträge für die gleiche Zeit
-        new_crontab = '\n'.join(
-            line for line in current_crontab.splitlines()
-            if not (f"{shutdown_time.minute} {shutdown_time.hour}" in line and 'shutwake.sh' in line)
-        )
+            # Entferne alte Einträge für die gleiche Zeit
+            new_crontab = '\n'.join(
+                line for line in current_crontab.splitlines()
+                if not (f"{shutdown_time.minute} {shutdown_time.hour}" in line and 'shutwake.sh' in line)
+            )
         
-        # Füge neuen Job hinzu
-        new_job = f"{shutdown_time.minute} {shutdown_time.hour} * * * /usr/local/bin/shutwake.sh"
-        if new_crontab:
-            new_crontab += '\n' + new_job
-        else:
-            new_crontab = new_job
-
-        # Sende Befehle zum Host
-        commands = [
-            f'echo "{script_content}" > /usr/local/bin/shutwake.sh',
-            'chmod +x /usr/local/bin/shutwake.sh',
-            f'echo "{new_crontab}" | crontab -'
-        ]
+            # Füge neuen Job hinzu
+            new_job = f"{shutdown_time.minute} {shutdown_time.hour} * * * /usr/local/bin/shutwake.sh"
+            if new_crontab:
+                new_crontab += '\n' + new_job
+            else:
+                new_crontab = new_job
 
-        for cmd in commands:
-            stdin, stdout, stderr = ssh.exec_command(cmd)
-            error = stderr.read().decode()
-            if error:
-                raise Exception(f"Command failed: {error}")
+            # Sende Befehle zum Host
+            commands = [
+                f'echo "{script_content}" > /usr/local/bin/shutwake.sh',
+                'chmod +x /usr/local/bin/shutwake.sh',
+                f'echo "{new_crontab}" | crontab -'
+            ]
 
-        ssh.close()
+            for cmd in commands:
+                stdin, stdout, stderr = ssh.exec_command(cmd)
+                error = stderr.read().decode()
+                if error:
+                    raise Exception(f"Command failed: {error}")
 
         return jsonify({
             'status': 'success',
@@ -1892,50 +1901,41 @@ def get_schedules():
             }), 400
 
         app.logger.info("Attempting SSH connection...")
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh.connect(
-            config['ip'],
-            username=config['username'],
-            password=config['password']
-        )
-        
-        app.logger.info("Reading crontab...")
-        stdin, stdout, stderr = ssh.exec_command('crontab -l')
-        crontab = stdout.read().decode()
-        app.logger.info(f"Current crontab:\n{crontab}")
-        
-        schedules = []
-        for line in crontab.splitlines():
-            if '/usr/local/bin/shutwake.sh' in line:
-                try:
-                    minute, hour, *_ = line.split()
-                    # Extrahiere Wake-up Zeit aus dem Skript
-                    _, stdout, _ = ssh.exec_command('cat /usr/local/bin/shutwake.sh')
-                    script_content = stdout.read().decode()
+        with ssh_pool.client(config['ip'], config['username'], config['password']) as ssh:
+            app.logger.info("Reading crontab...")
+            stdin, stdout, stderr = ssh.exec_command('crontab -l')
+            crontab = stdout.read().decode()
+            app.logger.info(f"Current crontab:\n{crontab}")
+        
+            schedules = []
+            for line in crontab.splitlines():
+                if '/usr/local/bin/shutwake.sh' in line:
+                    try:
+                        minute, hour, *_ = line.split()
+                        # Extrahiere Wake-up Zeit aus dem Skript
+                        _, stdout, _ = ssh.exec_command('cat /usr/local/bin/shutwake.sh')
+                        script_content = stdout.read().decode()
                     
-                    # Parse die rtcwake Sekunden
-                    if match := re.search(r'-s (\d+)', script_content):
-                        seconds = int(match.group(1))
-                        shutdown_time = f"{hour.zfill(2)}:{minute.zfill(2)}"
-                        shutdown_dt = datetime.strptime(shutdown_time, '%H:%M')
-                        wakeup_dt = shutdown_dt + timedelta(seconds=seconds)
-                        wakeup_time = wakeup_dt.strftime('%H:%M')
+                        # Parse die rtcwake Sekunden
+                        if match := re.search(r'-s (\d+)', script_content):
+                            seconds = int(match.group(1))
+                            shutdown_time = f"{hour.zfill(2)}:{minute.zfill(2)}"
+                            shutdown_dt = datetime.strptime(shutdown_time, '%H:%M')
+                            wakeup_dt = shutdown_dt + timedelta(seconds=seconds)
+                            wakeup_time = wakeup_dt.strftime('%H:%M')
                         
-                        # Erstelle eine eindeutige ID basierend auf der Zeit
-                        schedule_id = f"{hour}:{minute}"
+                            # Erstelle eine eindeutige ID basierend auf der Zeit
+                            schedule_id = f"{hour}:{minute}"
                         
-                        schedules.append({
-                            'id': schedule_id,
-                            'shutdown': shutdown_time,
-                            'wakeup': wakeup_time
-                        })
-                        app.logger.info(f"Found schedule: {schedule_id} (Shutdown: {shutdown_time}, Wake: {wakeup_time})")
-                except Exception as e:
-                    app.logger.error(f"Error parsing schedule: {e}")
-                    continue
-        
-        ssh.close()
+                            schedules.append({
+                                'id': schedule_id,
+                                'shutdown': shutdown_time,
+                                'wakeup': wakeup_time
+                            })
+                            app.logger.info(f"Found schedule: {schedule_id} (Shutdown: {shutdown_time}, Wake: {wakeup_time})")
+                    except Exception as e:
+                        app.logger.error(f"Error parsing schedule: {e}")
+                        continue
         return jsonify({'schedules': schedules})
         
     except Exception as e:
@@ -1945,6 +1945,25 @@ def get_schedules():
             'message': str(e)
         }), 500
 
+def check_terminal_command(command):
+    """Antwort für Befehle, die das Web-Terminal nicht ausführt (Editor, interaktiv)"""
+    # Prüfe auf Editor-Befehle
+    if command.startswith(('nano ', 'vi ', 'vim ')):
+        filepath = command.split(' ', 1)[1].strip()
+        return jsonify({
+            'status': 'editor',
+            'path': filepath
+        })
+    
+    # Prüfe auf interaktive Befehle
+    interactive_commands = ['nano', 'vim', 'vi', 'less', 'more']
+    if any(command.startswith(cmd) for cmd in interactive_commands):
+        return jsonify({
+            'status': 'error',
+            'message': 'Interactive commands are not supported in web terminal'
+        })
+    return None
+
 @app.route('/api/execute', methods=['POST'])
 def execute_command():
     try:
@@ -1964,71 +1983,23 @@ def execute_command():
                 'message': 'Not connected'
             }), 400
         
-        # Prüfe auf Editor-Befehle
-        if command.startswith(('nano ', 'vi ', 'vim ')):
-            filepath = command.split(' ', 1)[1].strip()
-            return jsonify({
-                'status': 'editor',
-                'path': filepath
-            })
+        unsupported = check_terminal_command(command)
+        if unsupported is not None:
+            return unsupported
             
         session = ssh_connections[session_id]
-        channel = session.channel
-        
-        # Prüfe auf interaktive Befehle
-        interactive_commands = ['nano', 'vim', 'vi', 'less', 'more']
-        if any(command.startswith(cmd) for cmd in interactive_commands):
-            return jsonify({
-                'status': 'error',
-                'message': 'Interactive commands are not supported in web terminal'
-            })
-        
-        # Sende Befehl
-        channel.send(f"{command}\n")
-        time.sleep(0.1)
-        
-        # Lese Ausgabe
-        output = ""
-        while True:
-            try:
-                if channel.recv_ready():
-                    chunk = channel.recv(4096).decode()
-                    output += chunk
-                else:
-                    time.sleep(0.1)
-                    if not channel.recv_ready():
-                        break
-            except socket.timeout:
-                break
-        
-        # Bereinige die Ausgabe
-        lines = output.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            if not any(x in line for x in ['[?2004', '$', '#', command]) and line.strip():
-                cleaned_lines.append(line.strip())
-        
-        cleaned_output = '\n'.join(cleaned_lines)
-        
-        # Hole aktuelles Verzeichnis und Prompt-Info
-        channel.send('echo -n "$(whoami)@$(hostname):$(pwd)"\n')
-        time.sleep(0.1)
-        info_output = channel.recv(1024).decode()
         
-        try:
-            username, rest = info_output.split('@')
-            hostname, pwd = rest.split(':')
-        except ValueError:
-            username = 'root'  # Fallback wenn Split fehlschlägt
-            hostname = 'debian-test'
-            pwd = '~'
+        # Wartet auf den Marker am Ende des Befehls statt auf eine Pause in der Ausgabe
+        result = session.execute(command)
         
         return jsonify({
             'status': 'success',
-            'output': cleaned_output,
-            'pwd': pwd,
-            'username': username.strip(),
-            'hostname': hostname.strip()
+            'output': result['output'].rstrip('\n'),
+            'complete': result['complete'],
+            'exit_code': result['exit_code'],
+            'pwd': result['pwd'],
+            'username': result['username'],
+            'hostname': result['hostname']
         })
         
     except Exception as e:
@@ -2049,39 +2020,13 @@ def get_terminal_info():
                 'message': 'Not connected'
             }), 400
             
-        ssh = ssh_connections[session_id]
-        
-        # Erstelle eine neue Shell-Session für die Info-Abfrage
-        channel = ssh.invoke_shell()
-        channel.settimeout(1)
-        
-        # Deaktiviere Terminal-Formatierung
-        channel.send('export TERM=dumb\n')
-        channel.send('stty -echo\n')
-        time.sleep(0.1)
-        channel.recv(1024)  # Clear buffer
-        
-        # Hole Benutzer
-        channel.send('echo $USER\n')
-        time.sleep(0.1)
-        username = channel.recv(1024).decode().strip().split('\n')[-1]
-        
-        # Hole Hostname
-        channel.send('hostname\n')
-        time.sleep(0.1)
-        hostname = channel.recv(1024).decode().strip().split('\n')[-1]
-        
-        # Hole PWD
-        channel.send('pwd\n')
-        time.sleep(0.1)
-        pwd = channel.recv(1024).decode().strip().split('\n')[-1]
-        
-        channel.close()
+        # Benutzer, Host und Verzeichnis kommen mit jedem Befehls-Marker
+        info = ssh_connections[session_id].info
         
         return jsonify({
-            'username': username,
-            'hostname': hostname,
-            'pwd': pwd
+            'username': info['username'],
+            'hostname': info['hostname'],
+            'pwd': info['pwd']
         })
             
     except Exception as e:
@@ -2102,14 +2047,9 @@ def get_current_pwd():
                 'message': 'Not connected'
             }), 400
             
-        ssh = ssh_connections[session_id]
-        
-        # Hole aktuelles Verzeichnis
-        _, stdout, _ = ssh.exec_command('pwd')
-        pwd = stdout.read().decode().strip()
-        
+        # Verzeichnis der Shell laut letztem Befehls-Marker
         return jsonify({
-            'pwd': pwd
+            'pwd': ssh_connections[session_id].info['pwd']
         })
             
     except Exception as e:
@@ -2118,6 +2058,93 @@ def get_current_pwd():
             'message': str(e)
         }), 500
 
+@app.route('/api/terminal/command', methods=['POST'])
+def start_terminal_command():
+    """Startet einen Befehl; die Ausgabe kommt über /api/terminal/stream"""
+    try:
+        data = request.json
+        command = data.get('command')
+        session_id = data.get('connection')
+        
+        if not command or not session_id:
+            return jsonify({
+                'status': 'error',
+                'message': 'Missing command or connection'
+            }), 400
+            
+        if session_id not in ssh_connections:
+            return jsonify({
+                'status': 'error',
+                'message': 'Not connected'
+            }), 400
+        
+        unsupported = check_terminal_command(command)
+        if unsupported is not None:
+            return unsupported
+        
+        command_id, cursor = ssh_connections[session_id].send_command(command)
+        return jsonify({
+            'status': 'accepted',
+            'command_id': command_id,
+            'cursor': cursor
+        }), 202
+        
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/terminal/stream')
+def stream_terminal():
+    """SSE mit der Shell-Ausgabe ab ?after=; endet nach dem Marker von ?command="""
+    session_id = request.args.get('connection')
+    if session_id not in ssh_connections:
+        return jsonify({
+            'status': 'error',
+            'message': 'Not connected'
+        }), 400
+    
+    session = ssh_connections[session_id]
+    # Beim Reconnect setzt der Browser Last-Event-ID
+    after = request.headers.get('Last-Event-ID', type=int)
+    if after is None:
+        after = request.args.get('after', type=int)
+    return Response(
+        session.stream(session.cursor if after is None else after, request.args.get('command')),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+@app.route('/api/terminal/input', methods=['POST'])
+def send_terminal_input():
+    """Rohe Eingabe an einen laufenden Befehl oder Strg+C (interrupt + command)"""
+    try:
+        data = request.json
+        session_id = data.get('connection')
+        
+        if session_id not in ssh_connections:
+            return jsonify({
+                'status': 'error',
+                'message': 'Not connected'
+            }), 400
+        
+        session = ssh_connections[session_id]
+        if data.get('interrupt') and data.get('command'):
+            session.interrupt(data['command'])
+        else:
+            session.send_input(data.get('data', ''))
+        return jsonify({'status': 'success'})
+        
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
 @app.route('/api/complete', methods=['POST'])
 def complete_command():
     try:
@@ -2132,7 +2159,6 @@ def complete_command():
             }), 400
             
         session = ssh_connections[session_id]
-        channel = session.channel
         
         # Hole aktuelle Verzeichnisstruktur für Datei-Completion
         if ' ' in partial_command:  # Wenn Befehl bereits eingegeben wurde
@@ -2145,13 +2171,7 @@ def complete_command():
         else:  # Befehl-Completion
             completion_cmd = f"compgen -c -- '{partial_command}' 2>/dev/null"
         
-        channel.send(f"{completion_cmd}\n")
-        time.sleep(0.1)
-        
-        # Lese Ausgabe
-        output = ""
-        while channel.recv_ready():
-            output += channel.recv(1024).decode()
+        output = session.execute(completion_cmd)['output']
         
         # Parse Ausgabe
         suggestions = [
@@ -2196,10 +2216,11 @@ def handle_file():
             
         session = ssh_connections[session_id]
         
+        sftp = session.sftp()
+        
         if request.method == 'GET':
             # Lese Datei
-            _, stdout, _ = session.client.exec_command(f'cat "{filepath}"')
-            content = stdout.read().decode()
+            content = remote_files.read_file(sftp, filepath).decode()
             return jsonify({
                 'status': 'success',
                 'content': content
@@ -2207,16 +2228,10 @@ def handle_file():
         else:
             # Schreibe Datei
             content = data.get('content', '')
-            stdin, stdout, stderr = session.client.exec_command(f'cat > "{filepath}"')
-            stdin.write(content)
-            stdin.close()
-            
-            error = stderr.read().decode()
-            if error:
-                return jsonify({
-                    'status': 'error',
-                    'message': error
-                })
+            if data.get('create', False):
+                remote_files.makedirs(sftp, os.path.dirname(filepath))
+            remote_files.write_file(sftp, filepath, content.encode())
+            session.listings.invalidate(os.path.dirname(filepath))
                 
             return jsonify({
                 'status': 'success',
@@ -2245,23 +2260,16 @@ def save_file():
             }), 400
             
         session = ssh_connections[session_id]
+        sftp = session.sftp()
         
         # Prüfe ob Datei existiert
         if create:
             # Erstelle Verzeichnis falls nötig
-            session.client.exec_command(f'mkdir -p "$(dirname "{filepath}")"')
+            remote_files.makedirs(sftp, os.path.dirname(filepath))
         
         # Schreibe Datei
-        stdin, stdout, stderr = session.client.exec_command(f'cat > "{filepath}"')
-        stdin.write(content)
-        stdin.close()
-        
-        error = stderr.read().decode()
-        if error:
-            return jsonify({
-                'status': 'error',
-                'message': error
-            })
+        remote_files.write_file(sftp, filepath, content.encode())
+        session.listings.invalidate(os.path.dirname(filepath))
             
         return jsonify({
             'status': 'success',
@@ -2274,6 +2282,86 @@ def save_file():
             'message': str(e)
         }), 500
 
+@app.route('/api/file/download', methods=['GET'])
+def download_file():
+    """Streamt eine entfernte Datei; unterstützt Range und optional gzip (?gzip=1)"""
+    try:
+        session_id = request.args.get('connection')
+        filepath = request.args.get('path')
+        
+        if not all([session_id, filepath]):
+            return jsonify({
+                'status': 'error',
+                'message': 'Missing required parameters'
+            }), 400
+            
+        if session_id not in ssh_connections:
+            return jsonify({
+                'status': 'error',
+                'message': 'Not connected'
+            }), 400
+            
+        session = ssh_connections[session_id]
+        sftp = session.sftp()
+        try:
+            attributes = sftp.stat(filepath)
+        except FileNotFoundError:
+            return jsonify({
+                'status': 'error',
+                'message': 'File not found'
+            }), 404
+        if stat.S_ISDIR(attributes.st_mode):
+            return jsonify({
+                'status': 'error',
+                'message': 'Path is a directory'
+            }), 400
+        
+        size = attributes.st_size
+        filename = os.path.basename(filepath)
+        headers = {
+            'Accept-Ranges': 'bytes',
+            'Last-Modified': datetime.fromtimestamp(attributes.st_mtime, timezone.utc).strftime('%a, %d %b %Y %H:%M:%S GMT'),
+            'Cache-Control': 'no-cache'
+        }
+        if request.args.get('download'):
+            headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(filename)}"
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        
+        if request.args.get('gzip') and 'gzip' in request.headers.get('Accept-Encoding', ''):
+            # Komprimiert wird immer die ganze Datei, die Länge ist vorher unbekannt
+            headers['Content-Encoding'] = 'gzip'
+            headers['Vary'] = 'Accept-Encoding'
+            chunks = remote_files.gzip_chunks(remote_files.iter_file(sftp, filepath, 0, size, session.touch))
+            return Response(chunks, mimetype=mimetype, headers=headers)
+        
+        start, stop, status = 0, size, 200
+        if request.range is not None:
+            byte_range = request.range.range_for_length(size)
+            if byte_range is not None:
+                start, stop = byte_range
+                headers['Content-Range'] = f'bytes {start}-{stop - 1}/{size}'
+                status = 206
+            elif len(request.range.ranges) == 1:
+                headers['Content-Range'] = f'bytes */{size}'
+                return Response(status=416, headers=headers)
+            # Mehrere Bereiche werden nicht unterstützt, dann die ganze Datei
+        headers['Content-Length'] = str(stop - start)
+        
+        return Response(
+            remote_files.iter_file(sftp, filepath, start, stop, session.touch),
+            status=status,
+            mimetype=mimetype,
+            headers=headers,
+            direct_passthrough=True
+        )
+        
+    except Exception as e:
+        logger.error(f"Error downloading file: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
 @app.route('/api/files', methods=['POST'])
 def list_files():
     try:
@@ -2286,26 +2374,30 @@ def list_files():
                 'status': 'error',
                 'message': 'Not connected'
             }), 400
-            
+        
+        # Seitenweise Ausgabe, Sortierung und Filter
+        try:
+            cursor = int(data.get('cursor') or 0)
+            limit = int(data.get('limit') or LISTING_PAGE_SIZE)
+            modified_since = parse_time(str(data['modified_since'])) if data.get('modified_since') else None
+        except ValueError:
+            return jsonify({
+                'status': 'error',
+                'message': 'Invalid cursor, limit or modified_since'
+            }), 400
+        sort = data.get('sort', 'name')
+        order = data.get('order', 'asc')
+        kind = data.get('type')
+        if cursor < 0 or sort not in SORT_KEYS or order not in ('asc', 'desc') or kind not in (None, 'file', 'directory'):
+            return jsonify({
+                'status': 'error',
+                'message': 'Invalid listing parameters'
+            }), 400
+        
         session = ssh_connections[session_id]
-        sftp = session.client.open_sftp()
-        
-        files = []
-        for entry in sftp.listdir_attr(path):
-            file_path = os.path.join(path, entry.filename)
-            files.append({
-                'name': entry.filename,
-                'type': 'directory' if stat.S_ISDIR(entry.st_mode) else 'file',
-                'size': entry.st_size,
-                'modified': entry.st_mtime,
-                'path': file_path
-            })
-            
-        sftp.close()
-        return jsonify({
-            'status': 'success',
-            'files': sorted(files, key=lambda x: (x['type'] == 'file', x['name']))
-        })
+        page = session.listings.page(session.sftp(), path, cursor, limit, sort, order,
+                                     data.get('pattern'), kind, modified_since)
+        return jsonify(dict(page, status='success'))
         
     except Exception as e:
         return jsonify({
@@ -2315,6 +2407,7 @@ def list_files():
 
 @app.route('/api/upload', methods=['POST'])
 def upload_file():
+    """Multipart-Upload (veraltet); große Dateien über /api/upload/stream hochladen"""
     try:
         session_id = request.form.get('connection')
         path = request.form.get('path')
@@ -2333,17 +2426,13 @@ def upload_file():
             }), 400
             
         session = ssh_connections[session_id]
-        sftp = session.client.open_sftp()
         
-        # Erstelle temporäre Datei
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            file.save(tmp.name)
-            # Upload via SFTP
-            remote_path = os.path.join(path, file.filename)
-            sftp.put(tmp.name, remote_path)
-            os.unlink(tmp.name)
+        # Werkzeug hat den Multipart-Body bereits zwischengespeichert (ab 500 KB als temporäre Datei);
+        # von dort geht es ohne weitere Kopie per SFTP zum Host
+        remote_path = os.path.join(path, file.filename)
+        remote_files.write_stream(session.sftp(), remote_path, file.stream, on_chunk=session.touch)
+        session.listings.invalidate(path)
         
-        sftp.close()
         return jsonify({
             'status': 'success',
             'message': f'File {file.filename} uploaded successfully'
@@ -2355,6 +2444,151 @@ def upload_file():
             'message': str(e)
         }), 500
 
+def upload_target(values):
+    """(Session, Zielpfad, Teildatei, Größe) eines fortsetzbaren Uploads oder eine Fehler-Response"""
+    session_id = values.get('connection')
+    path = values.get('path')
+    name = values.get('name')
+    try:
+        size = int(values.get('size'))
+    except (TypeError, ValueError):
+        size = -1
+    
+    if not all([session_id, path, name]) or '/' in name or name in ('.', '..') or size < 0:
+        return None, (jsonify({
+            'status': 'error',
+            'message': 'Missing or invalid parameters'
+        }), 400)
+        
+    if session_id not in ssh_connections:
+        return None, (jsonify({
+            'status': 'error',
+            'message': 'Not connected'
+        }), 400)
+    
+    # Name, Größe und Änderungszeit bestimmen, welche Teildatei fortgesetzt wird
+    part_path = remote_files.upload_part_path(path, name, size, str(values.get('modified', '')))
+    return (ssh_connections[session_id], os.path.join(path, name), part_path, size), None
+
+@app.route('/api/upload/stream', methods=['GET', 'PUT'])
+def upload_stream():
+    """Fortsetzbarer Upload (?name=&size=&modified=): GET liefert den Offset, PUT schreibt den Body ab `offset`
+
+    offset=0 beginnt den Upload neu. Mit dem Header X-Content-SHA256 wird der Block geprüft.
+    """
+    try:
+        target, error = upload_target(request.args)
+        if error:
+            return error
+        session, remote_path, part_path, total = target
+        sftp = session.sftp()
+        current = remote_files.file_size(sftp, part_path) or 0
+        
+        if request.method == 'GET':
+            return jsonify({
+                'status': 'success',
+                'offset': current
+            })
+        
+        offset = request.args.get('offset', 0, type=int)
+        if offset != current and offset != 0:
+            # Der Client muss ab dem tatsächlichen Stand weitermachen
+            return jsonify({
+                'status': 'error',
+                'message': f'Offset mismatch, upload is at {current} bytes',
+                'offset': current
+            }), 409
+        if request.content_length is not None and offset + request.content_length > total:
+            return jsonify({
+                'status': 'error',
+                'message': 'Chunk exceeds the declared file size',
+                'offset': current
+            }), 400
+        
+        digest = hashlib.sha256()
+        size = remote_files.write_stream(sftp, part_path, request.stream, offset, digest, session.touch)
+        expected = request.headers.get('X-Content-SHA256', '').lower()
+        if size > total or (expected and expected != digest.hexdigest()):
+            # Den fehlerhaften Block verwerfen, der Client sendet ihn erneut
+            sftp.truncate(part_path, offset)
+            return jsonify({
+                'status': 'error',
+                'message': 'Chunk checksum mismatch' if size <= total else 'Chunk exceeds the declared file size',
+                'offset': offset
+            }), 422
+        
+        return jsonify({
+            'status': 'success',
+            'offset': size
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in streaming upload: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/upload/complete', methods=['POST'])
+def upload_complete():
+    """Prüft Größe und optional SHA-256 des Uploads und benennt ihn ans Ziel um
+
+    Ohne `sha256` wird nicht neu gehasht; die Blöcke prüft dann schon X-Content-SHA256.
+    """
+    try:
+        data = request.json or {}
+        target, error = upload_target(data)
+        if error:
+            return error
+        session, remote_path, part_path, total = target
+        sftp = session.sftp()
+        
+        size = remote_files.file_size(sftp, part_path)
+        if size is None and total == 0:
+            # Für leere Dateien sendet der Client keinen Block
+            remote_files.write_file(sftp, part_path, b'')
+            size = 0
+        if size is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'No upload in progress'
+            }), 404
+        if size != total:
+            return jsonify({
+                'status': 'error',
+                'message': f'Size mismatch: expected {total}, got {size}',
+                'offset': size
+            }), 409
+        
+        checksum = None
+        expected = (data.get('sha256') or '').lower()
+        if expected:
+            checksum = remote_files.sha256(session.client, sftp, part_path, session.touch)
+        if expected and expected != checksum:
+            # Fortsetzen hilft hier nicht, der Upload beginnt neu
+            sftp.remove(part_path)
+            return jsonify({
+                'status': 'error',
+                'message': 'Checksum mismatch, upload discarded',
+                'sha256': checksum
+            }), 409
+        
+        sftp.posix_rename(part_path, remote_path)
+        session.listings.invalidate(os.path.dirname(remote_path))
+        return jsonify({
+            'status': 'success',
+            'message': f'File {data["name"]} uploaded successfully',
+            'size': size,
+            'sha256': checksum
+        })
+        
+    except Exception as e:
+        logger.error(f"Error completing upload: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
 @app.route('/api/delete', methods=['POST'])
 def delete_file():
     try:
@@ -2375,47 +2609,57 @@ def delete_file():
             }), 400
             
         session = ssh_connections[session_id]
-        sftp = session.client.open_sftp()
+        is_dir = stat.S_ISDIR(session.sftp().lstat(filepath).st_mode)
         
-        try:
-            # Prüfe ob es ein Verzeichnis ist
-            try:
-                sftp.stat(filepath)
-                is_dir = stat.S_ISDIR(sftp.stat(filepath).st_mode)
-            except:
-                is_dir = False
-            
-            if is_dir:
-                # Lösche Verzeichnis rekursiv
-                def rm_recursive(path):
-                    try:
-                        files = sftp.listdir_attr(path)
-                        for f in files:
-                            filepath = os.path.join(path, f.filename)
-                            if stat.S_ISDIR(f.st_mode):
-                                rm_recursive(filepath)
-                            else:
-                                sftp.remove(filepath)
-                        sftp.rmdir(path)
-                    except:
-                        pass
-                
-                rm_recursive(filepath)
-            else:
-                # Lösche einzelne Datei
-                sftp.remove(filepath)
+        # Verzeichnisse werden mit einem Befehl auf dem Host gelöscht
+        file_ops.validate('delete', [filepath])
+        file_ops.apply(session, 'delete', filepath)
+        return jsonify({
+            'status': 'success',
+            'message': f'{"Directory" if is_dir else "File"} deleted successfully'
+        })
             
-            sftp.close()
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/files/bulk', methods=['POST'])
+def bulk_file_operation():
+    """delete/copy/move/chmod auf mehreren Pfaden als Job mit Fortschritt pro Pfad"""
+    try:
+        data = request.json or {}
+        session_id = data.get('connection')
+        operation = data.get('operation')
+        
+        if session_id not in ssh_connections:
             return jsonify({
-                'status': 'success',
-                'message': f'{"Directory" if is_dir else "File"} deleted successfully'
-            })
-            
-        except Exception as e:
-            sftp.close()
-            raise e
-            
+                'status': 'error',
+                'message': 'Not connected'
+            }), 400
+        
+        try:
+            paths, destination = file_ops.validate(operation, data.get('paths'), data.get('destination'), data.get('mode'))
+        except file_ops.FileOperationError as e:
+            return jsonify({
+                'status': 'error',
+                'message': str(e)
+            }), 400
+        
+        # Operationen derselben Sitzung laufen nacheinander
+        job = job_manager.submit(f'files-{operation}', f'ssh-{session_id[:8]}', file_ops.run_bulk,
+                                 ssh_connections[session_id], operation, paths, destination,
+                                 data.get('mode'), bool(data.get('recursive')))
+        
+        return jsonify({
+            'status': 'accepted',
+            'job_id': job.id,
+            'message': f'{operation.capitalize()} of {len(paths)} items started'
+        }), 202
+        
     except Exception as e:
+        logger.error(f"Error starting bulk file operation: {str(e)}")
         return jsonify({
             'status': 'error',
             'message': str(e)
@@ -2436,65 +2680,56 @@ def delete_schedule():
                 'message': 'Missing schedule ID or host credentials'
             }), 400
             
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh.connect(
-            host_ip,
-            username=host_user,
-            password=host_password
-        )
-        
-        # Hole aktuelle Crontab
-        stdin, stdout, stderr = ssh.exec_command('crontab -l')
-        current_crontab = stdout.read().decode()
-        logger.info(f"Current crontab before deletion:\n{current_crontab}")
-        
-        # Extrahiere die Zeit aus der Schedule-ID (Format: HHMM_shutwake)
-        time_str = schedule_id.split('_')[0]
-        hour = time_str[:2]
-        minute = str(int(time_str[2:]))  # Konvertiere zu int und zurück zu str um führende Nullen zu entfernen
-        
-        logger.info(f"Trying to delete schedule with hour={hour}, minute={minute}")
-        
-        # Filtere den zu löschenden Job
-        new_crontab_lines = []
-        for line in current_crontab.splitlines():
-            # Prüfe ob die Zeile ein shutwake.sh Eintrag mit der gesuchten Zeit ist
-            if 'shutwake.sh' in line:
-                parts = line.split()
-                logger.info(f"Found shutwake.sh line: {line}")
-                logger.info(f"Parts: {parts}")
-                if len(parts) >= 2:
-                    cron_minute = str(int(parts[0]))  # Entferne führende Nullen
-                    cron_hour = str(int(parts[1]))    # Entferne führende Nullen
-                    logger.info(f"Comparing cron_minute={cron_minute}, cron_hour={cron_hour} with minute={minute}, hour={hour}")
-                    if cron_minute == minute and cron_hour == hour:
-                        logger.info("Match found, skipping line")
-                        continue
-            new_crontab_lines.append(line)
-        
-        # Stelle sicher, dass die Crontab mit einer Leerzeile endet
-        new_crontab = '\n'.join(new_crontab_lines) + '\n'
-        logger.info(f"New crontab content:\n{new_crontab}")
-        
-        # Schreibe neue Crontab direkt
-        stdin, stdout, stderr = ssh.exec_command('crontab -')
-        stdin.write(new_crontab)
-        stdin.channel.shutdown_write()
-        
-        # Warte auf Beendigung des Befehls
-        exit_status = stdout.channel.recv_exit_status()
-        if exit_status != 0:
-            error_msg = stderr.read().decode()
-            logger.error(f"Error updating crontab: {error_msg}")
-            raise Exception(f"Failed to update crontab: {error_msg}")
-        
-        # Überprüfe die Crontab nach dem Update
-        stdin, stdout, stderr = ssh.exec_command('crontab -l')
-        updated_crontab = stdout.read().decode()
-        logger.info(f"Updated crontab after deletion:\n{updated_crontab}")
-        
-        ssh.close()
+        with ssh_pool.client(host_ip, host_user, host_password) as ssh:
+            # Hole aktuelle Crontab
+            stdin, stdout, stderr = ssh.exec_command('crontab -l')
+            current_crontab = stdout.read().decode()
+            logger.info(f"Current crontab before deletion:\n{current_crontab}")
+        
+            # Extrahiere die Zeit aus der Schedule-ID (Format: HHMM_shutwake)
+            time_str = schedule_id.split('_')[0]
+            hour = time_str[:2]
+            minute = str(int(time_str[2:]))  # Konvertiere zu int und zurück zu str um führende Nullen zu entfernen
+        
+            logger.info(f"Trying to delete schedule with hour={hour}, minute={minute}")
+        
+            # Filtere den zu löschenden Job
+            new_crontab_lines = []
+            for line in current_crontab.splitlines():
+                # Prüfe ob die Zeile ein shutwake.sh Eintrag mit der gesuchten Zeit ist
+                if 'shutwake.sh' in line:
+                    parts = line.split()
+                    logger.info(f"Found shutwake.sh line: {line}")
+                    logger.info(f"Parts: {parts}")
+                    if len(parts) >= 2:
+                        cron_minute = str(int(parts[0]))  # Entferne führende Nullen
+                        cron_hour = str(int(parts[1]))    # Entferne führende Nullen
+                        logger.info(f"Comparing cron_minute={cron_minute}, cron_hour={cron_hour} with minute={minute}, hour={hour}")
+                        if cron_minute == minute and cron_hour == hour:
+                            logger.info("Match found, skipping line")
+                            continue
+                new_crontab_lines.append(line)
+        
+            # Stelle sicher, dass die Crontab mit einer Leerzeile endet
+            new_crontab = '\n'.join(new_crontab_lines) + '\n'
+            logger.info(f"New crontab content:\n{new_crontab}")
+        
+            # Schreibe neue Crontab direkt
+            stdin, stdout, stderr = ssh.exec_command('crontab -')
+            stdin.write(new_crontab)
+            stdin.channel.shutdown_write()
+        
+            # Warte auf Beendigung des Befehls
+            exit_status = stdout.channel.recv_exit_status()
+            if exit_status != 0:
+                error_msg = stderr.read().decode()
+                logger.error(f"Error updating crontab: {error_msg}")
+                raise Exception(f"Failed to update crontab: {error_msg}")
+        
+            # Überprüfe die Crontab nach dem Update
+            stdin, stdout, stderr = ssh.exec_command('crontab -l')
+            updated_crontab = stdout.read().decode()
+            logger.info(f"Updated crontab after deletion:\n{updated_crontab}")
         
         return jsonify({
             'status': 'success',
@@ -2522,53 +2757,44 @@ def get_crontabs():
         if not host_config:
             return jsonify({'error': 'No host configuration found'}), 404
         
-        # Erstelle SSH-Verbindung
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh.connect(
-            host_config['ip'],
-            username=host_config['username'],
-            password=host_config['password']
-        )
-        
-        # Hole aktuelle Crontab
-        stdin, stdout, stderr = ssh.exec_command('crontab -l')
-        crontab_content = stdout.read().decode()
-        
-        # Parse die Crontab-Einträge
-        active_jobs = []
-        for line in crontab_content.splitlines():
-            if 'shutwake.sh' in line:
-                # Extrahiere Zeit aus Crontab-Eintrag (Format: Minute Stunde * * *)
-                parts = line.split()
-                if len(parts) >= 2:
-                    minute, hour = parts[0], parts[1]
-                    time_str = f"{hour.zfill(2)}:{minute.zfill(2)}"
+        # SSH-Verbindung aus dem Pool
+        with ssh_pool.client(host_config['ip'], host_config['username'], host_config['password']) as ssh:
+            # Hole aktuelle Crontab
+            stdin, stdout, stderr = ssh.exec_command('crontab -l')
+            crontab_content = stdout.read().decode()
+        
+            # Parse die Crontab-Einträge
+            active_jobs = []
+            for line in crontab_content.splitlines():
+                if 'shutwake.sh' in line:
+                    # Extrahiere Zeit aus Crontab-Eintrag (Format: Minute Stunde * * *)
+                    parts = line.split()
+                    if len(parts) >= 2:
+                        minute, hour = parts[0], parts[1]
+                        time_str = f"{hour.zfill(2)}:{minute.zfill(2)}"
                     
-                    # Lese die entsprechende shutwake.sh Datei
-                    stdin, stdout, stderr = ssh.exec_command(f'cat /usr/local/bin/shutwake.sh')
-                    script_content = stdout.read().decode()
+                        # Lese die entsprechende shutwake.sh Datei
+                        stdin, stdout, stderr = ssh.exec_command(f'cat /usr/local/bin/shutwake.sh')
+                        script_content = stdout.read().decode()
                     
-                    # Extrahiere Wake-up Zeit aus dem Skript
-                    sleep_duration = None
-                    for script_line in script_content.splitlines():
-                        if 'rtcwake -m no -s' in script_line:
-                            sleep_duration = int(script_line.split('-s')[1].strip().split()[0])
-                            break
+                        # Extrahiere Wake-up Zeit aus dem Skript
+                        sleep_duration = None
+                        for script_line in script_content.splitlines():
+                            if 'rtcwake -m no -s' in script_line:
+                                sleep_duration = int(script_line.split('-s')[1].strip().split()[0])
+                                break
                     
-                    if sleep_duration:
-                        # Berechne Wake-up Zeit
-                        shutdown_time = datetime.strptime(time_str, '%H:%M')
-                        wakeup_time = (shutdown_time + timedelta(seconds=sleep_duration))
+                        if sleep_duration:
+                            # Berechne Wake-up Zeit
+                            shutdown_time = datetime.strptime(time_str, '%H:%M')
+                            wakeup_time = (shutdown_time + timedelta(seconds=sleep_duration))
                         
-                        active_jobs.append({
-                            'id': f"{time_str.replace(':', '')}_shutwake",
-                            'shutdown_time': time_str,
-                            'wakeup_time': wakeup_time.strftime('%H:%M'),
-                            'duration': sleep_duration // 3600  # Konvertiere zu Stunden
-                        })
-        
-        ssh.close()
+                            active_jobs.append({
+                                'id': f"{time_str.replace(':', '')}_shutwake",
+                                'shutdown_time': time_str,
+                                'wakeup_time': wakeup_time.strftime('%H:%M'),
+                                'duration': sleep_duration // 3600  # Konvertiere zu Stunden
+                            })
         return jsonify({'jobs': active_jobs})
         
     except Exception as e:
@@ -2591,16 +2817,10 @@ def save_host_config_endpoint():
                 'message': 'Missing required credentials'
             }), 400
         
-        # Teste die Verbindung
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        # Teste die Verbindung; sie bleibt für die folgenden Host-Abfragen im Pool
         try:
-            ssh.connect(
-                config['ip'],
-                username=config['username'],
-                password=config['password']
-            )
-            ssh.close()
+            with ssh_pool.client(config['ip'], config['username'], config['password']):
+                pass
         except Exception as e:
             return jsonify({
                 'status': 'error',
@@ -2641,9 +2861,7 @@ def get_host_config():
 def refresh_categories():
     """Aktualisiert den Kategorien-Cache"""
     try:
-        global categories_cache, last_categories_update
-        categories_cache = None
-        last_categories_update = 0
+        category_store.reload()
         return jsonify({'status': 'success'})
     except Exception as e:
         logger.error(f"Error refreshing categories: {str(e)}")
@@ -2788,33 +3006,23 @@ def import_compose():
         if result.returncode != 0:
             raise ValueError(f"Failed to start container: {result.stderr}")
         
-        # Lade und aktualisiere Kategorien
-        categories = load_categories()
-        
-        # Debug logging
+        # Lade, aktualisiere und speichere Kategorien
         logger.info(f"Importing container: {service_name}")
-        logger.info(f"Categories before update: {categories}")
-        
-        # Stelle sicher, dass die Imported-Kategorie existiert
-        if 'imported' not in categories['categories']:
-            logger.info("Creating imported category")
-            categories['categories']['imported'] = {
-                'name': 'Imported',
-                'icon': 'fa-download',
-                'description': 'Manually imported containers',
-                'containers': []
-            }
-        
-        # Füge Container zur Imported-Kategorie hinzu
-        if service_name not in categories['categories']['imported']['containers']:
-            logger.info(f"Adding {service_name} to imported category")
-            categories['categories']['imported']['containers'].append(service_name)
-        
-        # Debug logging
-        logger.info(f"Categories after update: {categories}")
-        
-        # Speichere die aktualisierten Kategorien
-        save_categories(categories)
+        with category_store.edit() as categories:
+            # Stelle sicher, dass die Imported-Kategorie existiert
+            if 'imported' not in categories['categories']:
+                logger.info("Creating imported category")
+                categories['categories']['imported'] = {
+                    'name': 'Imported',
+                    'icon': 'fa-download',
+                    'description': 'Manually imported containers',
+                    'containers': []
+                }
+            
+            # Füge Container zur Imported-Kategorie hinzu
+            if service_name not in categories['categories']['imported']['containers']:
+                logger.info(f"Adding {service_name} to imported category")
+                categories['categories']['imported']['containers'].append(service_name)
         
         # Erstelle compose.info Datei
         info = {
@@ -2842,10 +3050,7 @@ def import_compose():
 def save_categories(categories):
     """Speichert die Kategorien in die categories.yaml Datei"""
     try:
-        with open(CATEGORIES_FILE, 'w') as f:
-            yaml.dump(categories, f, default_flow_style=False, sort_keys=False)
-        # Setze Berechtigungen
-        os.chmod(CATEGORIES_FILE, 0o644)
+        category_store.replace(categories)
     except Exception as e:
         logger.error(f"Error saving categories: {str(e)}")
         raise
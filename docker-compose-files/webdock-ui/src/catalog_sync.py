@@ -0,0 +1,248 @@
+"""Synchronisation der Compose-Templates mit GitHub.
+
+Die Verzeichnisliste und alle Templates werden über eine gepoolte Session
+parallel geladen. ETags werden gespeichert und per If-None-Match mitgeschickt,
+unveränderte Templates kosten so nur eine 304-Antwort. Neue Dateien werden in
+einem Staging-Verzeichnis gesammelt, geprüft und erst am Ende gemeinsam per
+os.replace übernommen. Ohne Netzwerk bleibt der letzte gute Stand erhalten.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+import yaml
+
+from compose_catalog import COMPOSE_FILENAME, ComposeCatalog
+
+logger = logging.getLogger(__name__)
+
+CATALOG_SYNC_WORKERS = int(os.getenv('CATALOG_SYNC_WORKERS', '8'))
+CATALOG_SYNC_TIMEOUT = float(os.getenv('CATALOG_SYNC_TIMEOUT', '15'))
+
+STATE_FILENAME = '.catalog-sync.json'
+STAGING_PREFIX = '.sync-'
+
+
+class CatalogSyncError(Exception):
+    """Die Template-Liste konnte nicht geladen werden"""
+
+
+class CatalogSync:
+    """Lädt die Compose-Templates von `api_url`/`raw_url` nach `target_dir`"""
+
+    def __init__(self, target_dir: str, api_url: str, raw_url: str,
+                 catalog: Optional[ComposeCatalog] = None, max_workers: int = CATALOG_SYNC_WORKERS,
+                 timeout: float = CATALOG_SYNC_TIMEOUT):
+        self.target_dir = target_dir
+        self.api_url = api_url
+        self.raw_url = raw_url.rstrip('/')
+        self.catalog = catalog
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.last_result: Optional[Dict[str, Any]] = None
+        self._session: Optional[requests.Session] = None
+        self._lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=self.max_workers)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers['User-Agent'] = 'webdock-ui'
+            self._session = session
+        return self._session
+
+    def start(self) -> threading.Thread:
+        """Startet einen Sync im Hintergrund, falls keiner läuft"""
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self.sync, name='catalog-sync', daemon=True)
+                self._thread.start()
+            return self._thread
+
+    # Zustand
+
+    @property
+    def _state_path(self) -> str:
+        return os.path.join(self.target_dir, STATE_FILENAME)
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self._state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        state.setdefault('listing', {})
+        state.setdefault('files', {})
+        return state
+
+    def _save_state(self, state: Dict[str, Any]):
+        fd, temp_path = tempfile.mkstemp(prefix=STAGING_PREFIX, dir=self.target_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_path, self._state_path)
+
+    def _target_path(self, directory: str) -> str:
+        return os.path.join(self.target_dir, directory, COMPOSE_FILENAME)
+
+    # Abruf
+
+    def _fetch_listing(self, state: Dict[str, Any]) -> List[str]:
+        listing = state['listing']
+        headers = {}
+        if listing.get('etag') and listing.get('directories') is not None:
+            headers['If-None-Match'] = listing['etag']
+        response = self.session.get(self.api_url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return listing['directories']
+        if response.status_code != 200:
+            raise CatalogSyncError(f"Failed to get directory listing: {response.status_code}")
+        directories = sorted(item['name'] for item in response.json() if item['type'] == 'dir')
+        state['listing'] = {'etag': response.headers.get('ETag'), 'directories': directories}
+        return directories
+
+    def _fetch_template(self, directory: str, known: Dict[str, Any],
+                        staging: str) -> Tuple[str, Dict[str, Any]]:
+        """Gibt ('unchanged' | 'updated' | 'missing' | 'failed', Zustand) zurück"""
+        headers = {}
+        # Nur bedingt anfragen wenn die lokale Datei noch dem gespeicherten Stand entspricht
+        if known.get('etag') and self._local_sha256(directory) == known.get('sha256'):
+            headers['If-None-Match'] = known['etag']
+        try:
+            response = self.session.get(f"{self.raw_url}/{directory}/{COMPOSE_FILENAME}",
+                                        headers=headers, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error downloading {directory}: {str(e)}")
+            return 'failed', known
+        if response.status_code == 304:
+            return 'unchanged', known
+        if response.status_code == 404:
+            return 'missing', known
+        if response.status_code != 200:
+            logger.error(f"Error downloading {directory}: HTTP {response.status_code}")
+            return 'failed', known
+
+        content = response.content
+        try:
+            data = yaml.safe_load(content)
+            if not data or 'services' not in data:
+                raise ValueError('no services defined')
+        except Exception as e:
+            logger.error(f"Invalid compose file for {directory}: {e}")
+            return 'failed', known
+
+        sha256 = hashlib.sha256(content).hexdigest()
+        entry = {'etag': response.headers.get('ETag'), 'sha256': sha256}
+        if sha256 == self._local_sha256(directory):
+            return 'unchanged', entry
+        os.makedirs(os.path.join(staging, directory), exist_ok=True)
+        with open(os.path.join(staging, directory, COMPOSE_FILENAME), 'wb') as f:
+            f.write(content)
+        return 'updated', entry
+
+    def _local_sha256(self, directory: str) -> Optional[str]:
+        try:
+            with open(self._target_path(directory), 'rb') as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+
+    # Sync
+
+    def _cleanup_staging(self):
+        # Reste eines abgebrochenen Syncs entfernen
+        for entry in os.listdir(self.target_dir):
+            if entry.startswith(STAGING_PREFIX):
+                path = os.path.join(self.target_dir, entry)
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    os.remove(path)
+
+    def sync(self) -> Dict[str, Any]:
+        """Gleicht die Templates ab; bei Netzwerkfehlern bleibt der letzte Stand erhalten"""
+        with self._lock:
+            started = time.monotonic()
+            os.makedirs(self.target_dir, exist_ok=True)
+            self._cleanup_staging()
+            state = self._load_state()
+            result: Dict[str, Any] = {
+                'status': 'success',
+                'updated': [],
+                'unchanged': 0,
+                'removed': [],
+                'failed': []
+            }
+
+            try:
+                directories = self._fetch_listing(state)
+            except (requests.exceptions.RequestException, CatalogSyncError, ValueError) as e:
+                logger.warning(f"Catalog sync unavailable, keeping last snapshot: {e}")
+                result['status'] = 'offline'
+                result['error'] = str(e)
+                return self._finish(result, started)
+            logger.info(f"Found {len(directories)} directories: {directories}")
+
+            staging = tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=self.target_dir)
+            try:
+                known = state['files']
+                with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='catalog-sync') as pool:
+                    fetched = list(pool.map(
+                        lambda d: self._fetch_template(d, known.get(d, {}), staging), directories
+                    ))
+
+                files = {}
+                for directory, (status, entry) in zip(directories, fetched):
+                    if status == 'updated':
+                        result['updated'].append(directory)
+                    elif status == 'unchanged':
+                        result['unchanged'] += 1
+                    elif status == 'failed':
+                        result['failed'].append(directory)
+                    if status != 'missing' and entry:
+                        files[directory] = entry
+
+                # Nur Templates entfernen, die dieser Sync selbst angelegt hat
+                removed = [d for d in known if d not in files]
+
+                # Alle Änderungen gemeinsam übernehmen
+                with self.catalog.batch() if self.catalog else nullcontext():
+                    for directory in result['updated']:
+                        os.makedirs(os.path.dirname(self._target_path(directory)), exist_ok=True)
+                        os.replace(os.path.join(staging, directory, COMPOSE_FILENAME),
+                                   self._target_path(directory))
+                    for directory in removed:
+                        try:
+                            os.remove(self._target_path(directory))
+                            os.rmdir(os.path.dirname(self._target_path(directory)))
+                        except OSError:
+                            pass
+                        result['removed'].append(directory)
+                    state['files'] = files
+                    self._save_state(state)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+
+            if result['failed']:
+                result['status'] = 'partial'
+            logger.info(f"Catalog sync: {len(result['updated'])} updated, {result['unchanged']} unchanged, "
+                        f"{len(result['removed'])} removed, {len(result['failed'])} failed")
+            return self._finish(result, started)
+
+    def _finish(self, result: Dict[str, Any], started: float) -> Dict[str, Any]:
+        result['duration'] = round(time.monotonic() - started, 2)
+        self.last_result = result
+        return result
@@ -0,0 +1,182 @@
+"""Kategorien mit In-Memory-Index und atomarer Persistenz.
+
+Die categories.yaml wird einmal geladen und im Speicher gehalten, inklusive
+eines Index Container -> Kategorie. Änderungen werden sofort per Temp-Datei und
+Rename geschrieben und erhöhen die Versionsnummer. Wird die Datei von außen
+geändert, wird sie beim nächsten Zugriff neu eingelesen.
+"""
+import copy
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATEGORIES = {
+    'categories': {
+        'smarthome': {
+            'name': 'Smart Home',
+            'icon': 'fa-home',
+            'description': 'Home automation systems',
+            'containers': ['openhab', 'homeassistant', 'raspberrymatic']
+        },
+        'bridge': {
+            'name': 'Bridge',
+            'icon': 'fa-exchange',
+            'description': 'IoT bridges and communication',
+            'containers': ['homebridge', 'mosquitto-broker', 'zigbee2mqtt']
+        },
+        'dashboard': {
+            'name': 'Dashboard',
+            'icon': 'fa-th-large',
+            'description': 'Visualization and monitoring dashboards',
+            'containers': ['heimdall', 'grafana']
+        },
+        'service': {
+            'name': 'Service',
+            'icon': 'fa-cogs',
+            'description': 'System services and tools',
+            'containers': ['filebrowser', 'codeserver', 'frontail',
+                           'nodeexporter', 'portainer', 'dockge', 'prometheus']
+        },
+        'other': {
+            'name': 'Other',
+            'icon': 'fa-ellipsis-h',
+            'description': 'Additional containers and tools',
+            'containers': ['whatsupdocker', 'watchyourlan', 'webdock-ui', 'filestash']
+        }
+    }
+}
+
+
+def _file_version(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CategoryStore:
+    """Einzige Quelle für Kategorien; alle Lese- und Schreibzugriffe laufen hierüber"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.version = 0
+        self._data: Optional[Dict[str, Any]] = None
+        # Container -> Kategorie-ID (erste Kategorie gewinnt, wie beim linearen Suchen)
+        self._index: Dict[str, str] = {}
+        # Anzeigename -> Icon
+        self._icons: Dict[str, str] = {}
+        self._file_version: Optional[Tuple[int, int]] = None
+        self._lock = threading.RLock()
+
+    # Laden und Speichern
+
+    def _ensure_loaded(self) -> Dict[str, Any]:
+        # Ein stat pro Zugriff erkennt Änderungen von außen
+        current = _file_version(self.path)
+        if self._data is not None and current == self._file_version:
+            return self._data
+        with self._lock:
+            current = _file_version(self.path)
+            if self._data is not None and current == self._file_version:
+                return self._data
+            if current is None:
+                # Wenn keine Datei existiert, erstelle Standardkategorien
+                self._write(copy.deepcopy(DEFAULT_CATEGORIES))
+            else:
+                self._read()
+            return self._data
+
+    def _read(self):
+        # Aufrufer hält self._lock
+        try:
+            with open(self.path, 'r') as f:
+                data = yaml.safe_load(f) or {}
+        except Exception:
+            logger.exception("Error loading categories")
+            data = self._data or {}
+        self._set(data, _file_version(self.path))
+
+    def _write(self, data: Dict[str, Any]):
+        # Aufrufer hält self._lock; Temp-Datei + Rename, damit Leser nie eine halbe Datei sehen
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix='.categories-', suffix='.yaml', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, self.path)
+        except Exception:
+            os.unlink(temp_path)
+            raise
+        self._set(data, _file_version(self.path))
+
+    def _set(self, data: Dict[str, Any], file_version: Optional[Tuple[int, int]]):
+        data.setdefault('categories', {})
+        index: Dict[str, str] = {}
+        icons: Dict[str, str] = {}
+        for category_id, category in data['categories'].items():
+            for container in category.get('containers') or []:
+                index.setdefault(container, category_id)
+            if 'name' in category:
+                icons.setdefault(category['name'], category.get('icon', 'fa-cube'))
+        self._data = data
+        self._index = index
+        self._icons = icons
+        self._file_version = file_version
+        self.version += 1
+
+    def reload(self):
+        """Liest die Datei beim nächsten Zugriff neu ein"""
+        with self._lock:
+            self._file_version = None
+
+    # Abfragen
+
+    def get(self) -> Dict[str, Any]:
+        """Kopie aller Kategorien (darf vom Aufrufer verändert werden)"""
+        data = self._ensure_loaded()
+        with self._lock:
+            return copy.deepcopy(data)
+
+    def category_for(self, container: str) -> Optional[Dict[str, Any]]:
+        """Kategorie eines Containers in O(1)"""
+        self._ensure_loaded()
+        with self._lock:
+            category_id = self._index.get(container)
+            if category_id is None:
+                return None
+            return dict(self._data['categories'][category_id], id=category_id)
+
+    def icon_for(self, name: str, default: str = 'fa-cube') -> str:
+        """Icon einer Kategorie anhand ihres Anzeigenamens"""
+        self._ensure_loaded()
+        return self._icons.get(name, default)
+
+    def containers_in(self, category_id: str) -> List[str]:
+        self._ensure_loaded()
+        with self._lock:
+            category = self._data['categories'].get(category_id) or {}
+            return list(category.get('containers') or [])
+
+    # Änderungen
+
+    @contextmanager
+    def edit(self) -> Iterator[Dict[str, Any]]:
+        """Liefert eine Kopie zum Bearbeiten und speichert sie am Ende atomar"""
+        with self._lock:
+            data = copy.deepcopy(self._ensure_loaded())
+            yield data
+            self._write(data)
+
+    def replace(self, data: Dict[str, Any]):
+        with self._lock:
+            self._write(copy.deepcopy(data))
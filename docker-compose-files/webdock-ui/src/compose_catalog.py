@@ -0,0 +1,280 @@
+"""Inkrementeller Index der Compose-Templates.
+
+Jede docker-compose.yml wird nach Pfad mit mtime, Größe und SHA-256 erfasst und
+nur neu geparst wenn sie sich geändert hat. Änderungen werden per inotify erkannt
+(ctypes, ohne zusätzliche Abhängigkeit); ohne inotify prüft ein günstiger
+stat-Scan höchstens alle CATALOG_SCAN_INTERVAL Sekunden.
+"""
+import ctypes
+import ctypes.util
+import errno
+import hashlib
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+CATALOG_SCAN_INTERVAL = float(os.getenv('CATALOG_SCAN_INTERVAL', '2'))
+COMPOSE_FILENAME = 'docker-compose.yml'
+
+# inotify Konstanten aus <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+               IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _walk(root: str) -> Iterator[tuple]:
+    """os.walk ohne versteckte Verzeichnisse (z.B. Staging-Verzeichnisse des Syncs)"""
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories[:] = [d for d in subdirectories if not d.startswith('.')]
+        yield directory, subdirectories, files
+
+
+@dataclass
+class CatalogEntry:
+    """Ein Template im Index"""
+    path: str
+    name: str
+    mtime: float
+    size: int
+    sha256: str
+    data: Optional[Dict[str, Any]]
+
+
+class _Inotify:
+    """Rekursive inotify-Überwachung eines Verzeichnisbaums"""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name:
+            raise OSError(errno.ENOSYS, 'libc not found')
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, 'inotify not available')
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._watches: Dict[int, str] = {}
+
+    def watch_tree(self, root: str):
+        """Setzt alle Watches unterhalb von `root` (neu)"""
+        for wd in list(self._watches):
+            self._libc.inotify_rm_watch(self.fd, wd)
+        self._watches.clear()
+        for directory, _, _ in _walk(root):
+            self._add(directory)
+
+    def _add(self, path: str):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                raise OSError(error, 'inotify watch limit reached')
+            logger.debug(f"Could not watch {path}: {os.strerror(error)}")
+            return
+        self._watches[wd] = path
+
+    def read(self, timeout: Optional[float] = None):
+        """Liefert (Verzeichnis, Maske, Name) für alle anstehenden Events"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buffer):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+            offset += length
+            directory = self._watches.get(wd)
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+            events.append((directory, mask, name))
+            # Neue Unterverzeichnisse sofort mitüberwachen
+            if directory and mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and not name.startswith('.'):
+                for subdirectory, _, _ in _walk(os.path.join(directory, name)):
+                    self._add(subdirectory)
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class ComposeCatalog:
+    """Hält die geparsten Compose-Templates unterhalb von `root` aktuell"""
+
+    def __init__(self, root: str, scan_interval: float = CATALOG_SCAN_INTERVAL):
+        self.root = root
+        self.scan_interval = scan_interval
+        self.version = 0
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        self._dirty = True
+        self._last_scan = 0.0
+        self._watching = False
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Startet die inotify-Überwachung (idempotent); ohne inotify bleibt der stat-Scan"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._watch, name='compose-catalog', daemon=True)
+            self._thread.start()
+
+    def invalidate(self):
+        """Erzwingt einen Scan beim nächsten Zugriff"""
+        self._dirty = True
+
+    @contextmanager
+    def batch(self):
+        """Sperrt Scans während mehrere Dateien ersetzt werden; danach wird neu gescannt"""
+        with self._lock:
+            yield
+        self._dirty = True
+
+    def configs(self) -> Dict[str, Dict[str, Any]]:
+        """Gibt Name -> Compose-Daten aller gültigen Templates zurück"""
+        self.start()
+        if self._dirty or (not self._watching and time.monotonic() - self._last_scan >= self.scan_interval):
+            self.refresh()
+        return self._configs
+
+    def refresh(self) -> bool:
+        """stat-Scan des Verzeichnisbaums; parst nur geänderte Dateien neu"""
+        with self._lock:
+            self._dirty = False
+            self._last_scan = time.monotonic()
+            seen = set()
+            changed = False
+            try:
+                for directory, _, files in _walk(self.root):
+                    if COMPOSE_FILENAME not in files:
+                        continue
+                    path = os.path.join(directory, COMPOSE_FILENAME)
+                    seen.add(path)
+                    changed |= self._update_entry(path)
+            except Exception as e:
+                logger.error(f"Error walking directory {self.root}: {e}")
+            for path in list(self._entries):
+                if path not in seen:
+                    del self._entries[path]
+                    changed = True
+            if changed:
+                self._rebuild()
+            return changed
+
+    def _update_entry(self, path: str) -> bool:
+        # Aufrufer hält self._lock
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        entry = self._entries.get(path)
+        if entry is not None and entry.mtime == stat.st_mtime and entry.size == stat.st_size:
+            return False
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except OSError as e:
+            logger.error(f"Error reading {path}: {e}")
+            return False
+        digest = hashlib.sha256(content).hexdigest()
+        if entry is not None and entry.sha256 == digest:
+            # Nur Metadaten geändert (z.B. touch)
+            entry.mtime, entry.size = stat.st_mtime, stat.st_size
+            return False
+
+        name = os.path.basename(os.path.dirname(path))
+        data = None
+        try:
+            parsed = yaml.safe_load(content)
+            if parsed and 'services' in parsed:
+                data = parsed
+                logger.info(f"Loaded config for {name}")
+        except Exception as e:
+            logger.error(f"Error loading config for {os.path.dirname(path)}: {e}")
+        self._entries[path] = CatalogEntry(path, name, stat.st_mtime, stat.st_size, digest, data)
+        return True
+
+    def _rebuild(self):
+        # Aufrufer hält self._lock; neues Dict statt Änderung, damit Leser nie ein halbes Ergebnis sehen
+        configs = {}
+        for path in sorted(self._entries):
+            entry = self._entries[path]
+            if entry.data is not None:
+                configs[entry.name] = entry.data
+        self._configs = configs
+        self.version += 1
+
+    def entries(self) -> Dict[str, CatalogEntry]:
+        self.configs()
+        with self._lock:
+            return dict(self._entries)
+
+    def _watch(self):
+        try:
+            inotify = _Inotify()
+        except OSError as e:
+            logger.warning(f"inotify unavailable, using stat scan for {self.root}: {e}")
+            return
+        try:
+            while True:
+                if not os.path.isdir(self.root):
+                    self._watching = False
+                    time.sleep(self.scan_interval)
+                    continue
+                inotify.watch_tree(self.root)
+                self._watching = True
+                # Änderungen zwischen Scan und Watch-Aufbau nicht verpassen
+                self._dirty = True
+                self._read_events(inotify)
+        except Exception as e:
+            logger.error(f"Compose catalog watcher stopped, using stat scan: {e}")
+        finally:
+            self._watching = False
+            inotify.close()
+
+    def _read_events(self, inotify: _Inotify):
+        """Verarbeitet Events bis das Wurzelverzeichnis ersetzt wird"""
+        while True:
+            for directory, mask, _ in inotify.read(timeout=None):
+                self._dirty = True
+                if mask & IN_Q_OVERFLOW:
+                    continue
+                if directory == self.root and mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    # Verzeichnis wurde ersetzt (z.B. atomarer Austausch): Watches neu aufsetzen
+                    return
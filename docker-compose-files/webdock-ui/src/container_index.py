@@ -0,0 +1,276 @@
+"""In-Memory-Index aller Container, gespeist vom Docker-Event-Stream.
+
+Ein Hintergrund-Thread abonniert die Container-Events der Docker Engine und hält
+pro Container Zustand, Health, Image, Compose-Projekt und Startzeit aktuell.
+Statusabfragen lesen nur noch aus diesem Index.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
+
+from docker_gateway import ContainerDetails, DockerGateway
+
+logger = logging.getLogger(__name__)
+
+# Events, nach denen der Container neu inspiziert wird
+STATE_ACTIONS = {
+    'create', 'start', 'restart', 'stop', 'die', 'kill', 'oom',
+    'pause', 'unpause', 'update', 'rename'
+}
+
+RECONNECT_DELAY = 2
+MAX_RECONNECT_DELAY = 30
+RESYNC_WORKERS = 8
+# Wie lange Abfragen auf die erste Synchronisierung warten
+READY_TIMEOUT = 10
+# Wie lange die Startphase auf die erste erfolgreiche Synchronisierung wartet
+FIRST_SYNC_TIMEOUT = 30
+
+
+@dataclass(frozen=True)
+class ContainerState:
+    """Zustand eines Containers im Index"""
+    id: str
+    name: str
+    state: str
+    health: Optional[str]
+    image: str
+    project: Optional[str]
+    started_at: Optional[datetime]
+
+    @property
+    def running(self) -> bool:
+        return self.state == 'running'
+
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        return {
+            'id': self.id[:12],
+            'name': self.name,
+            'state': self.state,
+            'health': self.health,
+            'image': self.image,
+            'project': self.project,
+            'started_at': self.started_at.isoformat() if self.started_at else None
+        }
+
+    @classmethod
+    def from_details(cls, details: ContainerDetails) -> 'ContainerState':
+        return cls(
+            id=details.id,
+            name=details.name,
+            state=details.state,
+            health=details.health,
+            image=details.image,
+            project=details.labels.get('com.docker.compose.project'),
+            started_at=details.started_at
+        )
+
+
+class ContainerIndex:
+    """Thread-sicherer Container-Index mit monoton steigender Versionsnummer"""
+
+    def __init__(self, gateway: DockerGateway):
+        self.gateway = gateway
+        self._containers: Dict[str, ContainerState] = {}
+        self._names_by_id: Dict[str, str] = {}
+        self._version = 0
+        self._synced = False
+        self._disconnected = False
+        self._first_sync = threading.Event()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._stream = None
+        self._stopped = threading.Event()
+        self._listeners: List[Callable[[Dict], None]] = []
+
+    # Lebenszyklus
+
+    def add_listener(self, listener: Callable[[Dict], None]):
+        """Wird für jedes Container-Event des Streams aufgerufen"""
+        self._listeners.append(listener)
+
+    def start(self):
+        """Startet den Event-Subscriber (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='container-index', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        stream = self._stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def _run(self):
+        delay = RECONNECT_DELAY
+        while not self._stopped.is_set():
+            try:
+                # Erst den Stream öffnen, dann synchronisieren - so geht kein Event verloren
+                self._stream = self.gateway.events(filters={'type': 'container'})
+                self._resync()
+                delay = RECONNECT_DELAY
+                for event in self._stream:
+                    self._apply_event(event)
+                    self._notify(event)
+                    if self._stopped.is_set():
+                        break
+                logger.warning("Docker event stream closed, reconnecting")
+            except Exception as e:
+                logger.error(f"Container index event stream failed: {e}")
+                self.gateway.reset()
+            finally:
+                with self._lock:
+                    self._synced = False
+                    # Bis zum Reconnect den letzten Stand ausliefern, statt Abfragen
+                    # bis zum Timeout zu blockieren
+                    self._disconnected = True
+                    self._changed.notify_all()
+                self._stream = None
+            self._stopped.wait(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    def _notify(self, event):
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"Container event listener failed: {e}")
+
+    # Synchronisierung
+
+    def _resync(self):
+        """Baut den Index komplett neu aus der Container-Liste auf (nur im Event-Thread)"""
+        summaries = self.gateway.list_containers(all=True)
+        running = [c.id for c in summaries if c.running]
+        with ThreadPoolExecutor(max_workers=RESYNC_WORKERS) as pool:
+            details = {d.id: d for d in pool.map(self.gateway.inspect_container, running) if d}
+
+        containers = {}
+        for summary in summaries:
+            if summary.id in details:
+                state = ContainerState.from_details(details[summary.id])
+            else:
+                state = ContainerState(
+                    id=summary.id,
+                    name=summary.name,
+                    state=summary.state,
+                    health=summary.health,
+                    image=summary.image,
+                    project=summary.project,
+                    started_at=None
+                )
+            containers[state.name] = state
+
+        with self._lock:
+            changed = containers != self._containers
+            self._containers = containers
+            self._names_by_id = {state.id: name for name, state in containers.items()}
+            self._synced = True
+            self._disconnected = False
+            if changed:
+                self._bump()
+            else:
+                self._changed.notify_all()
+        self._first_sync.set()
+        logger.info(f"Container index synced: {len(containers)} containers (version {self._version})")
+
+    def _apply_event(self, event):
+        action = event.get('Action') or event.get('status') or ''
+        actor = event.get('Actor') or {}
+        container_id = actor.get('ID') or event.get('id')
+        if not container_id or action.startswith('exec_'):
+            return
+
+        if action.startswith('health_status'):
+            health = action.split(':', 1)[1].strip() if ':' in action else None
+            with self._lock:
+                name = self._names_by_id.get(container_id)
+                current = self._containers.get(name) if name else None
+                if current and current.health != health:
+                    self._containers[name] = replace(current, health=health)
+                    self._bump()
+            return
+
+        if action == 'destroy':
+            with self._lock:
+                name = self._names_by_id.pop(container_id, None)
+                if name and self._containers.pop(name, None) is not None:
+                    self._bump()
+            return
+
+        if action in STATE_ACTIONS:
+            details = self.gateway.inspect_container(container_id)
+            if details is None:
+                return
+            state = ContainerState.from_details(details)
+            with self._lock:
+                old_name = self._names_by_id.get(container_id)
+                if old_name and old_name != state.name:
+                    self._containers.pop(old_name, None)
+                self._names_by_id[container_id] = state.name
+                if self._containers.get(state.name) != state:
+                    self._containers[state.name] = state
+                    self._bump()
+
+    def _bump(self):
+        # Aufrufer hält self._lock
+        self._version += 1
+        self._changed.notify_all()
+
+    def _ensure_ready(self):
+        """Startet den Subscriber bei Bedarf und wartet auf dessen erste Synchronisierung
+
+        Synchronisiert wird nur im Event-Thread; ein Resync aus einer Anfrage
+        könnte sonst inzwischen angewandte Events mit einem älteren Stand überschreiben.
+        """
+        self.start()
+        with self._changed:
+            self._changed.wait_for(lambda: self._synced or self._disconnected, timeout=READY_TIMEOUT)
+
+    def wait_synced(self, timeout: Optional[float] = FIRST_SYNC_TIMEOUT):
+        """Wartet auf die erste erfolgreiche Synchronisierung; wirft, wenn sie ausbleibt (Startphase)"""
+        self.start()
+        if not self._first_sync.wait(timeout):
+            raise TimeoutError(f"Container index not synced within {timeout}s (Docker unreachable?)")
+
+    # Abfragen
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def wait_for_change(self, version: int, timeout: Optional[float] = None) -> int:
+        """Blockiert bis sich die Version von `version` unterscheidet oder das Timeout abläuft"""
+        with self._changed:
+            self._changed.wait_for(lambda: self._version != version, timeout=timeout)
+            return self._version
+
+    def snapshot(self) -> Dict[str, ContainerState]:
+        self._ensure_ready()
+        with self._lock:
+            return dict(self._containers)
+
+    def get(self, name: str) -> Optional[ContainerState]:
+        self._ensure_ready()
+        with self._lock:
+            return self._containers.get(name)
+
+    def states(self) -> Dict[str, str]:
+        """Entspricht `docker ps -a --format {{.Names}} {{.State}}`"""
+        return {name: container.state for name, container in self.snapshot().items()}
+
+    def running_names(self) -> Set[str]:
+        return {name for name, container in self.snapshot().items() if container.running}
+
+    def all_names(self) -> List[str]:
+        return list(self.snapshot().keys())
@@ -0,0 +1,212 @@
+"""Live-Logs von Containern mit einem gemeinsamen Upstream pro Container.
+
+Alle Betrachter eines Containers teilen sich einen `docker logs -f`-Stream.
+Jeder Betrachter hat eine begrenzte Warteschlange; kommt er nicht hinterher,
+werden Zeilen verworfen und gezählt, statt Speicher anzusammeln. Der Upstream
+wird geschlossen, sobald der letzte Betrachter die Verbindung trennt.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Set
+
+from docker_gateway import DockerGateway, LogLine
+from status_stream import STREAM_HEARTBEAT, STREAM_RETRY_MS, format_sse
+
+logger = logging.getLogger(__name__)
+
+LOG_FOLLOW_QUEUE_SIZE = int(os.getenv('LOG_FOLLOW_QUEUE_SIZE', '1000'))
+LOG_TAIL_MAX = int(os.getenv('LOG_TAIL_MAX', '5000'))
+LOG_FOLLOW_BATCH = 200
+
+# Markiert das Ende des Upstreams in der Warteschlange eines Betrachters
+_END = object()
+
+
+class _Viewer:
+    def __init__(self, size: int):
+        self.queue: queue.Queue = queue.Queue(maxsize=size)
+        # Zeilen bis zu diesem Zeitpunkt kommen aus dem Backlog, danach aus dem Upstream
+        self.cutoff = time.time()
+        self.dropped = 0
+        self.end_reason: Optional[str] = None
+
+    def offer(self, line: LogLine):
+        if line.time is not None and line.time <= self.cutoff:
+            return
+        try:
+            self.queue.put_nowait(line)
+        except queue.Full:
+            # Backpressure: der Upstream wartet nie auf einen langsamen Betrachter
+            self.dropped += 1
+
+    def finish(self, reason: str):
+        self.end_reason = reason
+        while True:
+            try:
+                self.queue.put_nowait(_END)
+                return
+            except queue.Full:
+                # Für die Ende-Markierung Platz schaffen
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+
+class _Upstream:
+    def __init__(self, name: str, since: float):
+        self.name = name
+        self.since = since
+        self.viewers: Set[_Viewer] = set()
+        self.stream = None
+        # Gesetzt, wenn der Upstream absichtlich geschlossen wird (letzter Betrachter weg)
+        self.closing = False
+
+
+class ContainerLogHub:
+    """Verteilt `docker logs -f` an beliebig viele SSE-Betrachter"""
+
+    def __init__(self, gateway: DockerGateway, queue_size: int = LOG_FOLLOW_QUEUE_SIZE,
+                 heartbeat: float = STREAM_HEARTBEAT):
+        self.gateway = gateway
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self._upstreams: Dict[str, _Upstream] = {}
+        self._lock = threading.Lock()
+
+    def status(self) -> Dict[str, int]:
+        """Anzahl der Betrachter pro Container"""
+        with self._lock:
+            return {name: len(upstream.viewers) for name, upstream in self._upstreams.items()}
+
+    def tail(self, name: str, tail: int = 100, since: Optional[float] = None,
+             until: Optional[float] = None) -> Optional[List[LogLine]]:
+        """Einmalige Abfrage wie `docker logs --tail N`; None wenn der Container fehlt"""
+        lines = self.open_tail(name, tail, since, until)
+        return None if lines is None else list(lines)
+
+    def open_tail(self, name: str, tail: int = 100, since: Optional[float] = None,
+                  until: Optional[float] = None) -> Optional[Iterator[LogLine]]:
+        """Wie tail(), aber als Iterator über die Zeilen; None wenn der Container fehlt"""
+        stream = self.gateway.log_stream(name, tail=min(tail, LOG_TAIL_MAX), since=since, until=until,
+                                         follow=False)
+        if stream is None:
+            return None
+        return _drain(stream)
+
+    # Upstream
+
+    def _subscribe(self, name: str) -> _Viewer:
+        viewer = _Viewer(self.queue_size)
+        with self._lock:
+            upstream = self._upstreams.get(name)
+            if upstream is None:
+                upstream = _Upstream(name, viewer.cutoff)
+                self._upstreams[name] = upstream
+                threading.Thread(target=self._run, args=(upstream,), name=f'logs-{name}', daemon=True).start()
+            upstream.viewers.add(viewer)
+        return viewer
+
+    def _unsubscribe(self, name: str, viewer: _Viewer):
+        stream = None
+        with self._lock:
+            upstream = self._upstreams.get(name)
+            if upstream is None:
+                return
+            upstream.viewers.discard(viewer)
+            if not upstream.viewers:
+                del self._upstreams[name]
+                upstream.closing = True
+                stream = upstream.stream
+        if stream is not None:
+            _close(stream)
+
+    def _run(self, upstream: _Upstream):
+        reason = 'stream closed'
+        stream = None
+        try:
+            stream = self.gateway.log_stream(upstream.name, tail=0, since=upstream.since, follow=True)
+            if stream is None:
+                reason = 'container not found'
+                return
+            with self._lock:
+                upstream.stream = stream
+                active = self._upstreams.get(upstream.name) is upstream
+            if not active:
+                return
+            for line in stream:
+                with self._lock:
+                    viewers = list(upstream.viewers)
+                if not viewers:
+                    break
+                for viewer in viewers:
+                    viewer.offer(line)
+        except Exception as e:
+            if not upstream.closing:
+                reason = str(e)
+                logger.error(f"Log stream of {upstream.name} failed: {e}")
+        finally:
+            with self._lock:
+                if self._upstreams.get(upstream.name) is upstream:
+                    del self._upstreams[upstream.name]
+                viewers = list(upstream.viewers)
+            for viewer in viewers:
+                viewer.finish(reason)
+            if stream is not None:
+                _close(stream)
+
+    # Betrachter
+
+    def stream(self, name: str, tail: int = 100, since: Optional[float] = None) -> Iterator[str]:
+        """Generator für eine SSE-Response: erst der Backlog, dann neue Zeilen"""
+        yield f'retry: {STREAM_RETRY_MS}\n\n'
+        viewer = self._subscribe(name)
+        try:
+            backlog = self.tail(name, tail=tail, since=since, until=viewer.cutoff) or []
+            for start in range(0, len(backlog), LOG_FOLLOW_BATCH):
+                batch = backlog[start:start + LOG_FOLLOW_BATCH]
+                yield format_sse('lines', {'lines': [line.to_dict() for line in batch]})
+
+            while True:
+                try:
+                    item = viewer.queue.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    yield ': heartbeat\n\n'
+                    continue
+                batch = []
+                while item is not _END:
+                    batch.append(item)
+                    if len(batch) >= LOG_FOLLOW_BATCH:
+                        break
+                    try:
+                        item = viewer.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if viewer.dropped:
+                    dropped, viewer.dropped = viewer.dropped, 0
+                    yield format_sse('dropped', {'count': dropped})
+                if batch:
+                    yield format_sse('lines', {'lines': [line.to_dict() for line in batch]})
+                if item is _END:
+                    yield format_sse('end', {'reason': viewer.end_reason})
+                    return
+        finally:
+            self._unsubscribe(name, viewer)
+
+
+def _drain(stream) -> Iterator[LogLine]:
+    try:
+        yield from stream
+    finally:
+        _close(stream)
+
+
+def _close(stream):
+    try:
+        stream.close()
+    except Exception:
+        pass
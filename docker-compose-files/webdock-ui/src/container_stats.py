@@ -0,0 +1,230 @@
+"""Ressourcen-Statistiken pro Container.
+
+Eine gemeinsame Schleife holt für alle laufenden Container CPU, Speicher,
+Netzwerk- und Block-I/O (one-shot Stats über die Engine API, parallel begrenzt)
+und legt sie in kompakten, array-basierten Ringpuffern pro Container ab.
+"""
+import logging
+import os
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from container_index import ContainerIndex
+from docker_gateway import DockerGateway
+
+logger = logging.getLogger(__name__)
+
+CONTAINER_STATS_INTERVAL = float(os.getenv('CONTAINER_STATS_INTERVAL', '5'))
+CONTAINER_STATS_HISTORY = int(os.getenv('CONTAINER_STATS_HISTORY', '720'))  # 1 Stunde bei 5s
+CONTAINER_STATS_WORKERS = int(os.getenv('CONTAINER_STATS_WORKERS', '8'))
+
+# Spalten einer Messung; 'timestamp' als double, alle anderen als float32
+METRICS = ('cpu', 'memory', 'memory_percent', 'net_rx', 'net_tx', 'block_read', 'block_write')
+
+
+class StatsSeries:
+    """Ringpuffer fester Größe mit einem array pro Metrik"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array('d', [0.0] * capacity)
+        self.columns = {metric: array('f', [0.0] * capacity) for metric in METRICS}
+        self.head = 0
+        self.count = 0
+
+    def append(self, timestamp: float, values: Dict[str, float]):
+        self.timestamps[self.head] = timestamp
+        for metric in METRICS:
+            self.columns[metric][self.head] = values[metric]
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def latest(self) -> Optional[Dict[str, float]]:
+        if not self.count:
+            return None
+        index = (self.head - 1) % self.capacity
+        return self._row(index)
+
+    def _row(self, index: int) -> Dict[str, float]:
+        row = {'timestamp': round(self.timestamps[index], 1)}
+        for metric in METRICS:
+            row[metric] = round(self.columns[metric][index], 2)
+        return row
+
+    def history(self, since: float = 0.0) -> Dict[str, List[float]]:
+        """Gibt die Werte ab `since` in zeitlicher Reihenfolge spaltenweise zurück"""
+        start = (self.head - self.count) % self.capacity
+        indexes = [(start + i) % self.capacity for i in range(self.count)]
+        indexes = [i for i in indexes if self.timestamps[i] >= since]
+        result = {'timestamps': [round(self.timestamps[i], 1) for i in indexes]}
+        for metric in METRICS:
+            column = self.columns[metric]
+            result[metric] = [round(column[i], 2) for i in indexes]
+        return result
+
+
+def _sum_network(stats: Dict[str, Any]):
+    rx = tx = 0
+    for network in (stats.get('networks') or {}).values():
+        rx += network.get('rx_bytes', 0)
+        tx += network.get('tx_bytes', 0)
+    return rx, tx
+
+
+def _sum_block_io(stats: Dict[str, Any]):
+    read = write = 0
+    for entry in (stats.get('blkio_stats') or {}).get('io_service_bytes_recursive') or []:
+        op = (entry.get('op') or '').lower()
+        if op == 'read':
+            read += entry.get('value', 0)
+        elif op == 'write':
+            write += entry.get('value', 0)
+    return read, write
+
+
+class ContainerStatsCollector:
+    """Sammelt in einer gemeinsamen Schleife Statistiken für alle laufenden Container"""
+
+    def __init__(self, gateway: DockerGateway, index: ContainerIndex,
+                 interval: float = CONTAINER_STATS_INTERVAL, capacity: int = CONTAINER_STATS_HISTORY,
+                 max_workers: int = CONTAINER_STATS_WORKERS):
+        self.gateway = gateway
+        self.index = index
+        self.interval = interval
+        self.capacity = capacity
+        self.max_workers = max_workers
+        self._series: Dict[str, StatsSeries] = {}
+        # Letzte Rohzähler pro Container für CPU-Delta und Raten
+        self._counters: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Startet die Sammelschleife (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='container-stats', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='container-stats') as pool:
+            while not self._stopped.is_set():
+                started = time.monotonic()
+                try:
+                    self._collect(pool)
+                except Exception as e:
+                    logger.error(f"Container stats collection failed: {e}")
+                self._stopped.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def _collect(self, pool: ThreadPoolExecutor):
+        containers = self.index.snapshot()
+        running = [name for name, container in containers.items() if container.running]
+        results = pool.map(self._fetch, running)
+        now = time.time()
+        with self._lock:
+            for name, stats in zip(running, results):
+                if stats is not None:
+                    self._record(name, now, stats)
+            # Entfernte Container vergessen, gestoppte behalten ihre Historie
+            for name in list(self._series):
+                if name not in containers:
+                    self._series.pop(name, None)
+                    self._counters.pop(name, None)
+            for name in list(self._counters):
+                if name not in running:
+                    self._counters.pop(name, None)
+
+    def _fetch(self, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.gateway.container_stats(name)
+        except Exception as e:
+            logger.debug(f"Could not read stats for {name}: {e}")
+            return None
+
+    def _record(self, name: str, timestamp: float, stats: Dict[str, Any]):
+        # Aufrufer hält self._lock
+        cpu_stats = stats.get('cpu_stats') or {}
+        memory_stats = stats.get('memory_stats') or {}
+        rx, tx = _sum_network(stats)
+        read, write = _sum_block_io(stats)
+        current = {
+            'time': timestamp,
+            'cpu_total': (cpu_stats.get('cpu_usage') or {}).get('total_usage', 0),
+            'system': cpu_stats.get('system_cpu_usage', 0),
+            'net_rx': rx, 'net_tx': tx,
+            'block_read': read, 'block_write': write
+        }
+        previous = self._counters.get(name)
+        self._counters[name] = current
+        if previous is None:
+            # Für Deltas wird eine zweite Messung benötigt
+            return
+
+        elapsed = max(timestamp - previous['time'], 1e-6)
+        cpu_delta = current['cpu_total'] - previous['cpu_total']
+        system_delta = current['system'] - previous['system']
+        online_cpus = cpu_stats.get('online_cpus') or len((cpu_stats.get('cpu_usage') or {}).get('percpu_usage') or []) or 1
+        cpu_percent = cpu_delta / system_delta * online_cpus * 100 if system_delta > 0 and cpu_delta > 0 else 0.0
+
+        memory_extra = memory_stats.get('stats') or {}
+        memory = memory_stats.get('usage', 0) - memory_extra.get('inactive_file', memory_extra.get('cache', 0))
+        memory_limit = memory_stats.get('limit') or 0
+
+        def rate(key):
+            # Zähler springen bei einem Neustart zurück
+            return max(current[key] - previous[key], 0) / elapsed
+
+        series = self._series.get(name)
+        if series is None:
+            series = self._series[name] = StatsSeries(self.capacity)
+        series.append(timestamp, {
+            'cpu': cpu_percent,
+            'memory': max(memory, 0),
+            'memory_percent': memory / memory_limit * 100 if memory_limit else 0.0,
+            'net_rx': rate('net_rx'),
+            'net_tx': rate('net_tx'),
+            'block_read': rate('block_read'),
+            'block_write': rate('block_write')
+        })
+
+    # Abfragen
+
+    def latest(self, name: str) -> Optional[Dict[str, float]]:
+        self.start()
+        with self._lock:
+            series = self._series.get(name)
+            return series.latest() if series else None
+
+    def history(self, name: str, seconds: Optional[int] = None) -> Optional[Dict[str, List[float]]]:
+        self.start()
+        since = time.time() - seconds if seconds else 0.0
+        with self._lock:
+            series = self._series.get(name)
+            return series.history(since) if series else None
+
+    def top(self, metric: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Gibt die Container mit den höchsten aktuellen Werten einer Metrik zurück"""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        if limit < 0:
+            raise ValueError(f"Invalid limit: {limit}")
+        self.start()
+        # Gestoppte Container liefern keine neuen Werte mehr
+        stale_before = time.time() - 3 * self.interval
+        with self._lock:
+            rows = []
+            for name, series in self._series.items():
+                latest = series.latest()
+                if latest is not None and latest['timestamp'] >= stale_before:
+                    rows.append(dict(latest, name=name))
+        rows.sort(key=lambda row: row[metric], reverse=True)
+        return rows[:limit]
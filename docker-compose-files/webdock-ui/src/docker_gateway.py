@@ -0,0 +1,423 @@
+"""Gateway zur Docker Engine API.
+
+Alle Docker-Abfragen laufen über einen persistenten, thread-sicheren
+Connection-Pool auf /var/run/docker.sock statt über einzelne `docker` CLI-Prozesse.
+"""
+import logging
+import os
+import re
+import struct
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+import docker
+import requests
+from docker.errors import APIError, DockerException, ImageNotFound, InvalidVersion, NotFound
+from docker.types import CancellableStream
+
+logger = logging.getLogger(__name__)
+
+DOCKER_BASE_URL = os.getenv('DOCKER_HOST', 'unix:///var/run/docker.sock')
+DOCKER_POOL_SIZE = int(os.getenv('DOCKER_POOL_SIZE', '10'))
+DOCKER_API_TIMEOUT = int(os.getenv('DOCKER_API_TIMEOUT', '60'))
+
+COMPOSE_PROJECT_LABEL = 'com.docker.compose.project'
+COMPOSE_SERVICE_LABEL = 'com.docker.compose.service'
+COMPOSE_CONFIG_FILES_LABEL = 'com.docker.compose.project.config_files'
+
+# Fehler, die bei einem API-Aufruf auftreten können (inkl. Socket-Fehler)
+_API_ERRORS = (APIError, DockerException, requests.exceptions.RequestException)
+
+_HEALTH_PATTERN = re.compile(r'\((healthy|unhealthy|health: starting)\)')
+
+# Maximale Länge einer Log-Zeile; längere Zeilen werden abgeschnitten
+LOG_LINE_MAX = int(os.getenv('LOG_LINE_MAX', str(16 * 1024)))
+
+# Stream-Typen im Header der gemultiplexten Log-Frames
+_LOG_STREAMS = {0: 'stdin', 1: 'stdout', 2: 'stderr'}
+
+
+class DockerGatewayError(Exception):
+    """Fehler bei der Kommunikation mit der Docker Engine"""
+
+
+def parse_docker_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Wandelt einen Docker-Zeitstempel (RFC 3339, Nanosekunden) in ein datetime um"""
+    if not value or value.startswith('0001-01-01'):
+        return None
+    try:
+        return datetime.strptime(value[:19], '%Y-%m-%dT%H:%M:%S').replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def _parse_log_time(value: str) -> Optional[float]:
+    # RFC 3339 mit Nanosekunden, z.B. 2024-01-01T12:00:00.123456789Z
+    seconds, _, fraction = value.rstrip('Z').partition('.')
+    try:
+        timestamp = datetime.strptime(seconds, '%Y-%m-%dT%H:%M:%S').replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+    return timestamp + float('0.' + fraction) if fraction.isdigit() else timestamp
+
+
+def _health_from_status(status: str) -> Optional[str]:
+    match = _HEALTH_PATTERN.search(status or '')
+    if not match:
+        return None
+    return 'starting' if match.group(1) == 'health: starting' else match.group(1)
+
+
+@dataclass
+class LogLine:
+    """Eine Zeile aus `docker logs -t`, getrennt nach stdout und stderr"""
+    stream: str
+    time: Optional[float]
+    text: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'stream': self.stream,
+            'time': datetime.fromtimestamp(self.time, timezone.utc).isoformat() if self.time else None,
+            'line': self.text
+        }
+
+
+def _demux_frames(response) -> Iterator[Tuple[str, bytes]]:
+    # 8-Byte-Header pro Frame: Stream-Typ, 3 Füllbytes, Länge (big endian)
+    while True:
+        header = response.raw.read(8)
+        if len(header) < 8:
+            return
+        stream_type, size = struct.unpack('>BxxxL', header)
+        data = response.raw.read(size)
+        if not data:
+            return
+        yield _LOG_STREAMS.get(stream_type, 'stdout'), data
+
+
+def _raw_chunks(response) -> Iterator[Tuple[str, bytes]]:
+    # Container mit TTY liefern einen ungemultiplexten Stream
+    for chunk in response.iter_content(chunk_size=None):
+        yield 'stdout', chunk
+
+
+def _split_lines(frames: Iterator[Tuple[str, bytes]]) -> Iterator[LogLine]:
+    # Frames sind nicht an Zeilengrenzen gebunden; Reste werden pro Stream gepuffert
+    partial: Dict[str, bytes] = {}
+
+    def to_line(stream: str, raw: bytes) -> LogLine:
+        text = raw[:LOG_LINE_MAX].decode('utf-8', errors='replace').rstrip('\r')
+        timestamp, _, rest = text.partition(' ')
+        time_value = _parse_log_time(timestamp)
+        return LogLine(stream, time_value, rest if time_value is not None else text)
+
+    for stream, data in frames:
+        lines = (partial.pop(stream, b'') + data).split(b'\n')
+        rest = lines.pop()
+        for raw in lines:
+            yield to_line(stream, raw)
+        if rest:
+            partial[stream] = rest[:LOG_LINE_MAX]
+    for stream, rest in partial.items():
+        yield to_line(stream, rest)
+
+
+@dataclass
+class ContainerSummary:
+    """Ein Eintrag aus der Container-Liste (entspricht einer Zeile von `docker ps -a`)"""
+    id: str
+    name: str
+    state: str
+    status: str
+    image: str
+    image_id: str = ''
+    created: int = 0
+    health: Optional[str] = None
+    project: Optional[str] = None
+    service: Optional[str] = None
+    labels: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def running(self) -> bool:
+        return self.state == 'running'
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> 'ContainerSummary':
+        labels = data.get('Labels') or {}
+        names = data.get('Names') or ['']
+        return cls(
+            id=data.get('Id', ''),
+            name=names[0].lstrip('/'),
+            state=data.get('State', 'unknown'),
+            status=data.get('Status', ''),
+            image=data.get('Image', ''),
+            image_id=data.get('ImageID', ''),
+            created=data.get('Created', 0),
+            health=_health_from_status(data.get('Status', '')),
+            project=labels.get(COMPOSE_PROJECT_LABEL),
+            service=labels.get(COMPOSE_SERVICE_LABEL),
+            labels=labels
+        )
+
+
+@dataclass
+class ContainerDetails:
+    """Aufbereitetes Ergebnis von `docker inspect` für einen Container"""
+    id: str
+    name: str
+    state: str
+    image: str
+    image_id: str
+    created: Optional[str]
+    started_at: Optional[datetime]
+    health: Optional[str]
+    tty: bool = False
+    networks: List[str] = field(default_factory=list)
+    mounts: List[Dict[str, Any]] = field(default_factory=list)
+    ports: Dict[str, Any] = field(default_factory=dict)
+    command: List[str] = field(default_factory=list)
+    labels: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def running(self) -> bool:
+        return self.state == 'running'
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> 'ContainerDetails':
+        state = data.get('State') or {}
+        config = data.get('Config') or {}
+        network_settings = data.get('NetworkSettings') or {}
+        return cls(
+            id=data.get('Id', ''),
+            name=data.get('Name', '').lstrip('/'),
+            state=state.get('Status', 'unknown'),
+            image=config.get('Image', ''),
+            image_id=data.get('Image', ''),
+            created=data.get('Created'),
+            started_at=parse_docker_timestamp(state.get('StartedAt')),
+            health=(state.get('Health') or {}).get('Status'),
+            tty=bool(config.get('Tty')),
+            networks=list((network_settings.get('Networks') or {}).keys()),
+            mounts=data.get('Mounts') or [],
+            ports=network_settings.get('Ports') or {},
+            command=config.get('Cmd') or [],
+            labels=config.get('Labels') or {}
+        )
+
+
+class DockerGateway:
+    """Thread-sicherer Zugriff auf die Docker Engine über einen gemeinsamen Connection-Pool"""
+
+    def __init__(self, base_url: str = DOCKER_BASE_URL, pool_size: int = DOCKER_POOL_SIZE,
+                 timeout: int = DOCKER_API_TIMEOUT):
+        self.base_url = base_url
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._client: Optional[docker.APIClient] = None
+        self._lock = threading.Lock()
+
+    @property
+    def api(self) -> docker.APIClient:
+        """Gibt den (lazy erstellten) API-Client zurück"""
+        client = self._client
+        if client is not None:
+            return client
+        with self._lock:
+            if self._client is None:
+                try:
+                    self._client = docker.APIClient(
+                        base_url=self.base_url,
+                        version='auto',
+                        timeout=self.timeout,
+                        max_pool_size=self.pool_size
+                    )
+                except DockerException as e:
+                    raise DockerGatewayError(f"Cannot connect to Docker Engine: {e}") from e
+            return self._client
+
+    def reset(self):
+        """Verwirft den Client, z.B. nach einem Neustart des Docker-Daemons"""
+        with self._lock:
+            if self._client is not None:
+                try:
+                    self._client.close()
+                except Exception:
+                    pass
+            self._client = None
+
+    def ping(self) -> bool:
+        try:
+            return bool(self.api.ping())
+        except Exception:
+            return False
+
+    # Container
+
+    def list_containers(self, all: bool = True, filters: Optional[Dict[str, Any]] = None) -> List[ContainerSummary]:
+        """Entspricht `docker ps [-a]`, aber als ein einziger API-Aufruf"""
+        try:
+            return [ContainerSummary.from_api(c) for c in self.api.containers(all=all, filters=filters)]
+        except _API_ERRORS as e:
+            raise DockerGatewayError(f"Failed to list containers: {e}") from e
+
+    def running_names(self) -> Set[str]:
+        return {c.name for c in self.list_containers(all=False)}
+
+    def inspect_container(self, name_or_id: str) -> Optional[ContainerDetails]:
+        """Entspricht `docker inspect`, gibt None zurück wenn der Container nicht existiert"""
+        raw = self.inspect_container_raw(name_or_id)
+        return ContainerDetails.from_api(raw) if raw else None
+
+    def inspect_container_raw(self, name_or_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.api.inspect_container(name_or_id)
+        except NotFound:
+            return None
+        except _API_ERRORS as e:
+            raise DockerGatewayError(f"Failed to inspect {name_or_id}: {e}") from e
+
+    def container_stats(self, name_or_id: str) -> Optional[Dict[str, Any]]:
+        """Einzelner Stats-Datensatz ohne die 1s-Wartezeit des Daemons (one-shot, ohne precpu)"""
+        try:
+            try:
+                return self.api.stats(name_or_id, stream=False, one_shot=True)
+            except InvalidVersion:
+                # Engine-API < 1.41 kennt one-shot nicht
+                return self.api.stats(name_or_id, stream=False)
+        except NotFound:
+            return None
+        except _API_ERRORS as e:
+            raise DockerGatewayError(f"Failed to read stats of {name_or_id}: {e}") from e
+
+    def container_logs(self, name_or_id: str, tail: int = 50, timestamps: bool = False) -> str:
+        """Entspricht `docker logs --tail N` (stdout und stderr zusammen)"""
+        try:
+            output = self.api.logs(name_or_id, stdout=True, stderr=True, tail=tail, timestamps=timestamps)
+            return output.decode('utf-8', errors='replace')
+        except NotFound:
+            return ''
+        except _API_ERRORS as e:
+            raise DockerGatewayError(f"Failed to read logs of {name_or_id}: {e}") from e
+
+    def log_stream(self, name_or_id: str, tail: Union[int, str] = 'all', since: Optional[float] = None,
+                   until: Optional[float] = None, follow: bool = True) -> Optional[CancellableStream]:
+        """Entspricht `docker logs -t [-f]`: liefert LogLine-Objekte, schließbar über `.close()`.
+
+        Gibt None zurück wenn der Container nicht existiert.
+        """
+        details = self.inspect_container(name_or_id)
+        if details is None:
+            return None
+        params = {'stdout': 1, 'stderr': 1, 'timestamps': 1, 'follow': int(follow), 'tail': str(tail)}
+        if since is not None:
+            params['since'] = f'{since:.9f}'
+        if until is not None:
+            params['until'] = f'{until:.9f}'
+        try:
+            # Ohne Timeout, sonst bricht ein ruhiger Follow-Stream nach DOCKER_API_TIMEOUT ab
+            response = self.api._get(self.api._url('/containers/{0}/logs', details.id),
+                                     params=params, stream=True, timeout=None)
+            self.api._raise_for_status(response)
+        except NotFound:
+            return None
+        except _API_ERRORS as e:
+            raise DockerGatewayError(f"Failed to stream logs of {name_or_id}: {e}") from e
+        frames = _raw_chunks(response) if details.tty else _demux_frames(response)
+        return CancellableStream(_split_lines(frames), response)
+
+    def exec_run(self, name_or_id: str, cmd: List[str]) -> int:
+        """Entspricht `docker exec`, gibt den Exit-Code zurück"""
+        try:
+            exec_id = self.api.exec_create(name_or_id, cmd)['Id']
+            output = self.api.exec_start(exec_id)
+            exit_code = self.api.exec_inspect(exec_id).get('ExitCode', 0) or 0
+            if exit_code != 0:
+                logger.warning(f"exec in {name_or_id} exited with {exit_code}: {output.decode(errors='replace')}")
+            return exit_code
+        except _API_ERRORS as e:
+            raise DockerGatewayError(f"Failed to exec in {name_or_id}: {e}") from e
+
+    def run_oneshot(self, image: str, command: List[str], binds: Optional[List[str]] = None) -> str:
+        """Entspricht `docker run --rm`, gibt die Ausgabe zurück und wirft bei Exit-Code != 0"""
+        try:
+            try:
+                self.api.inspect_image(image)
+            except ImageNotFound:
+                self.pull_image(image)
+            container = self.api.create_container(
+                image,
+                command=command,
+                host_config=self.api.create_host_config(binds=binds or [])
+            )
+            try:
+                self.api.start(container['Id'])
+                result = self.api.wait(container['Id'])
+                output = self.api.logs(container['Id'], stdout=True, stderr=True).decode('utf-8', errors='replace')
+            finally:
+                self.api.remove_container(container['Id'], force=True)
+        except _API_ERRORS as e:
+            raise DockerGatewayError(f"Failed to run {image}: {e}") from e
+        if result.get('StatusCode', 0) != 0:
+            raise DockerGatewayError(f"{image} exited with {result.get('StatusCode')}: {output}")
+        return output
+
+    # Images
+
+    def inspect_image(self, ref: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.api.inspect_image(ref)
+        except (NotFound, ImageNotFound):
+            return None
+        except _API_ERRORS as e:
+            raise DockerGatewayError(f"Failed to inspect image {ref}: {e}") from e
+
+    def pull_image(self, ref: str):
+        repository, tag = docker.utils.parse_repository_tag(ref)
+        try:
+            self.api.pull(repository, tag=tag or 'latest')
+        except _API_ERRORS as e:
+            raise DockerGatewayError(f"Failed to pull {ref}: {e}") from e
+
+    # Engine
+
+    def version(self) -> Dict[str, Any]:
+        try:
+            return self.api.version()
+        except _API_ERRORS as e:
+            raise DockerGatewayError(f"Failed to get Docker version: {e}") from e
+
+    def network_names(self, name_filter: Optional[str] = None) -> List[str]:
+        try:
+            filters = {'name': name_filter} if name_filter else None
+            return [n['Name'] for n in self.api.networks(filters=filters)]
+        except _API_ERRORS as e:
+            raise DockerGatewayError(f"Failed to list networks: {e}") from e
+
+    def events(self, since=None, until=None, filters: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Gibt den (dekodierten) Docker-Event-Stream zurück, schließbar über `.close()`"""
+        try:
+            return self.api.events(since=since, until=until, filters=filters, decode=True)
+        except _API_ERRORS as e:
+            raise DockerGatewayError(f"Failed to read events: {e}") from e
+
+    def compose_projects(self) -> List[Dict[str, Any]]:
+        """Entspricht `docker compose ls --format json`, abgeleitet aus den Container-Labels"""
+        projects: Dict[str, Dict[str, Any]] = {}
+        for container in self.list_containers(all=True):
+            if not container.project:
+                continue
+            project = projects.setdefault(container.project, {
+                'Name': container.project,
+                'states': {},
+                'ConfigFiles': container.labels.get(COMPOSE_CONFIG_FILES_LABEL, '')
+            })
+            project['states'][container.state] = project['states'].get(container.state, 0) + 1
+        result = []
+        for project in projects.values():
+            states = project.pop('states')
+            project['Status'] = ', '.join(f"{state}({count})" for state, count in sorted(states.items()))
+            result.append(project)
+        return result
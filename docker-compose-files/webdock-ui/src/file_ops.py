@@ -0,0 +1,144 @@
+"""Sammeloperationen des Datei-Explorers: Löschen, Kopieren, Verschieben, chmod.
+
+Jeder Pfad wird mit einem einzigen Befehl auf dem Host bearbeitet (`rm -rf`,
+`cp -a`, `mv`, `chmod`), statt Datei für Datei über SFTP. Fehlen die Befehle
+auf dem Host, wird auf SFTP ausgewichen. Ergebnis und Fehler werden pro Pfad
+gemeldet; ein fehlgeschlagener Pfad bricht die übrigen nicht ab.
+"""
+import logging
+import posixpath
+import re
+import shlex
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import paramiko
+
+import remote_files
+from jobs import JobContext
+from ssh_terminal import SSHSession
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = ('delete', 'copy', 'move', 'chmod')
+
+# Pfade, die nie gelöscht oder verschoben werden
+PROTECTED_PATHS = {
+    '/', '/bin', '/boot', '/dev', '/etc', '/home', '/lib', '/lib64', '/opt', '/proc',
+    '/root', '/run', '/sbin', '/srv', '/sys', '/tmp', '/usr', '/var'
+}
+_MODE_PATTERN = re.compile(r'^([0-7]{3,4}|[ugoa]*[+=-][rwxXst]*(,[ugoa]*[+=-][rwxXst]*)*)$')
+# Exit-Code der Shell, wenn ein Befehl nicht gefunden wurde
+_COMMAND_NOT_FOUND = 127
+
+
+class FileOperationError(Exception):
+    """Ungültige Sammeloperation"""
+
+
+def validate(operation: str, paths: List[str], destination: Optional[str] = None,
+             mode: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+    """Prüft die Parameter und gibt die normalisierten Pfade und das Ziel zurück"""
+    if operation not in OPERATIONS:
+        raise FileOperationError(f"Unknown operation: {operation}")
+    if not paths or not isinstance(paths, list):
+        raise FileOperationError("No paths given")
+    normalized = []
+    for path in paths:
+        if not isinstance(path, str) or not path.startswith('/'):
+            raise FileOperationError(f"Path must be absolute: {path}")
+        path = posixpath.normpath(path)
+        if operation in ('delete', 'move') and path in PROTECTED_PATHS:
+            raise FileOperationError(f"Refusing to {operation} {path}")
+        normalized.append(path)
+    if operation in ('copy', 'move'):
+        if not destination or not destination.startswith('/'):
+            raise FileOperationError("Destination must be an absolute path")
+        destination = posixpath.normpath(destination)
+        for path in normalized:
+            if destination == path or destination.startswith(path.rstrip('/') + '/'):
+                raise FileOperationError(f"Cannot {operation} {path} into itself")
+    if operation == 'chmod' and not (mode and _MODE_PATTERN.match(mode)):
+        raise FileOperationError(f"Invalid mode: {mode}")
+    return normalized, destination
+
+
+def _exec(client: paramiko.SSHClient, command: str) -> Tuple[int, str]:
+    _, stdout, stderr = client.exec_command(command)
+    output = stdout.read().decode(errors='replace') + stderr.read().decode(errors='replace')
+    return stdout.channel.recv_exit_status(), output.strip()
+
+
+def _command(operation: str, path: str, destination: Optional[str], mode: Optional[str],
+             recursive: bool) -> str:
+    source = shlex.quote(path)
+    if operation == 'delete':
+        return f'rm -rf -- {source}'
+    if operation == 'copy':
+        return f'cp -a -- {source} {shlex.quote(destination)}/'
+    if operation == 'move':
+        return f'mv -- {source} {shlex.quote(destination)}/'
+    return f"chmod {'-R ' if recursive else ''}{shlex.quote(mode)} -- {source}"
+
+
+def _sftp_fallback(sftp: paramiko.SFTPClient, operation: str, path: str, destination: Optional[str],
+                   mode: Optional[str], recursive: bool):
+    if operation == 'delete':
+        remote_files.remove(sftp, path)
+    elif operation == 'move':
+        sftp.posix_rename(path, posixpath.join(destination, posixpath.basename(path)))
+    elif operation == 'copy':
+        remote_files.copy(sftp, path, posixpath.join(destination, posixpath.basename(path)))
+    elif mode.isdigit():
+        remote_files.chmod(sftp, path, int(mode, 8), recursive)
+    else:
+        raise FileOperationError("Symbolic modes need chmod on the host")
+
+
+def apply(session: SSHSession, operation: str, path: str, destination: Optional[str] = None,
+          mode: Optional[str] = None, recursive: bool = False):
+    """Bearbeitet einen Pfad; wirft bei Fehlern"""
+    exit_code, output = _exec(session.client, _command(operation, path, destination, mode, recursive))
+    if exit_code == _COMMAND_NOT_FOUND:
+        logger.info(f"{operation} not available on host, falling back to SFTP")
+        _sftp_fallback(session.sftp(), operation, path, destination, mode, recursive)
+    elif exit_code != 0:
+        raise FileOperationError(output or f"{operation} failed with exit code {exit_code}")
+    # Auch Änderungen in derselben Sekunde sollen in der nächsten Liste sichtbar sein
+    session.listings.invalidate(posixpath.dirname(path))
+    if destination:
+        session.listings.invalidate(destination)
+
+
+def run_bulk(ctx: JobContext, session: SSHSession, operation: str, paths: List[str],
+             destination: Optional[str] = None, mode: Optional[str] = None,
+             recursive: bool = False) -> Dict[str, Any]:
+    """Führt eine Operation auf allen Pfaden aus und liefert das Ergebnis pro Pfad (läuft als Job)"""
+    started = time.monotonic()
+    results: Dict[str, Dict[str, Any]] = {}
+    for index, path in enumerate(paths, 1):
+        result: Dict[str, Any] = {'status': 'failed', 'error': None}
+        try:
+            with ctx.step(f'{operation} {path}'):
+                apply(session, operation, path, destination, mode, recursive)
+            result['status'] = 'succeeded'
+        except Exception as e:
+            logger.error(f"Error during {operation} of {path}: {str(e)}")
+            result['error'] = str(e)
+            ctx.log(f"{path}: {e}")
+        results[path] = result
+        ctx.log(f"[{index}/{len(paths)}] {operation} {path}: {result['status']}")
+        session.touch()
+
+    failed = [path for path, result in results.items() if result['status'] != 'succeeded']
+    duration = round(time.monotonic() - started, 2)
+    message = f"{operation.capitalize()}: {len(paths) - len(failed)} of {len(paths)} items in {duration}s"
+    if failed:
+        message += f" (failed: {len(failed)})"
+    return {
+        'message': message,
+        'operation': operation,
+        'items': results,
+        'failed': failed,
+        'duration': duration
+    }
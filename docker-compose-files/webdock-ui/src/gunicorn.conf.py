@@ -0,0 +1,32 @@
+"""Gunicorn-Konfiguration für den Produktionsmodus (WEBDOCK_SERVER=production).
+
+Die App hält Zustand im Prozess (SSH-Sitzungen, Jobs, Container-Index,
+SSE-Clients). Deshalb läuft genau ein Worker-Prozess mit vielen Threads
+(gthread); parallele Anfragen und offene Streams verteilen sich auf die Threads.
+"""
+import os
+
+bind = os.getenv('WEBDOCK_BIND', '0.0.0.0:80')
+worker_class = 'gthread'
+
+# Fest ein Worker: mehrere Prozesse würden SSH-Sitzungen, Jobs und Streams
+# aufteilen; skaliert wird über WEBDOCK_THREADS
+workers = 1
+
+# Jeder offene SSE-Stream belegt einen Thread
+threads = int(os.getenv('WEBDOCK_THREADS', '64'))
+keepalive = int(os.getenv('WEBDOCK_KEEPALIVE', '5'))
+timeout = int(os.getenv('WEBDOCK_TIMEOUT', '120'))
+graceful_timeout = int(os.getenv('WEBDOCK_GRACEFUL_TIMEOUT', '30'))
+
+accesslog = '-' if os.getenv('WEBDOCK_ACCESS_LOG', '0') == '1' else None
+errorlog = '-'
+loglevel = os.getenv('WEBDOCK_LOG_LEVEL', 'info')
+
+# Hintergrund-Threads erst im Worker starten, nicht im Master vor dem Fork
+preload_app = False
+
+
+def post_worker_init(worker):
+    from app import init_app
+    init_app()
@@ -0,0 +1,90 @@
+"""Gebündelte Abfrage des Gesundheitszustands aller Container.
+
+Statt `docker ps -a` plus einem `docker inspect` pro Container gibt es einen
+Listen-Aufruf und einen begrenzten, parallelen Inspect-Fan-out. Das Ergebnis wird
+kurz zwischengespeichert, damit parallele Dashboard-Tabs sich eine Abfrage teilen.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from docker_gateway import ContainerDetails, DockerGateway
+
+logger = logging.getLogger(__name__)
+
+HEALTH_SNAPSHOT_TTL = float(os.getenv('HEALTH_SNAPSHOT_TTL', '5'))
+HEALTH_MAX_WORKERS = int(os.getenv('HEALTH_MAX_WORKERS', '8'))
+
+
+class HealthCollector:
+    """Sammelt State, Health und StartedAt aller Container und teilt den Snapshot"""
+
+    def __init__(self, gateway: DockerGateway, ttl: float = HEALTH_SNAPSHOT_TTL,
+                 max_workers: int = HEALTH_MAX_WORKERS):
+        self.gateway = gateway
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self._snapshot: Optional[List[Dict[str, Any]]] = None
+        self._snapshot_time = 0.0
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Gibt den aktuellen Snapshot zurück; gleichzeitige Anfragen warten auf dieselbe Abfrage"""
+        if self._snapshot is not None and time.monotonic() - self._snapshot_time < self.ttl:
+            return self._snapshot
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._snapshot_time < self.ttl:
+                return self._snapshot
+            self._snapshot = self.collect()
+            self._snapshot_time = time.monotonic()
+            return self._snapshot
+
+    def invalidate(self):
+        self._snapshot_time = 0.0
+
+    def collect(self) -> List[Dict[str, Any]]:
+        """Ein Listen-Aufruf plus paralleler Inspect der laufenden Container"""
+        containers = self.gateway.list_containers(all=True)
+        running = [c.id for c in containers if c.running]
+        details: Dict[str, ContainerDetails] = {}
+        if running:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(running))) as pool:
+                for result in pool.map(self._inspect, running):
+                    if result is not None:
+                        details[result.id] = result
+
+        now = datetime.now(timezone.utc)
+        health_data = []
+        for container in containers:
+            # Basis-Container-Informationen
+            container_info = {
+                'id': container.id[:12],
+                'name': container.name,
+                'status': container.status.lower(),
+                'health': 'unknown'
+            }
+
+            if container.running:
+                info = details.get(container.id)
+                if info is None:
+                    # Container ist zwischen Liste und Inspect verschwunden
+                    continue
+                if info.started_at:
+                    container_info['uptime'] = str(now - info.started_at).split('.')[0]  # Ohne Millisekunden
+                else:
+                    container_info['uptime'] = 'unknown'
+                container_info['health'] = info.health or 'running'
+
+            health_data.append(container_info)
+        return health_data
+
+    def _inspect(self, container_id: str) -> Optional[ContainerDetails]:
+        try:
+            return self.gateway.inspect_container(container_id)
+        except Exception as e:
+            logger.error(f"Error inspecting container {container_id}: {str(e)}")
+            return None
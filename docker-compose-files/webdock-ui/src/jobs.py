@@ -0,0 +1,298 @@
+"""Asynchrone Jobs für Install, Update, Restart und Toggle.
+
+Lang laufende `docker compose` Aufrufe laufen nicht mehr im HTTP-Request, sondern
+auf einem begrenzten Worker-Pool. Jeder Job speichert seine Schritte und die
+Ausgabe und kann live verfolgt werden. Jobs auf demselben Stack laufen
+nacheinander, Jobs auf verschiedenen Stacks parallel.
+"""
+import logging
+import os
+import subprocess
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from status_stream import format_sse
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '4'))
+JOB_HISTORY = int(os.getenv('JOB_HISTORY', '100'))
+JOB_OUTPUT_LINES = int(os.getenv('JOB_OUTPUT_LINES', '2000'))
+JOB_STREAM_HEARTBEAT = 15
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+
+class JobError(Exception):
+    """Ein Schritt eines Jobs ist fehlgeschlagen"""
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+
+class Job:
+    """Zustand, Schritte und Ausgabe eines Jobs"""
+
+    def __init__(self, kind: str, stack: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.stack = stack
+        self.status = QUEUED
+        self.message: Optional[str] = None
+        self.error: Optional[str] = None
+        self.result: Any = None
+        self.steps: List[Dict[str, Any]] = []
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        # Ausgabezeilen mit fortlaufender Nummer, begrenzt auf JOB_OUTPUT_LINES
+        self.output: Deque[str] = deque(maxlen=JOB_OUTPUT_LINES)
+        self.lines_total = 0
+        # Wird bei jeder Änderung erhöht, damit Streams wissen wann sie senden müssen
+        self.revision = 0
+        self._changed = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def _touch(self):
+        # Aufrufer hält self._changed
+        self.revision += 1
+        self._changed.notify_all()
+
+    def log(self, line: str):
+        with self._changed:
+            self.output.append(line.rstrip('\n'))
+            self.lines_total += 1
+            self._touch()
+
+    def set_status(self, status: str, message: Optional[str] = None, error: Optional[str] = None):
+        with self._changed:
+            self.status = status
+            if message is not None:
+                self.message = message
+            if error is not None:
+                self.error = error
+            if status == RUNNING:
+                self.started = time.time()
+            elif status in (SUCCEEDED, FAILED):
+                self.finished = time.time()
+            self._touch()
+
+    def lines_since(self, cursor: int):
+        """Gibt die Zeilen ab der fortlaufenden Nummer `cursor` (soweit noch im Puffer) und den neuen Cursor zurück"""
+        with self._changed:
+            first = self.lines_total - len(self.output)
+            start = max(cursor, first) - first
+            return list(self.output)[start:], self.lines_total
+
+    def wait(self, revision: int, timeout: float) -> int:
+        with self._changed:
+            self._changed.wait_for(lambda: self.revision != revision, timeout=timeout)
+            return self.revision
+
+    def to_dict(self, include_output: bool = False) -> Dict[str, Any]:
+        with self._changed:
+            data = {
+                'id': self.id,
+                'kind': self.kind,
+                'stack': self.stack,
+                'status': self.status,
+                'message': self.message,
+                'error': self.error,
+                'result': self.result,
+                'steps': [dict(step) for step in self.steps],
+                'created': _isoformat(self.created),
+                'started': _isoformat(self.started),
+                'finished': _isoformat(self.finished),
+                'duration': round((self.finished or time.time()) - self.started, 2) if self.started else None
+            }
+            if include_output:
+                data['output'] = list(self.output)
+            return data
+
+
+class JobContext:
+    """Wird an die Job-Funktion übergeben: Schritte markieren und Befehle ausführen"""
+
+    def __init__(self, job: Job, manager: Optional['JobManager'] = None):
+        self.job = job
+        self.manager = manager
+
+    def log(self, line: str):
+        self.job.log(line)
+
+    @contextmanager
+    def step(self, name: str):
+        """Markiert einen Schritt; eine Exception setzt ihn auf 'failed'"""
+        step = {'name': name, 'status': RUNNING, 'started': _isoformat(time.time()), 'finished': None}
+        with self.job._changed:
+            self.job.steps.append(step)
+            self.job._touch()
+        try:
+            yield step
+        except Exception as e:
+            self._finish_step(step, FAILED, str(e))
+            raise
+        else:
+            self._finish_step(step, SUCCEEDED)
+
+    def _finish_step(self, step: Dict[str, Any], status: str, error: Optional[str] = None):
+        with self.job._changed:
+            step['status'] = status
+            step['finished'] = _isoformat(time.time())
+            if error:
+                step['error'] = error
+            self.job._touch()
+
+    @contextmanager
+    def exclusive(self, stack: str):
+        """Belegt einen weiteren Stack wie ein eigener Job; wartet bis er frei ist"""
+        if self.manager is None:
+            yield
+            return
+        with self.manager.hold(stack):
+            yield
+
+    def run(self, cmd: List[str], cwd: Optional[str] = None, check: bool = True,
+            prefix: Optional[str] = None) -> int:
+        """Führt einen Befehl aus und schreibt stdout/stderr zeilenweise in die Job-Ausgabe"""
+        # Präfix unterscheidet die Ausgabe parallel laufender Befehle
+        prefix = f'[{prefix}] ' if prefix else ''
+        self.log(f"{prefix}$ {' '.join(cmd)}")
+        process = subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors='replace',
+            bufsize=1
+        )
+        for line in process.stdout:
+            self.log(prefix + line)
+        returncode = process.wait()
+        if check and returncode != 0:
+            raise JobError(f"Command failed with exit code {returncode}: {' '.join(cmd)}")
+        return returncode
+
+
+class JobManager:
+    """Begrenzter Worker-Pool mit Serialisierung pro Stack"""
+
+    def __init__(self, max_workers: int = JOB_WORKERS, history: int = JOB_HISTORY):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._history = history
+        self._busy_stacks = set()
+        self._pending: Dict[str, Deque] = {}
+        self._lock = threading.Lock()
+        # Wird benachrichtigt, wenn ein Stack frei wird
+        self._stack_freed = threading.Condition(self._lock)
+
+    def submit(self, kind: str, stack: str, fn: Callable[..., Any], *args, **kwargs) -> Job:
+        """Legt einen Job an; die Funktion bekommt einen JobContext als erstes Argument"""
+        job = Job(kind, stack)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+            if stack in self._busy_stacks:
+                # Wartet ohne einen Worker zu blockieren, bis der laufende Job des Stacks fertig ist
+                self._pending.setdefault(stack, deque()).append((job, fn, args, kwargs))
+            else:
+                self._busy_stacks.add(stack)
+                self._executor.submit(self._execute, job, fn, args, kwargs)
+        logger.info(f"Queued job {job.id} ({kind} {stack})")
+        return job
+
+    def _execute(self, job: Job, fn: Callable[..., Any], args, kwargs):
+        job.set_status(RUNNING)
+        try:
+            result = fn(JobContext(job, self), *args, **kwargs)
+            if isinstance(result, dict):
+                job.result = result
+                if result.get('failed'):
+                    # Teilweise fehlgeschlagen: Ergebnis bleibt erhalten, der Job gilt als fehlgeschlagen
+                    job.set_status(FAILED, message=result.get('message'), error=result.get('message'))
+                else:
+                    job.set_status(SUCCEEDED, message=result.get('message'))
+            else:
+                job.set_status(SUCCEEDED, message=result)
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.kind} {job.stack}) failed: {e}")
+            job.set_status(FAILED, message=str(e), error=str(e))
+        finally:
+            self._release(job.stack)
+
+    def _release(self, stack: str):
+        with self._lock:
+            pending = self._pending.get(stack)
+            if pending:
+                job, fn, args, kwargs = pending.popleft()
+                if not pending:
+                    del self._pending[stack]
+                self._executor.submit(self._execute, job, fn, args, kwargs)
+            else:
+                self._busy_stacks.discard(stack)
+                self._stack_freed.notify_all()
+
+    @contextmanager
+    def hold(self, stack: str):
+        """Belegt einen Stack für Arbeit innerhalb eines anderen Jobs"""
+        with self._lock:
+            while stack in self._busy_stacks:
+                self._stack_freed.wait()
+            self._busy_stacks.add(stack)
+        try:
+            yield
+        finally:
+            self._release(stack)
+
+    def _prune(self):
+        # Aufrufer hält self._lock; entfernt die ältesten abgeschlossenen Jobs
+        while len(self._jobs) > self._history:
+            for job_id, job in self._jobs.items():
+                if job.done:
+                    del self._jobs[job_id]
+                    break
+            else:
+                return
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job.to_dict() for job in reversed(jobs)]
+
+    def stream(self, job: Job) -> Iterator[str]:
+        """SSE-Generator: Ausgabe- und Statusänderungen bis der Job abgeschlossen ist"""
+        cursor = 0
+        revision = -1
+        while True:
+            current = job.revision
+            if current != revision:
+                revision = current
+                lines, cursor = job.lines_since(cursor)
+                if lines:
+                    yield format_sse('output', {'lines': lines, 'cursor': cursor})
+                data = job.to_dict()
+                if job.done:
+                    yield format_sse('done', data)
+                    return
+                yield format_sse('status', data)
+            if job.wait(revision, JOB_STREAM_HEARTBEAT) == revision:
+                yield ': heartbeat\n\n'
@@ -0,0 +1,207 @@
+"""Ringpuffer für App-Logs und Docker-Events.
+
+Einträge kommen aus einem logging.Handler und aus dem Docker-Event-Stream des
+Container-Index. Im Speicher bleiben die letzten LOG_STORE_CAPACITY Einträge;
+alle Einträge werden zusätzlich gepuffert als JSON-Lines auf die Platte
+geschrieben (rotiert ab LOG_STORE_MAX_BYTES) und beim Start wieder eingelesen.
+Jeder Eintrag hat eine fortlaufende ID, die als Cursor (`?after=`) dient.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+LOG_STORE_CAPACITY = int(os.getenv('LOG_STORE_CAPACITY', '5000'))
+LOG_STORE_MAX_BYTES = int(os.getenv('LOG_STORE_MAX_BYTES', str(5 * 1024 * 1024)))
+LOG_STORE_FLUSH_INTERVAL = 1.0
+LOG_STORE_FILENAME = 'webdock-logs.jsonl'
+
+# Logger, deren Einträge nicht gespeichert werden (Zugriffslogs der Polls, eigene Meldungen)
+_IGNORED_LOGGERS = ('werkzeug', 'gunicorn.access', __name__)
+
+
+def parse_time(value: Optional[str]) -> Optional[float]:
+    """Akzeptiert Unix-Zeit oder ISO-8601"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+class LogStore:
+    """Speicherbegrenzter Log- und Event-Speicher mit Cursor-Abfragen"""
+
+    def __init__(self, directory: Optional[str] = None, capacity: int = LOG_STORE_CAPACITY,
+                 max_bytes: int = LOG_STORE_MAX_BYTES):
+        self.directory = directory
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._pending: List[Dict[str, Any]] = []
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._loaded = False
+
+    @property
+    def path(self) -> Optional[str]:
+        return os.path.join(self.directory, LOG_STORE_FILENAME) if self.directory else None
+
+    def start(self):
+        """Startet das Schreiben auf die Platte (idempotent)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._load()
+            if self.path:
+                self._thread = threading.Thread(target=self._flush_loop, name='log-store', daemon=True)
+                self._thread.start()
+
+    # Schreiben
+
+    def add(self, level: str, source: str, message: str, timestamp: Optional[float] = None):
+        entry = {
+            'timestamp': timestamp if timestamp is not None else time.time(),
+            'level': level,
+            'source': source,
+            'message': message
+        }
+        with self._lock:
+            self._load()
+            entry['id'] = self._next_id
+            self._next_id += 1
+            self._entries.append(entry)
+            if self.path:
+                self._pending.append(entry)
+
+    def add_docker_event(self, event: Dict[str, Any]):
+        """Listener für den Docker-Event-Stream des Container-Index"""
+        attributes = (event.get('Actor') or {}).get('Attributes') or {}
+        action = event.get('Action') or event.get('status') or ''
+        if action.startswith('exec_'):
+            return
+        timestamp = event['timeNano'] / 1e9 if event.get('timeNano') else event.get('time')
+        self.add('EVENT', 'docker',
+                 f"{event.get('Type')}: {action} - Container: {attributes.get('name', '')}",
+                 timestamp)
+
+    # Persistenz
+
+    def _load(self):
+        # Aufrufer hält self._lock; liest beim ersten Zugriff die letzten Einträge von der Platte
+        if self._loaded or not self.path:
+            return
+        self._loaded = True
+        for entry in self._read_files():
+            self._entries.append(entry)
+            self._next_id = max(self._next_id, entry['id'] + 1)
+        if self._entries:
+            logger.debug(f"Loaded {len(self._entries)} log entries from {self.path}")
+
+    def _read_files(self) -> Iterable[Dict[str, Any]]:
+        for path in (self.path + '.1', self.path):
+            try:
+                with open(path) as f:
+                    for line in f:
+                        try:
+                            yield json.loads(line)
+                        except ValueError:
+                            continue
+            except OSError:
+                continue
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(LOG_STORE_FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except Exception as e:
+                # Nicht über logging melden, sonst entstehen neue Einträge
+                sys.stderr.write(f"Log store flush failed: {e}\n")
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending or not self.path:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, 'a') as f:
+            for entry in pending:
+                f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        if os.path.getsize(self.path) > self.max_bytes:
+            os.replace(self.path, self.path + '.1')
+
+    # Abfragen
+
+    def query(self, after: Optional[int] = None, levels: Optional[List[str]] = None,
+              sources: Optional[List[str]] = None, since: Optional[float] = None,
+              until: Optional[float] = None, limit: int = 100) -> Dict[str, Any]:
+        """Einträge aufsteigend nach ID.
+
+        Mit `after` die ersten `limit` neueren Einträge, sonst die letzten `limit`.
+        """
+        levels = {level.upper() for level in levels} if levels else None
+        sources = set(sources) if sources else None
+
+        def matches(entry):
+            return ((levels is None or entry['level'] in levels) and
+                    (sources is None or entry['source'] in sources) and
+                    (since is None or entry['timestamp'] >= since) and
+                    (until is None or entry['timestamp'] <= until))
+
+        with self._lock:
+            self._load()
+            entries = list(self._entries)
+            last_id = self._next_id - 1
+        if after is not None and self.path and entries and after + 1 < entries[0]['id']:
+            # Cursor liegt vor dem Speicherfenster: ältere Einträge von der Platte lesen
+            self.flush()
+            oldest = entries[0]['id']
+            entries = [e for e in self._read_files() if after < e['id'] < oldest] + entries
+
+        if after is not None:
+            result = []
+            for entry in entries:
+                if entry['id'] > after and matches(entry):
+                    result.append(entry)
+                    if len(result) >= limit:
+                        break
+        else:
+            result = [entry for entry in entries if matches(entry)][-limit:]
+
+        # Wurde bis zum Ende gelesen, zeigt der Cursor auf den neuesten Eintrag
+        cursor = result[-1]['id'] if after is not None and len(result) >= limit else last_id
+        return {
+            'entries': [dict(entry, timestamp=datetime.fromtimestamp(entry['timestamp']).isoformat())
+                        for entry in result],
+            'cursor': cursor
+        }
+
+
+class LogStoreHandler(logging.Handler):
+    """Leitet Log-Einträge der App in den LogStore"""
+
+    def __init__(self, store: LogStore, source: str = 'webdock-ui', level: int = logging.INFO):
+        super().__init__(level)
+        self.store = store
+        self.source = source
+
+    def emit(self, record: logging.LogRecord):
+        if record.name.startswith(_IGNORED_LOGGERS):
+            return
+        try:
+            message = record.getMessage()
+            if record.exc_info and record.exc_info[1] is not None:
+                message += f" ({record.exc_info[1]})"
+            self.store.add(record.levelname, self.source, message, record.created)
+        except Exception:
+            self.handleError(record)
@@ -0,0 +1,183 @@
+"""Dateizugriffe des Datei-Explorers über den SFTP-Client einer SSH-Sitzung.
+
+Gelesen wird mit Prefetch (mehrere Leseanfragen gleichzeitig unterwegs, aber
+höchstens ein Fenster von SFTP_PREFETCH_WINDOW Blöcken im Speicher), geschrieben mit Pipelining (kein Warten auf die Bestätigung jedes Blocks).
+Uploads landen zunächst in einer versteckten `.part`-Datei, deren Name aus Name,
+Größe und Änderungszeit der Quelldatei gebildet wird. Nur dieselbe Datei setzt
+also einen abgebrochenen Upload fort; umbenannt wird erst nach der Prüfung.
+"""
+import hashlib
+import io
+import os
+import posixpath
+import shlex
+import stat
+import zlib
+from typing import BinaryIO, Callable, Iterator, Optional
+
+import paramiko
+
+SFTP_BUFFER_SIZE = int(os.getenv('SFTP_BUFFER_SIZE', str(32768)))
+# Blöcke pro Leseanfrage-Fenster; begrenzt den Speicher bei langsamen Empfängern
+SFTP_PREFETCH_WINDOW = int(os.getenv('SFTP_PREFETCH_WINDOW', '32'))
+
+# Wird pro Block aufgerufen, z.B. SSHSession.touch, damit lange Übertragungen
+# die Sitzung nicht als ungenutzt erscheinen lassen
+OnChunk = Optional[Callable[[], None]]
+
+
+def read_file(sftp: paramiko.SFTPClient, path: str) -> bytes:
+    """Liest eine entfernte Datei vollständig"""
+    with sftp.open(path, 'rb', bufsize=SFTP_BUFFER_SIZE) as handle:
+        handle.prefetch()
+        return handle.read()
+
+
+def iter_file(sftp: paramiko.SFTPClient, path: str, start: int = 0,
+              stop: Optional[int] = None, on_chunk: OnChunk = None) -> Iterator[bytes]:
+    """Liest Bytes [start, stop) blockweise mit Prefetch; Speicherbedarf unabhängig von der Dateigröße
+
+    paramiko hält vorausgelesene Antworten bis zum Abholen im Speicher, daher
+    wird immer nur das nächste Fenster angefordert (readv) statt der ganzen Datei.
+    """
+    with sftp.open(path, 'rb', bufsize=SFTP_BUFFER_SIZE) as handle:
+        if stop is None:
+            stop = handle.stat().st_size
+        position = start
+        while position < stop:
+            end = min(stop, position + SFTP_PREFETCH_WINDOW * SFTP_BUFFER_SIZE)
+            window = [(offset, min(SFTP_BUFFER_SIZE, end - offset))
+                      for offset in range(position, end, SFTP_BUFFER_SIZE)]
+            for chunk in handle.readv(window):
+                if not chunk:
+                    # Datei ist inzwischen kürzer geworden
+                    return
+                if on_chunk:
+                    on_chunk()
+                yield chunk
+            position = end
+
+
+def gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Komprimiert einen Byte-Stream fortlaufend im gzip-Format"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def write_file(sftp: paramiko.SFTPClient, path: str, data: bytes):
+    """Schreibt (und kürzt) eine entfernte Datei"""
+    write_stream(sftp, path, io.BytesIO(data))
+
+
+def upload_part_path(directory: str, name: str, size: int, modified: str = '') -> str:
+    """Pfad der Teildatei eines Uploads, eindeutig für Name, Größe und Änderungszeit"""
+    key = hashlib.sha256(f'{name}\0{size}\0{modified}'.encode()).hexdigest()[:16]
+    return posixpath.join(directory, f'.{name}.{key}.part')
+
+
+def write_stream(sftp: paramiko.SFTPClient, path: str, stream: BinaryIO, offset: int = 0,
+                 digest=None, on_chunk: OnChunk = None) -> int:
+    """Schreibt einen Stream blockweise ab `offset` (0 kürzt die Datei); gibt die neue Größe zurück
+
+    `digest` (z.B. hashlib.sha256()) wird mit den geschriebenen Bytes fortgeschrieben.
+    """
+    with sftp.open(path, 'r+b' if offset else 'wb', bufsize=SFTP_BUFFER_SIZE) as handle:
+        handle.set_pipelined(True)
+        if offset:
+            handle.seek(offset)
+        size = offset
+        while True:
+            chunk = stream.read(SFTP_BUFFER_SIZE)
+            if not chunk:
+                break
+            handle.write(chunk)
+            if digest is not None:
+                digest.update(chunk)
+            if on_chunk:
+                on_chunk()
+            size += len(chunk)
+    return size
+
+
+def file_size(sftp: paramiko.SFTPClient, path: str) -> Optional[int]:
+    """Größe einer entfernten Datei; None wenn sie fehlt"""
+    try:
+        return sftp.stat(path).st_size
+    except FileNotFoundError:
+        return None
+
+
+def sha256(client: paramiko.SSHClient, sftp: paramiko.SFTPClient, path: str, on_chunk: OnChunk = None) -> str:
+    """SHA-256 einer entfernten Datei, bevorzugt per `sha256sum` auf dem Host"""
+    _, stdout, _ = client.exec_command(f'sha256sum -- {shlex.quote(path)}')
+    output = stdout.read().decode(errors='replace').split()
+    if stdout.channel.recv_exit_status() == 0 and output and len(output[0]) == 64:
+        return output[0]
+    # Ohne sha256sum einmal über SFTP lesen
+    digest = hashlib.sha256()
+    for chunk in iter_file(sftp, path, on_chunk=on_chunk):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def makedirs(sftp: paramiko.SFTPClient, path: str):
+    """Wie `mkdir -p`"""
+    missing = []
+    while path and path not in ('/', '.'):
+        try:
+            if not stat.S_ISDIR(sftp.stat(path).st_mode):
+                raise IOError(f"Not a directory: {path}")
+            break
+        except FileNotFoundError:
+            missing.append(path)
+            path = posixpath.dirname(path)
+    for directory in reversed(missing):
+        sftp.mkdir(directory)
+
+
+def remove(sftp: paramiko.SFTPClient, path: str) -> bool:
+    """Löscht eine Datei oder ein Verzeichnis rekursiv; gibt zurück, ob es ein Verzeichnis war"""
+    if not stat.S_ISDIR(sftp.lstat(path).st_mode):
+        sftp.remove(path)
+        return False
+    for entry in sftp.listdir_attr(path):
+        child = posixpath.join(path, entry.filename)
+        if stat.S_ISDIR(entry.st_mode):
+            remove(sftp, child)
+        else:
+            sftp.remove(child)
+    sftp.rmdir(path)
+    return True
+
+
+def copy(sftp: paramiko.SFTPClient, source: str, target: str):
+    """Kopiert eine Datei oder ein Verzeichnis rekursiv auf dem Host"""
+    attributes = sftp.lstat(source)
+    if stat.S_ISDIR(attributes.st_mode):
+        sftp.mkdir(target, stat.S_IMODE(attributes.st_mode))
+        for entry in sftp.listdir_attr(source):
+            copy(sftp, posixpath.join(source, entry.filename), posixpath.join(target, entry.filename))
+        return
+    with sftp.open(source, 'rb', bufsize=SFTP_BUFFER_SIZE) as reader, \
+            sftp.open(target, 'wb', bufsize=SFTP_BUFFER_SIZE) as writer:
+        reader.prefetch(attributes.st_size)
+        writer.set_pipelined(True)
+        for chunk in iter(lambda: reader.read(SFTP_BUFFER_SIZE), b''):
+            writer.write(chunk)
+    sftp.chmod(target, stat.S_IMODE(attributes.st_mode))
+
+
+def chmod(sftp: paramiko.SFTPClient, path: str, mode: int, recursive: bool = False):
+    """Wie `chmod [-R] mode path`"""
+    sftp.chmod(path, mode)
+    if recursive and stat.S_ISDIR(sftp.lstat(path).st_mode):
+        for entry in sftp.listdir_attr(path):
+            child = posixpath.join(path, entry.filename)
+            if stat.S_ISDIR(entry.st_mode):
+                chmod(sftp, child, mode, True)
+            elif not stat.S_ISLNK(entry.st_mode):
+                sftp.chmod(child, mode)
@@ -0,0 +1,125 @@
+"""Seitenweise, zwischengespeicherte Verzeichnislisten für den Datei-Explorer.
+
+Ein Verzeichnis wird einmal (mit vorausgeschickten READDIR-Anfragen) gelesen
+und pro Sitzung zwischengespeichert. Vor jeder Seite genügt ein `stat` auf das
+Verzeichnis: solange sich dessen mtime nicht geändert hat, kommen Sortierung,
+Filter und Seiten aus dem Speicher. Die mtime hat nur Sekundenauflösung;
+eigene Änderungen invalidieren den Eintrag deshalb zusätzlich ausdrücklich.
+"""
+import fnmatch
+import os
+import posixpath
+import stat
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import paramiko
+
+LISTING_PAGE_SIZE = int(os.getenv('LISTING_PAGE_SIZE', '500'))
+LISTING_PAGE_MAX = 5000
+LISTING_CACHE_DIRS = int(os.getenv('LISTING_CACHE_DIRS', '16'))
+LISTING_READ_AHEAD = 50
+SORT_KEYS = ('name', 'size', 'modified')
+# Sortierte und gefilterte Ansichten pro Verzeichnis
+_MAX_VIEWS = 4
+
+# (Name, Verzeichnis?, Größe, mtime)
+Entry = Tuple[str, bool, int, int]
+
+_SORT_FIELDS = {
+    'name': lambda entry: entry[0],
+    'size': lambda entry: (entry[2], entry[0]),
+    'modified': lambda entry: (entry[3], entry[0])
+}
+
+
+class _Listing:
+    def __init__(self, mtime: int, entries: List[Entry]):
+        self.mtime = mtime
+        self.entries = entries
+        self.views: 'OrderedDict[tuple, List[Entry]]' = OrderedDict()
+
+    def fresh(self, mtime: int) -> bool:
+        # Nur mit der mtime des Hosts vergleichen; dessen Uhr kann von der
+        # lokalen abweichen
+        return mtime == self.mtime
+
+
+class ListingCache:
+    """Verzeichnislisten einer Sitzung, invalidiert über die mtime des Verzeichnisses"""
+
+    def __init__(self, max_dirs: int = LISTING_CACHE_DIRS):
+        self.max_dirs = max_dirs
+        self._listings: 'OrderedDict[str, _Listing]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def invalidate(self, path: str):
+        with self._lock:
+            self._listings.pop(posixpath.normpath(path), None)
+
+    def _listing(self, sftp: paramiko.SFTPClient, path: str) -> Tuple[_Listing, bool]:
+        mtime = sftp.stat(path).st_mtime
+        with self._lock:
+            listing = self._listings.get(path)
+            if listing is not None and listing.fresh(mtime):
+                self._listings.move_to_end(path)
+                return listing, True
+
+        entries = [
+            (attr.filename, stat.S_ISDIR(attr.st_mode), attr.st_size, attr.st_mtime)
+            for attr in sftp.listdir_iter(path, read_aheads=LISTING_READ_AHEAD)
+        ]
+        listing = _Listing(mtime, entries)
+        with self._lock:
+            self._listings[path] = listing
+            while len(self._listings) > self.max_dirs:
+                self._listings.popitem(last=False)
+        return listing, False
+
+    def page(self, sftp: paramiko.SFTPClient, path: str, cursor: int = 0, limit: int = LISTING_PAGE_SIZE,
+             sort: str = 'name', order: str = 'asc', pattern: Optional[str] = None,
+             kind: Optional[str] = None, modified_since: Optional[float] = None) -> Dict[str, Any]:
+        """Eine Seite der sortierten, gefilterten Liste ab `cursor`"""
+        path = posixpath.normpath(path)
+        listing, cached = self._listing(sftp, path)
+        key = (sort, order, pattern, kind, modified_since)
+        with self._lock:
+            view = listing.views.get(key)
+        if view is None:
+            view = _view(listing.entries, sort, order == 'desc', pattern, kind, modified_since)
+            with self._lock:
+                listing.views[key] = view
+                while len(listing.views) > _MAX_VIEWS:
+                    listing.views.popitem(last=False)
+
+        limit = max(1, min(limit, LISTING_PAGE_MAX))
+        end = cursor + limit
+        return {
+            'files': [{
+                'name': name,
+                'type': 'directory' if is_dir else 'file',
+                'size': size,
+                'modified': mtime,
+                'path': posixpath.join(path, name)
+            } for name, is_dir, size, mtime in view[cursor:end]],
+            'total': len(view),
+            'cursor': str(end) if end < len(view) else None,
+            'version': listing.mtime,
+            'cached': cached
+        }
+
+
+def _view(entries: List[Entry], sort: str, descending: bool, pattern: Optional[str],
+          kind: Optional[str], modified_since: Optional[float]) -> List[Entry]:
+    if pattern:
+        pattern = pattern.lower()
+        entries = [entry for entry in entries if fnmatch.fnmatchcase(entry[0].lower(), pattern)]
+    if kind:
+        want_dirs = kind == 'directory'
+        entries = [entry for entry in entries if entry[1] == want_dirs]
+    if modified_since is not None:
+        entries = [entry for entry in entries if entry[3] >= modified_since]
+    ordered = sorted(entries, key=_SORT_FIELDS[sort], reverse=descending)
+    # Ordner stehen immer zuerst
+    return [entry for entry in ordered if entry[1]] + [entry for entry in ordered if not entry[1]]
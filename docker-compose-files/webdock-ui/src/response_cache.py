@@ -0,0 +1,57 @@
+"""Memoisierte JSON-Antworten mit starkem ETag.
+
+Der Aufrufer bildet einen Schlüssel aus den Versionen aller Datenquellen einer
+Antwort. Solange sich der Schlüssel nicht ändert, wird der fertig serialisierte
+Body samt ETag wiederverwendet; gleichzeitige Anfragen teilen sich einen Aufbau.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def file_version(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, Größe) einer Datei oder None wenn sie fehlt"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class MemoizedResponse:
+    """Hält den zuletzt erzeugten Body für einen Schlüssel"""
+
+    def __init__(self, name: str):
+        self.name = name
+        # (Schlüssel, Body, ETag) als ein Tupel, damit Leser nie einen gemischten Stand sehen
+        self._entry: Optional[Tuple[Hashable, bytes, str]] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Tuple[bytes, str]:
+        """Gibt (Body, ETag) für `key` zurück und baut den Body nur bei neuem Schlüssel"""
+        entry = self._entry
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1], entry[2]
+        with self._lock:
+            entry = self._entry
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry[1], entry[2]
+            body = json.dumps(build(), separators=(',', ':')).encode()
+            # Starker ETag: Hash über die exakten Bytes
+            etag = hashlib.sha256(body).hexdigest()[:32]
+            self._entry = (key, body, etag)
+            self.builds += 1
+            logger.debug(f"Rebuilt {self.name} response ({len(body)} bytes)")
+            return body, etag
+
+    def invalidate(self):
+        self._entry = None
@@ -0,0 +1,200 @@
+"""Pool wiederverwendbarer SSH-Verbindungen für die Host-Verwaltung.
+
+Verbindungen werden pro Host und Zugangsdaten gehalten, mit Keepalives offen
+gehalten und vor jeder Wiederverwendung geprüft. Ungenutzte Verbindungen werden
+nach SSH_POOL_IDLE_TIMEOUT geschlossen; insgesamt gibt es höchstens
+SSH_POOL_SIZE Verbindungen.
+"""
+import hashlib
+import logging
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import paramiko
+
+logger = logging.getLogger(__name__)
+
+SSH_POOL_SIZE = int(os.getenv('SSH_POOL_SIZE', '8'))
+SSH_POOL_IDLE_TIMEOUT = float(os.getenv('SSH_POOL_IDLE_TIMEOUT', '300'))
+SSH_POOL_WAIT_TIMEOUT = float(os.getenv('SSH_POOL_WAIT_TIMEOUT', '30'))
+SSH_KEEPALIVE_INTERVAL = int(os.getenv('SSH_KEEPALIVE_INTERVAL', '30'))
+SSH_CONNECT_TIMEOUT = float(os.getenv('SSH_CONNECT_TIMEOUT', '10'))
+SSH_POOL_REAP_INTERVAL = 30
+
+# Fehler, nach denen eine Verbindung nicht zurück in den Pool darf
+_CONNECTION_ERRORS = (paramiko.SSHException, socket.error, EOFError)
+
+PoolKey = Tuple[str, int, str, str]
+
+
+class SSHPoolError(Exception):
+    """Keine Verbindung verfügbar"""
+
+
+class _Connection:
+    def __init__(self, key: PoolKey, client: paramiko.SSHClient):
+        self.key = key
+        self.client = client
+        self.last_used = time.monotonic()
+
+    def healthy(self) -> bool:
+        transport = self.client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        try:
+            # Kleines Paket ohne Round-Trip; schlägt fehl wenn der Socket tot ist
+            transport.send_ignore()
+        except Exception:
+            return False
+        return True
+
+    def close(self):
+        try:
+            self.client.close()
+        except Exception:
+            pass
+
+
+class SSHPool:
+    """Verleiht SSH-Clients pro (Host, Port, Benutzer, Passwort)"""
+
+    def __init__(self, max_size: int = SSH_POOL_SIZE, idle_timeout: float = SSH_POOL_IDLE_TIMEOUT,
+                 keepalive: int = SSH_KEEPALIVE_INTERVAL):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.keepalive = keepalive
+        self._idle: Dict[PoolKey, List[_Connection]] = {}
+        self._total = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._reaper: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _key(host: str, port: int, username: str, password: str) -> PoolKey:
+        # Das Passwort nur als Hash im Schlüssel halten
+        return host, port, username, hashlib.sha256(password.encode()).hexdigest()
+
+    @contextmanager
+    def client(self, host: str, username: str, password: str, port: int = 22) -> Iterator[paramiko.SSHClient]:
+        """Leiht einen verbundenen SSHClient aus und gibt ihn danach zurück"""
+        key = self._key(host, port, username, password)
+        connection = self._acquire(key, password)
+        broken = False
+        try:
+            yield connection.client
+        except _CONNECTION_ERRORS:
+            broken = True
+            raise
+        finally:
+            self._release(connection, broken)
+
+    # Ausleihen und Zurückgeben
+
+    def _acquire(self, key: PoolKey, password: str) -> _Connection:
+        deadline = time.monotonic() + SSH_POOL_WAIT_TIMEOUT
+        with self._lock:
+            self._ensure_reaper()
+            while True:
+                idle = self._idle.get(key)
+                while idle:
+                    connection = idle.pop()
+                    if connection.healthy():
+                        return connection
+                    self._discard(connection)
+                if self._total < self.max_size or self._evict_oldest():
+                    # Platz reservieren, verbunden wird außerhalb des Locks
+                    self._total += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise SSHPoolError(f"No SSH connection available (pool size {self.max_size})")
+                self._available.wait(remaining)
+
+        try:
+            client = self._connect(key, password)
+        except Exception:
+            with self._lock:
+                self._total -= 1
+                self._available.notify()
+            raise
+        return _Connection(key, client)
+
+    def _connect(self, key: PoolKey, password: str) -> paramiko.SSHClient:
+        host, port, username, _ = key
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(
+            host,
+            port=port,
+            username=username,
+            password=password,
+            timeout=SSH_CONNECT_TIMEOUT,
+            banner_timeout=SSH_CONNECT_TIMEOUT,
+            auth_timeout=SSH_CONNECT_TIMEOUT
+        )
+        client.get_transport().set_keepalive(self.keepalive)
+        logger.info(f"Opened pooled SSH connection to {username}@{host}:{port}")
+        return client
+
+    def _release(self, connection: _Connection, broken: bool):
+        with self._lock:
+            transport = connection.client.get_transport()
+            if broken or transport is None or not transport.is_active():
+                self._discard(connection)
+            else:
+                connection.last_used = time.monotonic()
+                self._idle.setdefault(connection.key, []).append(connection)
+            self._available.notify()
+
+    def _discard(self, connection: _Connection):
+        # Aufrufer hält self._lock
+        self._total -= 1
+        connection.close()
+
+    def _evict_oldest(self) -> bool:
+        # Aufrufer hält self._lock; schließt die am längsten ungenutzte Verbindung
+        candidates = [(c.last_used, key, c) for key, idle in self._idle.items() for c in idle]
+        if not candidates:
+            return False
+        _, key, connection = min(candidates, key=lambda item: item[0])
+        self._idle[key].remove(connection)
+        self._discard(connection)
+        return True
+
+    # Aufräumen
+
+    def _ensure_reaper(self):
+        # Aufrufer hält self._lock
+        if self._reaper is None:
+            self._reaper = threading.Thread(target=self._reap_loop, name='ssh-pool-reaper', daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(SSH_POOL_REAP_INTERVAL)
+            try:
+                self.reap()
+            except Exception as e:
+                logger.error(f"SSH pool reaper failed: {e}")
+
+    def reap(self):
+        """Schließt Verbindungen, die länger als idle_timeout ungenutzt sind"""
+        cutoff = time.monotonic() - self.idle_timeout
+        closed = 0
+        with self._lock:
+            for key in list(self._idle):
+                expired = [c for c in self._idle[key] if c.last_used < cutoff]
+                for connection in expired:
+                    self._idle[key].remove(connection)
+                    self._discard(connection)
+                closed += len(expired)
+                if not self._idle[key]:
+                    del self._idle[key]
+            if closed:
+                self._available.notify_all()
+        if closed:
+            logger.info(f"Closed {closed} idle SSH connection(s)")
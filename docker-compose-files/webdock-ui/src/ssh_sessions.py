@@ -0,0 +1,167 @@
+"""Verwaltung der Web-Terminal-Sitzungen.
+
+Ersetzt das globale Dict der SSH-Sitzungen, behält aber dessen Schnittstelle
+(`in`, `[]`, `get`, `pop`). Die Anzahl der Sitzungen ist begrenzt; ein
+Hintergrund-Thread schließt Sitzungen, die länger als SSH_SESSION_IDLE_TIMEOUT
+ungenutzt sind oder deren Verbindung abgebrochen ist.
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from ssh_terminal import SSHSession
+
+logger = logging.getLogger(__name__)
+
+SSH_MAX_SESSIONS = int(os.getenv('SSH_MAX_SESSIONS', '20'))
+SSH_SESSION_IDLE_TIMEOUT = float(os.getenv('SSH_SESSION_IDLE_TIMEOUT', '1800'))
+SSH_SESSION_REAP_INTERVAL = 60
+
+
+class SSHSessionLimitError(Exception):
+    """Maximale Anzahl an Sitzungen erreicht"""
+
+
+class _Entry:
+    def __init__(self, session: SSHSession, host: str, username: str):
+        self.session = session
+        self.host = host
+        self.username = username
+
+
+class SSHSessionManager:
+    """Begrenzte, thread-sichere Zuordnung Session-ID -> SSHSession"""
+
+    def __init__(self, max_sessions: int = SSH_MAX_SESSIONS, idle_timeout: float = SSH_SESSION_IDLE_TIMEOUT):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+        # Summen der bereits geschlossenen Sitzungen
+        self._closed_count = 0
+        self._closed_bytes_in = 0
+        self._closed_bytes_out = 0
+
+    def start(self):
+        """Startet den Reaper-Thread (idempotent)"""
+        with self._lock:
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap_loop, name='ssh-session-reaper', daemon=True)
+                self._reaper.start()
+
+    # Dict-Schnittstelle
+
+    def __contains__(self, session_id) -> bool:
+        with self._lock:
+            return session_id in self._entries
+
+    def __getitem__(self, session_id: str) -> SSHSession:
+        with self._lock:
+            session = self._entries[session_id].session
+        session.touch()
+        return session
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, session_id: str, default=None) -> Optional[SSHSession]:
+        try:
+            return self[session_id]
+        except KeyError:
+            return default
+
+    def pop(self, session_id: str, default=None) -> Optional[SSHSession]:
+        """Entfernt die Sitzung; schließen muss der Aufrufer"""
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is None:
+                return default
+            self._account(entry.session)
+        return entry.session
+
+    # Sitzungen
+
+    @property
+    def full(self) -> bool:
+        return len(self) >= self.max_sessions
+
+    def add(self, session: SSHSession, host: str = '', username: str = '') -> str:
+        """Registriert eine Sitzung und gibt ihre ID zurück"""
+        with self._lock:
+            if len(self._entries) >= self.max_sessions:
+                raise SSHSessionLimitError(f"Maximum of {self.max_sessions} SSH sessions reached")
+            session_id = str(uuid.uuid4())
+            self._entries[session_id] = _Entry(session, host, username)
+        self.start()
+        return session_id
+
+    def close(self, session_id: str) -> bool:
+        session = self.pop(session_id)
+        if session is None:
+            return False
+        session.close()
+        return True
+
+    def _account(self, session: SSHSession):
+        # Aufrufer hält self._lock
+        self._closed_count += 1
+        self._closed_bytes_in += session.bytes_in
+        self._closed_bytes_out += session.bytes_out
+
+    # Aufräumen
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(SSH_SESSION_REAP_INTERVAL)
+            try:
+                self.reap()
+            except Exception as e:
+                logger.error(f"SSH session reaper failed: {e}")
+
+    def reap(self) -> int:
+        """Schließt ungenutzte und abgebrochene Sitzungen"""
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            expired = {
+                session_id: entry for session_id, entry in self._entries.items()
+                if entry.session.closed or entry.session.last_activity < cutoff
+            }
+            for session_id, entry in expired.items():
+                del self._entries[session_id]
+                self._account(entry.session)
+        for entry in expired.values():
+            entry.session.close()
+            logger.info(f"Closed idle SSH session {entry.username}@{entry.host}")
+        return len(expired)
+
+    # Metriken
+
+    def metrics(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            entries = list(self._entries.items())
+            closed = (self._closed_count, self._closed_bytes_in, self._closed_bytes_out)
+        sessions = [{
+            # Die volle ID ist das Zugangstoken der Sitzung
+            'id': session_id[:8],
+            'host': entry.host,
+            'username': entry.username,
+            'age': round(now - entry.session.created, 1),
+            'idle': round(now - entry.session.last_activity, 1),
+            'bytes_in': entry.session.bytes_in,
+            'bytes_out': entry.session.bytes_out
+        } for session_id, entry in entries]
+        return {
+            'active': len(sessions),
+            'max_sessions': self.max_sessions,
+            'idle_timeout': self.idle_timeout,
+            'closed': closed[0],
+            'bytes_in': closed[1] + sum(s['bytes_in'] for s in sessions),
+            'bytes_out': closed[2] + sum(s['bytes_out'] for s in sessions),
+            'sessions': sessions
+        }
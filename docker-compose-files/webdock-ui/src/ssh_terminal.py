@@ -0,0 +1,320 @@
+"""Interaktive SSH-Shell für das Web-Terminal.
+
+Ein Leser-Thread pro Sitzung liest den Shell-Channel sofort aus und legt die
+Ausgabe in einem begrenzten Puffer ab. Nach jedem Befehl schickt die Shell eine
+Marker-Zeile mit Exit-Code, Benutzer, Host und Verzeichnis; daran wird das Ende
+eines Befehls erkannt, ohne auf eine Pause in der Ausgabe zu warten.
+"""
+import codecs
+import logging
+import os
+import re
+import shlex
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import paramiko
+
+from remote_listing import ListingCache
+from status_stream import STREAM_HEARTBEAT, STREAM_RETRY_MS, format_sse
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_BUFFER_SIZE = int(os.getenv('TERMINAL_BUFFER_SIZE', str(256 * 1024)))
+TERMINAL_COMMAND_TIMEOUT = float(os.getenv('TERMINAL_COMMAND_TIMEOUT', '30'))
+TERMINAL_READ_SIZE = 32768
+
+_MARKER = '__WEBDOCK_DONE__'
+_MARKER_PATTERN = re.compile(r'__WEBDOCK_DONE__ (\w+) (\d+) ([^\n]*)\n')
+# Bracketed-Paste- und Fenstertitel-Sequenzen der interaktiven Shell
+_CONTROL_PATTERN = re.compile(r'\x1b\[\?2004[hl]|\x1b\][^\x07]*\x07|\r')
+# Maximale Länge einer zurückgehaltenen, unvollständigen Marker-Zeile
+_MAX_PENDING = 4096
+_MAX_RESULTS = 100
+# Strg+C vor dem Start des Befehls trifft nur die Shell; dann erneut senden
+_INTERRUPT_ATTEMPTS = 3
+_INTERRUPT_RETRY = 0.5
+
+
+def _marker_command(command_id: str) -> str:
+    # Der Marker wird aus zwei Teilen zusammengesetzt, damit ein Echo der Eingabe ihn nie enthält
+    return (f"printf '%s%s %s %d %s@%s:%s\\n' '__WEBDOCK' '_DONE__' {command_id} $? "
+            '"$(whoami)" "$(hostname)" "$PWD"\n')
+
+
+def _wrap_command(command: str, command_id: str) -> str:
+    """Befehl und Marker als eine Eingabezeile
+
+    Die Shell liest die ganze Zeile, bevor der Befehl läuft; ein Befehl, der von
+    stdin liest, bekommt daher nur spätere Eingaben und nie den Marker. Über eval
+    führt auch ein Syntaxfehler im Befehl noch zum Marker.
+    """
+    return f"eval {shlex.quote(command)}; {_marker_command(command_id)}"
+
+
+def _hold_back(text: str) -> int:
+    """Index, ab dem der Text ein möglicher Marker-Anfang ist"""
+    index = text.find(_MARKER)
+    if index >= 0:
+        return index if len(text) - index < _MAX_PENDING else len(text)
+    for size in range(min(len(_MARKER) - 1, len(text)), 0, -1):
+        if text.endswith(_MARKER[:size]):
+            return len(text) - size
+    return len(text)
+
+
+class SSHSession:
+    """Shell-Channel einer SSH-Verbindung mit Leser-Thread und Ereignispuffer"""
+
+    def __init__(self, client: paramiko.SSHClient, buffer_size: int = TERMINAL_BUFFER_SIZE):
+        self.client = client
+        self.buffer_size = buffer_size
+        # Serialisiert das Senden von Befehlen auf dem gemeinsamen Shell-Channel
+        self.lock = threading.Lock()
+        self.info = {'username': '', 'hostname': '', 'pwd': '~'}
+        self.closed = False
+        self.created = time.monotonic()
+        # Letzte Ein- oder Ausgabe, für das Aufräumen ungenutzter Sitzungen
+        self.last_activity = self.created
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._events: Deque[Dict[str, Any]] = deque()
+        self._size = 0
+        self._next_id = 1
+        self._results: Dict[str, Dict[str, Any]] = {}
+        # Zuletzt beendeter Befehl; die Shell führt immer nur einen aus
+        self._last_done: Optional[str] = None
+        self._pending = ''
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._changed = threading.Condition()
+        # SFTP-Client des Datei-Explorers, wird beim ersten Zugriff geöffnet
+        self._sftp: Optional[paramiko.SFTPClient] = None
+        self._sftp_lock = threading.Lock()
+        self.listings = ListingCache()
+
+        self.channel = client.invoke_shell(term='xterm')
+        self._reader = threading.Thread(target=self._read_loop, name='ssh-terminal', daemon=True)
+        self._reader.start()
+
+        # Ohne Prompt, Echo und Zeileneditor bleibt nur die Ausgabe übrig. Das Abschalten des
+        # Zeileneditors verwirft den Rest der Eingabezeile, daher kommt der Marker erst danach.
+        self.send_input("export TERM=xterm PS1='' PS2=''; stty -echo; set +o vi +o emacs\n")
+        result = self.execute(':')
+        if not result['complete']:
+            logger.warning("Shell initialisation did not finish in time")
+        with self._changed:
+            # Banner und Echo der Initialisierung verwerfen
+            self._events.clear()
+            self._size = 0
+
+    # Lesen
+
+    def _read_loop(self):
+        try:
+            while True:
+                data = self.channel.recv(TERMINAL_READ_SIZE)
+                if not data:
+                    break
+                self.bytes_in += len(data)
+                self.last_activity = time.monotonic()
+                self._feed(self._decoder.decode(data))
+        except Exception as e:
+            if not self.closed:
+                logger.warning(f"SSH terminal read failed: {e}")
+        finally:
+            with self._changed:
+                if self._pending:
+                    self._append({'type': 'output', 'data': self._pending})
+                    self._pending = ''
+                self.closed = True
+                self._changed.notify_all()
+
+    def _feed(self, text: str):
+        text = self._pending + _CONTROL_PATTERN.sub('', text)
+        with self._changed:
+            position = 0
+            for match in _MARKER_PATTERN.finditer(text):
+                if match.start() > position:
+                    self._append({'type': 'output', 'data': text[position:match.start()]})
+                command_id, exit_code, info = match.groups()
+                username, _, rest = info.partition('@')
+                hostname, _, pwd = rest.partition(':')
+                self.info = {'username': username, 'hostname': hostname, 'pwd': pwd}
+                done = dict(self.info, type='done', command=command_id, exit_code=int(exit_code))
+                self._append(done)
+                self._results[command_id] = done
+                self._last_done = command_id
+                while len(self._results) > _MAX_RESULTS:
+                    self._results.pop(next(iter(self._results)))
+                position = match.end()
+            rest = text[position:]
+            hold = _hold_back(rest)
+            if hold:
+                self._append({'type': 'output', 'data': rest[:hold]})
+            self._pending = rest[hold:]
+            self._changed.notify_all()
+
+    def _append(self, event: Dict[str, Any]):
+        # Aufrufer hält self._changed
+        event['id'] = self._next_id
+        self._next_id += 1
+        self._events.append(event)
+        self._size += len(event.get('data', ''))
+        while self._size > self.buffer_size and len(self._events) > 1:
+            self._size -= len(self._events.popleft().get('data', ''))
+
+    # Befehle
+
+    @property
+    def cursor(self) -> int:
+        """ID des zuletzt gepufferten Ereignisses"""
+        with self._changed:
+            return self._next_id - 1
+
+    def send_command(self, command: str) -> Tuple[str, int]:
+        """Schickt einen Befehl samt Marker; gibt (Befehls-ID, Cursor davor) zurück"""
+        command_id = uuid.uuid4().hex[:12]
+        with self.lock:
+            cursor = self.cursor
+            self._send(_wrap_command(command, command_id))
+        return command_id, cursor
+
+    def send_input(self, data: str):
+        """Rohe Eingabe an einen laufenden Befehl"""
+        with self.lock:
+            self._send(data)
+
+    def interrupt(self, command_id: str):
+        """Strg+C; das TTY verwirft dabei die wartende Marker-Zeile, daher neu senden
+
+        Kommt Strg+C, bevor der Befehl im Vordergrund läuft, fängt es die Shell ab
+        und der Befehl liest den Marker; bis zum Ende des Befehls wird wiederholt.
+        Eine wartende Shell verliert das erste Zeichen nach Strg+C, daher das Leerzeichen.
+        """
+        for _ in range(_INTERRUPT_ATTEMPTS):
+            with self.lock:
+                self._send(f"\x03 {_marker_command(command_id)}")
+            with self._changed:
+                if self._changed.wait_for(lambda: self._last_done == command_id or self.closed,
+                                          timeout=_INTERRUPT_RETRY):
+                    return
+
+    def _send(self, data: str):
+        # Aufrufer hält self.lock
+        payload = data.encode()
+        self.channel.sendall(payload)
+        self.bytes_out += len(payload)
+        self.last_activity = time.monotonic()
+
+    def wait_for(self, command_id: str, timeout: float = TERMINAL_COMMAND_TIMEOUT) -> Optional[Dict[str, Any]]:
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while command_id not in self._results:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self.closed:
+                    return None
+                self._changed.wait(remaining)
+            return self._results.pop(command_id)
+
+    def events_since(self, after: int, timeout: float = 0) -> List[Dict[str, Any]]:
+        """Ereignisse nach `after`; wartet höchstens `timeout` Sekunden auf neue"""
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while self._next_id - 1 <= after and not self.closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            return [event for event in self._events if event['id'] > after]
+
+    def execute(self, command: str, timeout: float = TERMINAL_COMMAND_TIMEOUT) -> Dict[str, Any]:
+        """Führt einen Befehl aus und wartet auf seinen Marker"""
+        command_id, cursor = self.send_command(command)
+        done = self.wait_for(command_id, timeout)
+        output = []
+        for event in self.events_since(cursor):
+            if event['type'] == 'output':
+                output.append(event['data'])
+            elif event.get('command') == command_id:
+                break
+        return dict(self.info, output=''.join(output), complete=done is not None,
+                    exit_code=done['exit_code'] if done else None)
+
+    def stream(self, after: int, command_id: Optional[str] = None,
+               heartbeat: float = STREAM_HEARTBEAT) -> Iterator[str]:
+        """SSE-Generator für die Ausgabe; endet mit dem Marker von `command_id`"""
+        yield f'retry: {STREAM_RETRY_MS}\n\n'
+        while True:
+            events = self.events_since(after, timeout=heartbeat)
+            if not events:
+                if self.closed:
+                    yield format_sse('closed', {})
+                    return
+                # Ein offener Stream hält die Sitzung am Leben
+                self.touch()
+                yield ': heartbeat\n\n'
+                continue
+            if events[0]['id'] > after + 1:
+                yield format_sse('truncated', {'missing': events[0]['id'] - after - 1})
+            for event in events:
+                after = event['id']
+                if event['type'] == 'output':
+                    yield format_sse('output', {'data': event['data']}, after)
+                else:
+                    done = {key: value for key, value in event.items() if key not in ('id', 'type')}
+                    yield format_sse('done', done, after)
+                    if event['command'] == command_id:
+                        return
+
+    # Dateien
+
+    def sftp(self) -> paramiko.SFTPClient:
+        """SFTP-Client der Sitzung; wird wiederverwendet, solange sein Channel lebt"""
+        with self._sftp_lock:
+            if self._sftp is not None and not _sftp_alive(self._sftp):
+                _close_quietly(self._sftp)
+                self._sftp = None
+            if self._sftp is None:
+                if self.closed:
+                    raise paramiko.SSHException('SSH session is closed')
+                self._sftp = self.client.open_sftp()
+            self.touch()
+            return self._sftp
+
+    def reset_sftp(self):
+        """Verwirft den SFTP-Client nach einem Verbindungsfehler"""
+        with self._sftp_lock:
+            sftp, self._sftp = self._sftp, None
+        if sftp is not None:
+            _close_quietly(sftp)
+
+    def touch(self):
+        self.last_activity = time.monotonic()
+
+    def close(self):
+        """Schließt SFTP, Channel und Verbindung; der Leser-Thread endet damit"""
+        self.closed = True
+        self.reset_sftp()
+        for resource in (self.channel, self.client):
+            try:
+                resource.close()
+            except Exception:
+                pass
+
+
+def _sftp_alive(sftp: paramiko.SFTPClient) -> bool:
+    channel = sftp.get_channel()
+    if channel is None or channel.closed or channel.eof_received:
+        return False
+    transport = channel.get_transport()
+    return transport is not None and transport.is_active()
+
+
+def _close_quietly(resource):
+    try:
+        resource.close()
+    except Exception:
+        pass
@@ -0,0 +1,78 @@
+"""Aktualisierung mehrerer Compose-Stacks in einem Durchlauf.
+
+Die Images werden parallel (begrenzt durch UPDATE_CONCURRENCY) gezogen, während
+die alten Container weiterlaufen. Erst nach einem erfolgreichen Pull wird der
+jeweilige Stack mit `up -d` neu erstellt; Compose ersetzt dabei nur Container
+deren Image sich geändert hat.
+"""
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from jobs import JobContext
+
+logger = logging.getLogger(__name__)
+
+UPDATE_CONCURRENCY = int(os.getenv('UPDATE_CONCURRENCY', '4'))
+
+
+def compose_file_for(data_dir: str, stack: str) -> str:
+    return os.path.join(data_dir, stack, 'docker-compose.yml')
+
+
+def installed_stacks(data_dir: str) -> List[str]:
+    """Alle Stacks unter `data_dir` mit einer docker-compose.yml"""
+    if not os.path.isdir(data_dir):
+        return []
+    return sorted(
+        entry for entry in os.listdir(data_dir)
+        if os.path.isfile(compose_file_for(data_dir, entry))
+    )
+
+
+def _update_stack(ctx: JobContext, data_dir: str, stack: str) -> Dict[str, Any]:
+    compose_cmd = ['docker', 'compose', '-f', compose_file_for(data_dir, stack)]
+    result: Dict[str, Any] = {'status': 'failed', 'pull_seconds': None, 'up_seconds': None, 'error': None}
+    try:
+        # Nie gleichzeitig mit Restart, Toggle oder Update desselben Stacks
+        with ctx.exclusive(stack):
+            with ctx.step(f'{stack}: pull'):
+                started = time.monotonic()
+                ctx.run(compose_cmd + ['pull'], prefix=stack)
+                result['pull_seconds'] = round(time.monotonic() - started, 2)
+            # Nur nach erfolgreichem Pull neu erstellen
+            with ctx.step(f'{stack}: up'):
+                started = time.monotonic()
+                ctx.run(compose_cmd + ['up', '-d'], prefix=stack)
+                result['up_seconds'] = round(time.monotonic() - started, 2)
+        result['status'] = 'succeeded'
+    except Exception as e:
+        logger.error(f"Error updating stack {stack}: {str(e)}")
+        result['error'] = str(e)
+    return result
+
+
+def update_stacks(ctx: JobContext, data_dir: str, stacks: List[str],
+                  concurrency: int = UPDATE_CONCURRENCY) -> Dict[str, Any]:
+    """Aktualisiert die Stacks parallel und liefert das Ergebnis pro Stack (läuft als Job)"""
+    started = time.monotonic()
+    concurrency = max(1, min(concurrency, len(stacks) or 1))
+    ctx.log(f"Updating {len(stacks)} stacks with concurrency {concurrency}")
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='stack-update') as pool:
+        results = dict(zip(stacks, pool.map(lambda stack: _update_stack(ctx, data_dir, stack), stacks)))
+
+    failed = [stack for stack, result in results.items() if result['status'] != 'succeeded']
+    duration = round(time.monotonic() - started, 2)
+    message = f"Updated {len(stacks) - len(failed)} of {len(stacks)} stacks in {duration}s"
+    if failed:
+        message += f" (failed: {', '.join(failed)})"
+    return {
+        'message': message,
+        'stacks': results,
+        'failed': failed,
+        'concurrency': concurrency,
+        'duration': duration
+    }
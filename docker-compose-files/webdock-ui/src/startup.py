@@ -0,0 +1,134 @@
+"""Startphasen mit Zeitmessung und Readiness.
+
+Langsame Schritte beim Start (Katalog-Sync, Kategorien, Cache-Warm-up) laufen
+parallel im Hintergrund, damit der Server sofort Anfragen annimmt. Jede Phase
+wird mit Dauer und Ergebnis erfasst; die App ist bereit, sobald alle
+erforderlichen Phasen erfolgreich abgeschlossen sind.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class _Phase:
+    def __init__(self, name: str, fn: Optional[Callable[[], Any]], required: bool):
+        self.name = name
+        self.fn = fn
+        self.required = required
+        self.status = PENDING
+        self.started: Optional[float] = None
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'status': self.status,
+            'required': self.required,
+            'duration': self.duration,
+            'error': self.error
+        }
+
+
+class StartupTasks:
+    """Führt Startphasen im Hintergrund aus und meldet den Readiness-Zustand"""
+
+    def __init__(self):
+        self.created = time.monotonic()
+        self._phases: List[_Phase] = []
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._started = False
+
+    def add(self, name: str, fn: Callable[[], Any], required: bool = True):
+        """Registriert eine Phase; nicht erforderliche Phasen blockieren die Readiness nicht"""
+        with self._lock:
+            self._phases.append(_Phase(name, fn, required))
+
+    @contextmanager
+    def phase(self, name: str, required: bool = True):
+        """Misst eine synchron ausgeführte Phase"""
+        phase = _Phase(name, None, required)
+        with self._lock:
+            self._phases.append(phase)
+        self._begin(phase)
+        try:
+            yield
+        except Exception as e:
+            self._end(phase, e)
+            raise
+        else:
+            self._end(phase)
+
+    def start(self):
+        """Startet alle noch ausstehenden Phasen parallel (idempotent)"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            pending = [p for p in self._phases if p.status == PENDING and p.fn is not None]
+        for phase in pending:
+            threading.Thread(target=self._run, args=(phase,), name=f'startup-{phase.name}', daemon=True).start()
+        self._check_ready()
+
+    def _run(self, phase: _Phase):
+        self._begin(phase)
+        try:
+            phase.fn()
+        except Exception as e:
+            self._end(phase, e)
+        else:
+            self._end(phase)
+
+    def _begin(self, phase: _Phase):
+        with self._lock:
+            phase.status = RUNNING
+            phase.started = time.monotonic()
+
+    def _end(self, phase: _Phase, error: Optional[Exception] = None):
+        with self._lock:
+            phase.duration = round(time.monotonic() - phase.started, 3)
+            if error is None:
+                phase.status = DONE
+            else:
+                phase.status = FAILED
+                phase.error = str(error)
+        if error is None:
+            logger.info(f"Startup phase '{phase.name}' finished in {phase.duration}s")
+        else:
+            logger.error(f"Startup phase '{phase.name}' failed after {phase.duration}s: {error}")
+        self._check_ready()
+
+    def _check_ready(self):
+        with self._lock:
+            if not self._started or self._ready.is_set():
+                return
+            if not all(p.status == DONE for p in self._phases if p.required):
+                return
+            self._ready.set()
+        logger.info(f"Application ready after {round(time.monotonic() - self.created, 3)}s")
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            phases = [p.to_dict() for p in self._phases]
+        return {
+            'ready': self.ready,
+            'uptime': round(time.monotonic() - self.created, 3),
+            'phases': phases
+        }
@@ -11,7 +11,11 @@ function closeModal() { const modal = document.querySelector('.modal'); if (moda
 // Globale Variablen am Anfang der Datei
 let sshConnection = null;
 let currentPath = '/';
+// Cursor der nächsten Seite im Datei-Explorer
+let fileListCursor = null;
 let currentCommand = '';
+// ID des Befehls, dessen Ausgabe gerade gestreamt wird
+let runningCommand = null;
 let terminalContent = null;  // Wird später definiert
 let commandHistory = [];  // Neu: Global definiert
 let historyIndex = -1;   // Neu: Global definiert
@@ -225,28 +229,88 @@ document.addEventListener('DOMContentLoaded', function() {
     });
 
     // System Status Updates
+    function renderSystemStatus(data) {
+        // CPU Usage
+        const cpuGauge = document.querySelector('#cpu-gauge');
+        cpuGauge.style.setProperty('--percentage', `${data.cpu}%`);
+        document.querySelector('#cpu-value').textContent = `${data.cpu}%`;
+
+        // Memory Usage
+        const memGauge = document.querySelector('#memory-gauge');
+        memGauge.style.setProperty('--percentage', `${data.memory}%`);
+        document.querySelector('#memory-value').textContent = `${data.memory}%`;
+
+        // Disk Usage
+        const diskGauge = document.querySelector('#disk-gauge');
+        diskGauge.style.setProperty('--percentage', `${data.disk}%`);
+        document.querySelector('#disk-value').textContent = `${data.disk}%`;
+    }
+
     function updateSystemStatus() {
         fetch('/api/system/status')
             .then(response => response.json())
-            .then(data => {
-                // CPU Usage
-                const cpuGauge = document.querySelector('#cpu-gauge');
-                cpuGauge.style.setProperty('--percentage', `${data.cpu}%`);
-                document.querySelector('#cpu-value').textContent = `${data.cpu}%`;
-
-                // Memory Usage
-                const memGauge = document.querySelector('#memory-gauge');
-                memGauge.style.setProperty('--percentage', `${data.memory}%`);
-                document.querySelector('#memory-value').textContent = `${data.memory}%`;
-
-                // Disk Usage
-                const diskGauge = document.querySelector('#disk-gauge');
-                diskGauge.style.setProperty('--percentage', `${data.disk}%`);
-                document.querySelector('#disk-value').textContent = `${data.disk}%`;
-            })
+            .then(renderSystemStatus)
             .catch(error => console.error('Error updating system status:', error));
     }
 
+    // Live-Status über Server-Sent Events (ersetzt das Polling solange verbunden)
+    let statusStreamConnected = false;
+    function connectStatusStream() {
+        if (!window.EventSource) return;
+
+        const source = new EventSource('/api/stream');
+
+        source.addEventListener('open', () => { statusStreamConnected = true; });
+        source.addEventListener('error', () => { statusStreamConnected = false; });
+        source.addEventListener('snapshot', event => {
+            const data = JSON.parse(event.data);
+            if (data.system) renderSystemStatus(data.system);
+        });
+        source.addEventListener('system', event => renderSystemStatus(JSON.parse(event.data)));
+        source.addEventListener('containers', event => applyContainerDiff(JSON.parse(event.data)));
+    }
+
+    // Übernimmt geänderte Container-Zustände direkt ins DOM, ohne die Listen neu zu laden
+    function applyContainerDiff(diff) {
+        let missingHealthCard = false;
+        const findCard = (selector, name) => Array.from(document.querySelectorAll(selector))
+            .find(card => card.querySelector('h3') && card.querySelector('h3').textContent.trim() === name);
+
+        const applyState = (name, state, health) => {
+            const card = findCard('.container-card', name);
+            if (card) {
+                const status = state === 'running' ? 'running' : 'stopped';
+                const indicator = card.querySelector('.status-indicator');
+                if (indicator) indicator.className = `status-indicator ${status}`;
+                const button = card.querySelector('.status-btn');
+                if (button) {
+                    button.className = `status-btn ${status}`;
+                    button.textContent = status === 'running' ? 'Stop' : 'Start';
+                }
+            }
+
+            const healthCard = findCard('#container-health .health-card', name);
+            if (!healthCard) {
+                // Neuer Container: Uptime, Speicher und CPU gibt es nur über die Health-API
+                if (state) missingHealthCard = true;
+                return;
+            }
+            if (!state) {
+                healthCard.remove();
+                return;
+            }
+            // Ein Healthcheck-Ergebnis ist aussagekräftiger als der reine Zustand
+            const label = health || state;
+            const healthStatus = healthCard.querySelector('.health-status');
+            healthStatus.className = `health-status ${label}`;
+            healthStatus.innerHTML = `<i class="fa fa-${label === 'healthy' ? 'check' : 'warning'}"></i> ${label}`;
+        };
+
+        Object.entries(diff.changed || {}).forEach(([name, data]) => applyState(name, data.state, data.health));
+        (diff.removed || []).forEach(name => applyState(name, null));
+        if (missingHealthCard) updateContainerHealth();
+    }
+
     // Container Health Updates
     function updateContainerHealth() {
         fetch('/api/containers/health')
@@ -306,14 +370,33 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     // Aktualisiere die Log-Anzeige Funktion
+    // Cursor des zuletzt geladenen Log-Eintrags; danach werden nur neue Einträge geholt
+    let systemLogsCursor = null;
+    const MAX_SYSTEM_LOG_ENTRIES = 200;
+
     function updateSystemLogs() {
-        fetch('/api/system/logs')
+        const url = systemLogsCursor === null
+            ? '/api/system/logs'
+            : `/api/system/logs?after=${systemLogsCursor}`;
+        fetch(url)
             .then(response => response.json())
-            .then(logs => {
+            .then(data => {
                 const logsContainer = document.getElementById('system-logs');
-                if (!logsContainer) return;
+                if (!logsContainer || !Array.isArray(data.entries)) return;
+                
+                // Der Speicher wurde zurückgesetzt (Cursor liegt in der Zukunft)
+                if (systemLogsCursor !== null && data.cursor < systemLogsCursor) {
+                    systemLogsCursor = null;
+                    logsContainer.innerHTML = '';
+                    return updateSystemLogs();
+                }
+                if (systemLogsCursor === null) {
+                    logsContainer.innerHTML = '';
+                }
+                systemLogsCursor = data.cursor;
+                if (data.entries.length === 0) return;
                 
-                logsContainer.innerHTML = logs.map(log => {
+                logsContainer.insertAdjacentHTML('beforeend', data.entries.map(log => {
                     const levelClass = log.level.toLowerCase();
                     const sourceIcon = {
                         'webdock-ui': 'fa-desktop',
@@ -330,7 +413,11 @@ document.addEventListener('DOMContentLoaded', function() {
                             <span class="log-message">${log.message}</span>
                         </div>
                     `;
-                }).join('');
+                }).join(''));
+                
+                while (logsContainer.children.length > MAX_SYSTEM_LOG_ENTRIES) {
+                    logsContainer.removeChild(logsContainer.firstElementChild);
+                }
                 
                 // Scrolle zum neuesten Log
                 logsContainer.scrollTop = logsContainer.scrollHeight;
@@ -390,7 +477,11 @@ document.addEventListener('DOMContentLoaded', function() {
         if (window.statusInterval) clearInterval(window.statusInterval);
         if (autoUpdate.checked) {
             window.statusInterval = setInterval(() => {
-                updateSystemStatus();
+                // Solange der Stream verbunden ist, kommen Status und Container-Änderungen per Push
+                if (!statusStreamConnected) {
+                    updateSystemStatus();
+                }
+                // Uptime & Co. der Health-Karten liefert nur die Health-API
                 updateContainerHealth();
                 updateSystemLogs();
             }, interval);
@@ -402,6 +493,7 @@ document.addEventListener('DOMContentLoaded', function() {
     updateContainerHealth();
     updateSystemLogs();
     setupRefreshInterval();
+    connectStatusStream();
 
     // Gauge Chart Drawing
     function updateGaugeChart(elementId, value) {
@@ -1594,12 +1686,18 @@ log_dest file /mosquitto/log/mosquitto.log
 
         const result = await response.json();
 
-        if (result.status === 'success') {
+        if (!result.job_id) {
+            throw new Error(result.message || result.error || 'Installation failed');
+        }
+
+        // Warte auf den Installations-Job
+        const job = await waitForJob(result.job_id);
+        if (job.status === 'succeeded') {
             showNotification('success', `${containerName} installed successfully`);
             closeModal();
             updateContainerStatus(true);
         } else {
-            throw new Error(result.message || 'Installation failed');
+            throw new Error(job.message || 'Installation failed');
         }
 
     } catch (error) {
@@ -1620,6 +1718,47 @@ log_dest file /mosquitto/log/mosquitto.log
     }
 }
 
+// Wartet bis ein Hintergrund-Job abgeschlossen ist (SSE, sonst Polling)
+function waitForJob(jobId, onOutput) {
+    return new Promise((resolve, reject) => {
+        const poll = () => {
+            fetch(`/api/jobs/${jobId}`)
+                .then(response => response.json())
+                .then(job => {
+                    if (job.status === 'succeeded' || job.status === 'failed') {
+                        resolve(job);
+                    } else if (job.status === 'error') {
+                        reject(new Error(job.message));
+                    } else {
+                        setTimeout(poll, 1000);
+                    }
+                })
+                .catch(reject);
+        };
+
+        if (typeof EventSource === 'undefined') {
+            poll();
+            return;
+        }
+
+        const source = new EventSource(`/api/jobs/${jobId}/stream`);
+        source.addEventListener('output', event => {
+            if (onOutput) {
+                JSON.parse(event.data).lines.forEach(line => onOutput(line));
+            }
+        });
+        source.addEventListener('done', event => {
+            source.close();
+            resolve(JSON.parse(event.data));
+        });
+        source.onerror = () => {
+            // Verbindung verloren: auf Polling umschalten
+            source.close();
+            poll();
+        };
+    });
+}
+
 // Modifizierte Toggle-Funktion
 function toggleContainer(name) {
     if (!name) {
@@ -1641,11 +1780,17 @@ function toggleContainer(name) {
         return response.json();
     })
     .then(data => {
-        if (data.status === 'success') {
+        if (!data.job_id) {
+            throw new Error(data.message || 'Toggle failed');
+        }
+        return waitForJob(data.job_id);
+    })
+    .then(job => {
+        if (job.status === 'succeeded') {
             updateContainerStatus(true);
-            showNotification('success', data.message);
+            showNotification('success', job.message);
         } else {
-            throw new Error(data.message || 'Toggle failed');
+            throw new Error(job.message || 'Toggle failed');
         }
     })
     .catch(error => {
@@ -1669,12 +1814,18 @@ function updateContainer(name) {
     })
     .then(response => response.json())
     .then(data => {
-        if (data.status === 'success') {
-            showNotification('success', data.message);
+        if (!data.job_id) {
+            throw new Error(data.message);
+        }
+        return waitForJob(data.job_id);
+    })
+    .then(job => {
+        if (job.status === 'succeeded') {
+            showNotification('success', job.message);
             // Aktualisiere Container-Status
             updateContainerStatus();
         } else {
-            showNotification('error', data.message);
+            showNotification('error', job.message);
         }
     })
     .catch(error => {
@@ -1955,8 +2106,14 @@ async function saveSettings(containerName) {
                 method: 'POST'
             });
             
-            if (restartResponse.ok) {
-                showNotification('success', 'Container restarted successfully');
+            const restartData = await restartResponse.json();
+            if (restartData.job_id) {
+                const job = await waitForJob(restartData.job_id);
+                if (job.status === 'succeeded') {
+                    showNotification('success', 'Container restarted successfully');
+                } else {
+                    showNotification('error', job.message || 'Restart failed');
+                }
             }
             
             closeModal();
@@ -2070,11 +2227,64 @@ function initializeTerminal() {
         document.getElementById('terminal').scrollTop = document.getElementById('terminal').scrollHeight;
     };
     
+    // Liest die Ausgabe eines gestarteten Befehls per SSE, bis sein Marker kommt
+    function streamCommandOutput(commandId, cursor) {
+        return new Promise(resolve => {
+            const params = new URLSearchParams({ connection: sshConnection, after: cursor, command: commandId });
+            const source = new EventSource(`/api/terminal/stream?${params}`);
+            let output = null;
+            runningCommand = commandId;
+            
+            const finish = () => {
+                source.close();
+                runningCommand = null;
+                resolve();
+            };
+            
+            source.addEventListener('output', (e) => {
+                if (!output) {
+                    output = document.createElement('div');
+                    output.className = 'terminal-output';
+                    terminalContent.appendChild(output);
+                }
+                output.textContent += JSON.parse(e.data).data;
+                document.getElementById('terminal').scrollTop = document.getElementById('terminal').scrollHeight;
+            });
+            source.addEventListener('done', (e) => {
+                const data = JSON.parse(e.data);
+                if (data.command !== commandId) return;
+                if (output) {
+                    output.textContent = output.textContent.replace(/\n$/, '');
+                }
+                window.terminalInfo = {
+                    username: data.username,
+                    hostname: data.hostname,
+                    pwd: data.pwd
+                };
+                finish();
+            });
+            source.addEventListener('closed', finish);
+            source.onerror = () => {
+                // Der Browser verbindet sich selbst neu; nur bei endgültigem Abbruch beenden
+                if (source.readyState === EventSource.CLOSED) finish();
+            };
+        });
+    }
+    
+    // Eingabe für den laufenden Befehl (read, Passwortabfragen, cat ...)
+    function sendTerminalInput(text) {
+        return fetch('/api/terminal/input', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ connection: sshConnection, data: text })
+        });
+    }
+    
     async function executeCommand(command) {
         if (!command.trim()) return;
         
         try {
-            const response = await fetch('/api/execute', {
+            const response = await fetch(window.EventSource ? '/api/terminal/command' : '/api/execute', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({ command, connection: sshConnection })
@@ -2083,6 +2293,8 @@ function initializeTerminal() {
             const data = await response.json();
             if (data.status === 'editor') {
                 showFileEditor(data.path);
+            } else if (data.status === 'accepted') {
+                await streamCommandOutput(data.command_id, data.cursor);
             } else if (data.status === 'success') {
                 // Nur die Ausgabe anzeigen
                 if (data.output && data.output.trim()) {
@@ -2125,10 +2337,26 @@ function initializeTerminal() {
     });
     
     hiddenInput.addEventListener('keydown', async (e) => {
+        // Strg+C bricht den laufenden Befehl ab
+        if (e.ctrlKey && e.key === 'c' && runningCommand) {
+            e.preventDefault();
+            fetch('/api/terminal/input', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ connection: sshConnection, interrupt: true, command: runningCommand })
+            });
+            return;
+        }
         switch(e.key) {
             case 'Enter':
                 e.preventDefault();
-                if (currentCommand) {
+                if (runningCommand) {
+                    // Läuft noch ein Befehl, geht die Zeile an dessen stdin und nicht in die History
+                    sendTerminalInput(currentCommand + '\n');
+                    currentCommand = '';
+                    hiddenInput.value = '';
+                    updateDisplay();
+                } else if (currentCommand) {
                     // Speichere Befehl in History
                     commandHistory.push(currentCommand);
                     historyIndex = commandHistory.length;
@@ -2357,22 +2585,25 @@ function showHistoryDropdown() {
     terminalContent.appendChild(dropdown);
 } 
 
-async function loadFileList(path = '/') {
+async function loadFileList(path = '/', cursor = null) {
     try {
         const response = await fetch('/api/files', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ 
                 connection: sshConnection,
-                path: path 
+                path: path,
+                cursor: cursor
             })
         });
         
         const data = await response.json();
         if (data.status === 'success') {
             currentPath = path;
-            updateFileExplorer(data.files);
-            updatePathBreadcrumbs(path);
+            fileListCursor = data.cursor;
+            // Weitere Seiten werden an die Liste angehängt
+            updateFileExplorer(data.files, cursor !== null);
+            if (cursor === null) updatePathBreadcrumbs(path);
         } else {
             throw new Error(data.message);
         }
@@ -2381,9 +2612,13 @@ async function loadFileList(path = '/') {
     }
 }
 
-function updateFileExplorer(files) {
+function updateFileExplorer(files, append = false) {
     const fileList = document.querySelector('.file-list');
-    fileList.innerHTML = '';
+    if (append) {
+        fileList.querySelector('.file-load-more')?.remove();
+    } else {
+        fileList.innerHTML = '';
+    }
     
     files.forEach(file => {
         const item = document.createElement('div');
@@ -2409,6 +2644,14 @@ function updateFileExplorer(files) {
         
         fileList.appendChild(item);
     });
+    
+    if (fileListCursor) {
+        const more = document.createElement('div');
+        more.className = 'file-item file-load-more';
+        more.innerHTML = '<i class="fa fa-ellipsis-h"></i><span>Load more</span>';
+        more.addEventListener('click', () => loadFileList(currentPath, fileListCursor));
+        fileList.appendChild(more);
+    }
 }
 
 function updatePathBreadcrumbs(path) {
@@ -2455,6 +2698,77 @@ function navigateUp() {
     loadFileList(parentPath);
 }
 
+const UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024;
+const UPLOAD_RETRIES = 3;
+
+// SHA-256 eines Blocks als Hex; crypto.subtle gibt es nur über HTTPS oder localhost
+async function chunkDigest(buffer) {
+    if (!window.crypto || !window.crypto.subtle) return null;
+    const hash = await window.crypto.subtle.digest('SHA-256', buffer);
+    return Array.from(new Uint8Array(hash)).map(b => b.toString(16).padStart(2, '0')).join('');
+}
+
+// Lädt eine Datei in Blöcken hoch und setzt nach Abbrüchen am Stand des Servers fort.
+// Name, Größe und Änderungszeit bestimmen, welcher Upload fortgesetzt wird.
+async function uploadResumable(file, path) {
+    const params = new URLSearchParams({
+        connection: sshConnection,
+        path: path,
+        name: file.name,
+        size: file.size,
+        modified: file.lastModified
+    });
+    const resume = await fetch(`/api/upload/stream?${params}`);
+    let offset = (await resume.json()).offset || 0;
+    let retries = 0;
+    
+    while (offset < file.size) {
+        const chunk = await file.slice(offset, offset + UPLOAD_CHUNK_SIZE).arrayBuffer();
+        const headers = { 'Content-Type': 'application/octet-stream' };
+        const digest = await chunkDigest(chunk);
+        if (digest) headers['X-Content-SHA256'] = digest;
+        params.set('offset', offset);
+        try {
+            const response = await fetch(`/api/upload/stream?${params}`, {
+                method: 'PUT',
+                headers: headers,
+                body: chunk
+            });
+            const data = await response.json();
+            if (response.status === 409 || response.status === 422) {
+                // Anderer Stand beim Server oder beschädigter Block: dort weitermachen
+                if (++retries > UPLOAD_RETRIES) throw new Error(data.message);
+                offset = data.offset;
+                continue;
+            }
+            if (data.status !== 'success') {
+                throw new Error(data.message);
+            }
+            offset = data.offset;
+            retries = 0;
+        } catch (error) {
+            if (++retries > UPLOAD_RETRIES) throw error;
+            // Stand beim Server erfragen und dort fortsetzen
+            params.delete('offset');
+            const state = await fetch(`/api/upload/stream?${params}`);
+            offset = (await state.json()).offset || 0;
+        }
+    }
+    
+    const response = await fetch('/api/upload/complete', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+            connection: sshConnection,
+            path: path,
+            name: file.name,
+            size: file.size,
+            modified: file.lastModified
+        })
+    });
+    return response.json();
+}
+
 async function uploadFile() {
     const input = document.createElement('input');
     input.type = 'file';
@@ -2463,21 +2777,7 @@ async function uploadFile() {
     input.onchange = async function() {
         for (const file of this.files) {
             try {
-                const formData = new FormData();
-                formData.append('file', file);
-                formData.append('path', currentPath);
-                formData.append('connection', sshConnection);
-                
-                const response = await fetch('/api/upload', {
-                    method: 'POST',
-                    body: formData
-                });
-                
-                if (!response.ok) {
-                    throw new Error(`HTTP error! status: ${response.status}`);
-                }
-                
-                const data = await response.json();
+                const data = await uploadResumable(file, currentPath);
                 if (data.status === 'success') {
                     showNotification('success', `Uploaded ${file.name}`);
                 } else {
@@ -2496,33 +2796,15 @@ async function uploadFile() {
     input.click();
 }
 
-async function downloadFile(path) {
-    try {
-        const response = await fetch('/api/download', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ 
-                connection: sshConnection,
-                path: path 
-            })
-        });
-        
-        if (response.ok) {
-            const blob = await response.blob();
-            const url = window.URL.createObjectURL(blob);
-            const a = document.createElement('a');
-            a.href = url;
-            a.download = path.split('/').pop();
-            document.body.appendChild(a);
-            a.click();
-            document.body.removeChild(a);
-            window.URL.revokeObjectURL(url);
-        } else {
-            throw new Error('Download failed');
-        }
-    } catch (error) {
-        showNotification('error', `Failed to download file: ${error.message}`);
-    }
+function downloadFile(path) {
+    // Der Browser lädt direkt vom Stream, ohne die Datei im Speicher zu puffern
+    const params = new URLSearchParams({ connection: sshConnection, path: path, download: 1 });
+    const a = document.createElement('a');
+    a.href = `/api/file/download?${params}`;
+    a.download = path.split('/').pop();
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
 }
 
 async function deleteFile(path) {
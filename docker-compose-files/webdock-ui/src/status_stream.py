@@ -0,0 +1,161 @@
+"""Server-Sent-Events für Live-Container- und Systemstatus.
+
+Ein einzelner Producer-Thread beobachtet den Container-Index und die Systemwerte
+und verteilt nur Änderungen an alle verbundenen Clients. Die Backend-Last bleibt
+damit unabhängig von der Anzahl offener Tabs.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from container_index import ContainerIndex
+
+logger = logging.getLogger(__name__)
+
+STREAM_HEARTBEAT = float(os.getenv('STREAM_HEARTBEAT', '15'))
+STREAM_SYSTEM_INTERVAL = float(os.getenv('STREAM_SYSTEM_INTERVAL', '5'))
+STREAM_QUEUE_SIZE = int(os.getenv('STREAM_QUEUE_SIZE', '64'))
+STREAM_RETRY_MS = 3000
+
+
+def format_sse(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """Formatiert eine SSE-Nachricht"""
+    message = ''
+    if event_id is not None:
+        message += f'id: {event_id}\n'
+    message += f'event: {event}\n'
+    message += f'data: {json.dumps(data, separators=(",", ":"))}\n\n'
+    return message
+
+
+class _Subscriber:
+    def __init__(self, size: int):
+        self.queue: queue.Queue = queue.Queue(maxsize=size)
+        # Wird gesetzt wenn der Client nicht hinterherkommt; er bekommt dann einen vollen Snapshot
+        self.needs_resync = False
+
+
+class StatusBroadcaster:
+    """Verteilt Container- und System-Diffs an alle SSE-Clients"""
+
+    def __init__(self, index: ContainerIndex, system_sample: Callable[[], Dict[str, float]],
+                 heartbeat: float = STREAM_HEARTBEAT, system_interval: float = STREAM_SYSTEM_INTERVAL,
+                 queue_size: int = STREAM_QUEUE_SIZE):
+        self.index = index
+        self.system_sample = system_sample
+        self.heartbeat = heartbeat
+        self.system_interval = system_interval
+        self.queue_size = queue_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._containers: Dict[str, Dict[str, Any]] = {}
+        self._system: Dict[str, float] = {}
+        self._event_id = 0
+
+    @property
+    def client_count(self) -> int:
+        return len(self._subscribers)
+
+    # Producer
+
+    def _ensure_producer(self):
+        # Aufrufer hält self._lock
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='status-stream', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        version = -1
+        next_system = 0.0
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            try:
+                timeout = max(0.0, next_system - time.monotonic())
+                if version >= 0:
+                    self.index.wait_for_change(version, timeout=timeout)
+                if self.index.version != version:
+                    version = self.index.version
+                    self._publish_containers()
+                if time.monotonic() >= next_system:
+                    next_system = time.monotonic() + self.system_interval
+                    self._publish_system()
+            except Exception as e:
+                logger.error(f"Status stream producer failed: {e}")
+                time.sleep(self.system_interval)
+
+    def _container_view(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {'state': container.state, 'health': container.health}
+            for name, container in self.index.snapshot().items()
+        }
+
+    def _publish_containers(self):
+        current = self._container_view()
+        changed = {name: data for name, data in current.items() if self._containers.get(name) != data}
+        removed = [name for name in self._containers if name not in current]
+        self._containers = current
+        if changed or removed:
+            self._publish('containers', {'changed': changed, 'removed': removed, 'version': self.index.version})
+
+    def _publish_system(self):
+        sample = self.system_sample()
+        if sample != self._system:
+            self._system = sample
+            self._publish('system', sample)
+
+    def _publish(self, event: str, data: Dict[str, Any]):
+        with self._lock:
+            self._event_id += 1
+            message = format_sse(event, data, self._event_id)
+            for subscriber in self._subscribers:
+                if subscriber.needs_resync:
+                    continue
+                try:
+                    subscriber.queue.put_nowait(message)
+                except queue.Full:
+                    # Backpressure: verwerfe die Warteschlange, der Client holt sich einen Snapshot
+                    subscriber.needs_resync = True
+                    with subscriber.queue.mutex:
+                        subscriber.queue.queue.clear()
+
+    # Clients
+
+    def _snapshot_message(self) -> str:
+        with self._lock:
+            event_id = self._event_id
+        containers = self._container_view()
+        system = self._system or self.system_sample()
+        return format_sse('snapshot', {
+            'containers': containers,
+            'system': system,
+            'version': self.index.version
+        }, event_id)
+
+    def stream(self) -> Iterator[str]:
+        """Generator für eine SSE-Response; beendet sich wenn der Client die Verbindung schließt"""
+        subscriber = _Subscriber(self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            self._ensure_producer()
+        try:
+            yield f'retry: {STREAM_RETRY_MS}\n\n'
+            yield self._snapshot_message()
+            while True:
+                if subscriber.needs_resync:
+                    subscriber.needs_resync = False
+                    yield self._snapshot_message()
+                try:
+                    yield subscriber.queue.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    yield ': heartbeat\n\n'
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
@@ -0,0 +1,169 @@
+"""Hintergrund-Sampler für CPU-, Speicher- und Festplattenauslastung.
+
+Ein Thread misst im konfigurierten Intervall und legt die Werte in Ringpuffern
+mit drei Auflösungen ab (Rohwerte, Minuten- und Stundenmittel). Anfragen lesen
+nur noch den letzten Messwert bzw. die gespeicherte Historie.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_SAMPLE_INTERVAL = float(os.getenv('SYSTEM_SAMPLE_INTERVAL', '1'))
+SYSTEM_DISK_PATH = os.getenv('SYSTEM_DISK_PATH', '/')
+
+# Auflösung -> (Bucket-Größe in Sekunden, Anzahl Einträge)
+RESOLUTIONS = {
+    '1s': (1, 3600),     # 1 Stunde Rohwerte
+    '1m': (60, 1440),    # 24 Stunden Minutenmittel
+    '1h': (3600, 720)    # 30 Tage Stundenmittel
+}
+
+_RANGE_PATTERN = re.compile(r'^(\d+)([smhd])$')
+_RANGE_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# (timestamp, cpu, memory, disk)
+Sample = Tuple[float, float, float, float]
+
+
+def parse_range(value: str) -> int:
+    """Wandelt z.B. '15m', '24h' oder '7d' in Sekunden um"""
+    match = _RANGE_PATTERN.match(value or '')
+    if not match:
+        raise ValueError(f"Invalid range: {value}")
+    return int(match.group(1)) * _RANGE_UNITS[match.group(2)]
+
+
+class _Bucket:
+    """Summiert Messwerte eines Zeitfensters für die Mittelwertbildung"""
+
+    def __init__(self, start: int):
+        self.start = start
+        self.count = 0
+        self.sums = [0.0, 0.0, 0.0]
+
+    def add(self, sample: Sample):
+        self.count += 1
+        for i in range(3):
+            self.sums[i] += sample[i + 1]
+
+    def average(self) -> Sample:
+        return (float(self.start),) + tuple(round(s / self.count, 1) for s in self.sums)
+
+
+class SystemSampler:
+    """Misst Systemwerte im Hintergrund und hält sie in Ringpuffern vor"""
+
+    def __init__(self, interval: float = SYSTEM_SAMPLE_INTERVAL, disk_path: str = SYSTEM_DISK_PATH):
+        self.interval = max(interval, 0.1)
+        self.disk_path = disk_path
+        self._buffers: Dict[str, deque] = {
+            name: deque(maxlen=size) for name, (_, size) in RESOLUTIONS.items()
+        }
+        self._buckets: Dict[str, Optional[_Bucket]] = {'1m': None, '1h': None}
+        self._latest: Optional[Sample] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Startet den Sampler-Thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            # Erster Aufruf initialisiert nur die CPU-Messung von psutil
+            psutil.cpu_percent(interval=None)
+            self._thread = threading.Thread(target=self._run, name='system-sampler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        next_tick = time.monotonic()
+        while not self._stopped.is_set():
+            try:
+                self._record(self._measure())
+            except Exception as e:
+                logger.error(f"System sampling failed: {e}")
+            next_tick += self.interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                # Verpasste Ticks nicht nachholen
+                next_tick = time.monotonic()
+                delay = 0
+            self._stopped.wait(delay)
+
+    def _measure(self) -> Sample:
+        return (
+            time.time(),
+            round(psutil.cpu_percent(interval=None), 1),
+            round(psutil.virtual_memory().percent, 1),
+            round(psutil.disk_usage(self.disk_path).percent, 1)
+        )
+
+    def _record(self, sample: Sample):
+        with self._lock:
+            self._latest = sample
+            self._buffers['1s'].append(sample)
+            minute = self._roll('1m', sample)
+            if minute is not None:
+                self._roll('1h', minute)
+
+    def _roll(self, resolution: str, sample: Sample) -> Optional[Sample]:
+        """Fügt einen Wert in den laufenden Bucket ein und gibt den abgeschlossenen Mittelwert zurück"""
+        size = RESOLUTIONS[resolution][0]
+        start = int(sample[0] // size) * size
+        bucket = self._buckets[resolution]
+        completed = None
+        if bucket is not None and bucket.start != start:
+            completed = bucket.average()
+            self._buffers[resolution].append(completed)
+            bucket = None
+        if bucket is None:
+            bucket = self._buckets[resolution] = _Bucket(start)
+        bucket.add(sample)
+        return completed
+
+    def latest(self) -> Dict[str, float]:
+        """Gibt den letzten Messwert zurück, ohne zu blockieren"""
+        self.start()
+        sample = self._latest
+        if sample is None:
+            sample = self._measure()
+        return {'cpu': sample[1], 'memory': sample[2], 'disk': sample[3]}
+
+    def history(self, seconds: int) -> Dict[str, object]:
+        """Gibt die gespeicherte Zeitreihe für die letzten `seconds` Sekunden zurück"""
+        self.start()
+        resolution = self._resolution_for(seconds)
+        since = time.time() - seconds
+        with self._lock:
+            points: List[Sample] = [s for s in self._buffers[resolution] if s[0] >= since]
+            bucket = self._buckets.get(resolution)
+            if bucket is not None and bucket.count:
+                # Auch das laufende Zeitfenster mitliefern
+                points.append(bucket.average())
+        return {
+            'resolution': resolution,
+            'interval': self.interval if resolution == '1s' else RESOLUTIONS[resolution][0],
+            'timestamps': [round(p[0], 1) for p in points],
+            'cpu': [p[1] for p in points],
+            'memory': [p[2] for p in points],
+            'disk': [p[3] for p in points]
+        }
+
+    def _resolution_for(self, seconds: int) -> str:
+        for name, (size, capacity) in RESOLUTIONS.items():
+            span = capacity * (self.interval if name == '1s' else size)
+            if seconds <= span:
+                return name
+        return '1h'
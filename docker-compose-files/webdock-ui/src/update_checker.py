@@ -0,0 +1,247 @@
+"""Update-Prüfung über Registry-Digests.
+
+Statt ein Image zu pullen wird der lokale RepoDigest mit dem Manifest-Digest der
+Registry verglichen. Dafür reicht ein HEAD-Request auf das Manifest; es werden
+keine Layer übertragen. Remote-Digests werden mit TTL zwischengespeichert und
+für alle Images parallel abgefragt.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from docker_gateway import ContainerSummary, DockerGateway
+
+logger = logging.getLogger(__name__)
+
+UPDATE_CHECK_TTL = float(os.getenv('UPDATE_CHECK_TTL', '3600'))
+UPDATE_CHECK_WORKERS = int(os.getenv('UPDATE_CHECK_WORKERS', '8'))
+UPDATE_CHECK_TIMEOUT = float(os.getenv('UPDATE_CHECK_TIMEOUT', '10'))
+# Registries ohne TLS, z.B. eine lokale Test-Registry (kommagetrennt, host[:port])
+UPDATE_INSECURE_REGISTRIES = [
+    r.strip() for r in os.getenv('UPDATE_INSECURE_REGISTRIES', '').split(',') if r.strip()
+]
+# Docker Hub Endpunkt, überschreibbar für Tests oder einen Mirror
+DOCKER_HUB_REGISTRY = os.getenv('DOCKER_HUB_REGISTRY', 'registry-1.docker.io')
+
+MANIFEST_MEDIA_TYPES = ', '.join([
+    'application/vnd.docker.distribution.manifest.list.v2+json',
+    'application/vnd.oci.image.index.v1+json',
+    'application/vnd.docker.distribution.manifest.v2+json',
+    'application/vnd.oci.image.manifest.v1+json'
+])
+
+_CHALLENGE_PARAM = re.compile(r'(\w+)="([^"]*)"')
+
+
+class UpdateCheckError(Exception):
+    """Remote-Digest konnte nicht ermittelt werden"""
+
+
+def parse_image_reference(ref: str) -> Tuple[str, str, Optional[str]]:
+    """Zerlegt eine Image-Referenz in (Registry, Repository, Tag); Tag ist None bei Digest-Referenzen"""
+    name, digest_sep, _ = ref.partition('@')
+    tag = None
+    last = name.rsplit('/', 1)[-1]
+    if ':' in last:
+        name, tag = name.rsplit(':', 1)
+    if not digest_sep and not tag:
+        tag = 'latest'
+
+    first, sep, rest = name.partition('/')
+    if sep and ('.' in first or ':' in first or first == 'localhost'):
+        registry, repository = first, rest
+    else:
+        registry, repository = 'docker.io', name
+    if registry == 'docker.io':
+        registry = DOCKER_HUB_REGISTRY
+        if '/' not in repository:
+            repository = f'library/{repository}'
+    return registry, repository, tag
+
+
+class RegistryClient:
+    """Minimaler Registry-v2-Client für Manifest-Digests (anonymes Bearer-Token)"""
+
+    def __init__(self, timeout: float = UPDATE_CHECK_TIMEOUT,
+                 insecure_registries: Optional[List[str]] = None):
+        self.timeout = timeout
+        self.insecure_registries = set(insecure_registries or UPDATE_INSECURE_REGISTRIES)
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=UPDATE_CHECK_WORKERS,
+                                                pool_maxsize=UPDATE_CHECK_WORKERS)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        # (realm, service, scope) -> (token, gültig bis)
+        self._tokens: Dict[Tuple[str, str, str], Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _scheme(self, registry: str) -> str:
+        host = registry.split(':')[0]
+        if registry in self.insecure_registries or host in ('localhost', '127.0.0.1'):
+            return 'http'
+        return 'https'
+
+    def manifest_digest(self, registry: str, repository: str, tag: str) -> str:
+        url = f'{self._scheme(registry)}://{registry}/v2/{repository}/manifests/{tag}'
+        headers = {'Accept': MANIFEST_MEDIA_TYPES}
+        response = self._session.head(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 401:
+            token = self._token(response.headers.get('WWW-Authenticate', ''))
+            if token:
+                headers['Authorization'] = f'Bearer {token}'
+                response = self._session.head(url, headers=headers, timeout=self.timeout)
+        if response.status_code != 200:
+            raise UpdateCheckError(f"Registry returned {response.status_code} for {registry}/{repository}:{tag}")
+        digest = response.headers.get('Docker-Content-Digest')
+        if not digest:
+            raise UpdateCheckError(f"No digest in registry response for {registry}/{repository}:{tag}")
+        return digest
+
+    def _token(self, challenge: str) -> Optional[str]:
+        if not challenge.lower().startswith('bearer '):
+            return None
+        params = dict(_CHALLENGE_PARAM.findall(challenge))
+        realm = params.get('realm')
+        if not realm:
+            return None
+        key = (realm, params.get('service', ''), params.get('scope', ''))
+        with self._lock:
+            cached = self._tokens.get(key)
+        if cached and cached[1] > time.time():
+            return cached[0]
+
+        query = {name: value for name, value in (('service', key[1]), ('scope', key[2])) if value}
+        response = self._session.get(realm, params=query, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        token = data.get('token') or data.get('access_token')
+        if token:
+            # Etwas Puffer vor dem Ablauf lassen
+            expires = time.time() + max(int(data.get('expires_in', 60)) - 10, 10)
+            with self._lock:
+                self._tokens[key] = (token, expires)
+        return token
+
+
+class UpdateChecker:
+    """Vergleicht lokale RepoDigests mit den Manifest-Digests der Registry"""
+
+    def __init__(self, gateway: DockerGateway, registry: Optional[RegistryClient] = None,
+                 ttl: float = UPDATE_CHECK_TTL, max_workers: int = UPDATE_CHECK_WORKERS):
+        self.gateway = gateway
+        self.registry = registry or RegistryClient()
+        self.ttl = ttl
+        self.max_workers = max_workers
+        # Image-Referenz -> (Zeitpunkt, Remote-Digest oder None, Fehler)
+        self._cache: Dict[str, Tuple[float, Optional[str], Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self, ref: Optional[str] = None):
+        with self._lock:
+            if ref is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(ref, None)
+
+    def remote_digest(self, ref: str, refresh: bool = False) -> Tuple[Optional[str], Optional[str]]:
+        """Gibt (Digest, Fehler) für eine Image-Referenz zurück, zwischengespeichert für `ttl` Sekunden"""
+        if not refresh:
+            with self._lock:
+                cached = self._cache.get(ref)
+            if cached and time.monotonic() - cached[0] < self.ttl:
+                return cached[1], cached[2]
+
+        digest, error = None, None
+        registry, repository, tag = parse_image_reference(ref)
+        if tag is None:
+            error = 'Image is pinned to a digest'
+        else:
+            try:
+                digest = self.registry.manifest_digest(registry, repository, tag)
+            except (UpdateCheckError, requests.exceptions.RequestException, ValueError) as e:
+                logger.warning(f"Could not check {ref} for updates: {e}")
+                error = str(e)
+        with self._lock:
+            self._cache[ref] = (time.monotonic(), digest, error)
+        return digest, error
+
+    def _local_digests(self, image_id: str) -> List[str]:
+        image = self.gateway.inspect_image(image_id) or {}
+        return [d.split('@', 1)[1] for d in image.get('RepoDigests') or [] if '@' in d]
+
+    def _check_image(self, ref: str, image_id: str, refresh: bool) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            'image': ref,
+            'local_digest': None,
+            'remote_digest': None,
+            'update_available': False,
+            'error': None
+        }
+        try:
+            local = self._local_digests(image_id)
+        except Exception as e:
+            result['error'] = str(e)
+            return result
+        if not local:
+            # Lokal gebaut oder nie aus einer Registry gepullt
+            result['error'] = 'Image has no registry digest'
+            return result
+        result['local_digest'] = local[0]
+        remote, error = self.remote_digest(ref, refresh)
+        result['remote_digest'] = remote
+        result['error'] = error
+        result['update_available'] = remote is not None and remote not in local
+        return result
+
+    def check_container(self, name: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        details = self.gateway.inspect_container(name)
+        if details is None:
+            return None
+        return self._check_image(details.image, details.image_id, refresh)
+
+    def _reference(self, container: ContainerSummary) -> str:
+        # Die Liste meldet statt des Tags die Image-ID, sobald der Tag auf ein
+        # anderes Image zeigt; maßgeblich ist wie bei check_container Config.Image
+        try:
+            details = self.gateway.inspect_container(container.id)
+        except Exception as e:
+            logger.warning(f"Could not inspect {container.name}: {e}")
+            details = None
+        return details.image if details and details.image else container.image
+
+    def check_all(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """Prüft alle Container gruppiert nach Compose-Stack"""
+        containers: List[ContainerSummary] = self.gateway.list_containers(all=True)
+        references: Dict[str, str] = {}
+        results: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        if containers:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(containers)),
+                                    thread_name_prefix='update-check') as pool:
+                references = dict(zip((c.id for c in containers), pool.map(self._reference, containers)))
+                images = {(references[c.id], c.image_id) for c in containers if c.image_id}
+                futures = {key: pool.submit(self._check_image, key[0], key[1], refresh) for key in images}
+                results = {key: future.result() for key, future in futures.items()}
+
+        stacks: Dict[str, Dict[str, Any]] = {}
+        for container in containers:
+            stack_name = container.project or container.name
+            stack = stacks.setdefault(stack_name, {
+                'stack': stack_name,
+                'update_available': False,
+                'containers': []
+            })
+            reference = references.get(container.id, container.image)
+            check = results.get((reference, container.image_id)) or {
+                'image': reference, 'error': 'Unknown image'
+            }
+            entry = dict(check, name=container.name)
+            entry.setdefault('update_available', False)
+            stack['containers'].append(entry)
+            stack['update_available'] = stack['update_available'] or entry['update_available']
+        return sorted(stacks.values(), key=lambda s: s['stack'])
@@ -0,0 +1,82 @@
+"""SSHSession gegen eine echte bash an einem pty (ohne SSH-Server)."""
+import os
+import pty
+import signal
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ssh_terminal import SSHSession  # noqa: E402
+
+
+class PtyChannel:
+    """Verhält sich für SSHSession wie ein paramiko-Shell-Channel"""
+
+    def __init__(self):
+        self.pid, self.fd = pty.fork()
+        if self.pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            os.execvp('bash', ['bash', '--norc', '--noprofile', '-i'])
+
+    def recv(self, size):
+        try:
+            return os.read(self.fd, size)
+        except OSError:
+            return b''
+
+    def sendall(self, data):
+        os.write(self.fd, data)
+
+    def close(self):
+        try:
+            os.kill(self.pid, signal.SIGKILL)
+            os.waitpid(self.pid, 0)
+        except OSError:
+            pass
+
+
+class PtyClient:
+    def invoke_shell(self, term='xterm'):
+        return PtyChannel()
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def session():
+    session = SSHSession(PtyClient())
+    yield session
+    session.close()
+
+
+def test_execute_returns_output_and_exit_code(session):
+    result = session.execute('echo hello; false', timeout=10)
+    assert result['complete']
+    assert result['output'] == 'hello\n'
+    assert result['exit_code'] == 1
+
+
+def test_stdin_reading_command_gets_input_not_marker(session):
+    command_id, cursor = session.send_command('read x; echo "got=[$x]"')
+    session.send_input('typed\n')
+    done = session.wait_for(command_id, timeout=10)
+    assert done is not None and done['exit_code'] == 0
+    output = ''.join(e['data'] for e in session.events_since(cursor) if e['type'] == 'output')
+    assert 'got=[typed]' in output
+    # Die Shell bleibt danach benutzbar
+    assert session.execute('echo next', timeout=10)['output'] == 'next\n'
+
+
+def test_syntax_error_still_completes(session):
+    result = session.execute('fi', timeout=10)
+    assert result['complete']
+    assert result['exit_code'] != 0
+
+
+def test_interrupt_finishes_running_command(session):
+    command_id, _ = session.send_command('cat')
+    session.interrupt(command_id)
+    assert session.wait_for(command_id, timeout=10) is not None